@@ -0,0 +1,88 @@
+"""
+Soporte de GET condicional (ETag / Last-Modified) para vistas DRF basadas en funciones.
+
+Los validadores se calculan sin serializar la respuesta:
+- versión de namespace de caché (endpoints cacheados, 0 queries), o
+- huella del queryset: COUNT + MAX(modified_at/created_at/deleted_at) en una query.
+Si el cliente envía If-None-Match / If-Modified-Since y coinciden, se responde
+304 sin ejecutar la vista.
+"""
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+
+FINGERPRINT_FIELDS = ('modified_at', 'created_at', 'deleted_at')
+
+
+def make_etag(*parts) -> str:
+    """ETag fuerte (entrecomillado) a partir de partes arbitrarias."""
+    raw = ":".join(str(p) for p in parts)
+    return '"%s"' % hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def queryset_fingerprint(queryset, fields=FINGERPRINT_FIELDS) -> dict:
+    """
+    Huella barata de un queryset: COUNT y MAX de los campos de auditoría, en una
+    sola query agregada (sin ORDER BY ni prefetch).
+    Devuelve {'count': int, 'last_modified': datetime|None, 'parts': tuple}.
+    """
+    aggregates = {f"max_{f}": Max(f) for f in fields}
+    result = queryset.order_by().aggregate(count=Count('pk'), **aggregates)
+    stamps = [result[f"max_{f}"] for f in fields if result[f"max_{f}"] is not None]
+    return {
+        "count": result["count"],
+        "last_modified": max(stamps) if stamps else None,
+        "parts": tuple(result[k] for k in sorted(result)),
+    }
+
+
+def conditional_get(etag_func=None, last_modified_func=None):
+    """
+    Aplica django.views.decorators.http.condition solo a GET/HEAD.
+    Debe ir debajo de @api_view/@permission_classes: los validadores se
+    calculan después de autenticar, y PUT/DELETE no pagan su costo.
+    """
+    def decorator(view_func):
+        conditional_view = condition(
+            etag_func=etag_func, last_modified_func=last_modified_func
+        )(view_func)
+
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            if request.method in ("GET", "HEAD"):
+                return conditional_view(request, *args, **kwargs)
+            return view_func(request, *args, **kwargs)
+
+        return _wrapped
+
+    return decorator
+
+
+def fingerprint_validators(queryset_func, *extra_parts_funcs):
+    """
+    Construye (etag_func, last_modified_func) a partir de una función
+    (request, *args, **kwargs) -> queryset. La huella se calcula una vez por
+    request y la comparten ambos validadores.
+    `extra_parts_funcs` agregan partes al ETag (p. ej. params y rol).
+
+    ⚠️ last_modified_func solo es fiable en querysets de solo-inserción (eventos):
+    si se quitan filas, el COUNT cambia (y el ETag) pero el MAX puede no hacerlo.
+    """
+    def _fingerprint(request, *args, **kwargs):
+        cached = getattr(request, "_conditional_fingerprint", None)
+        if cached is None:
+            cached = queryset_fingerprint(queryset_func(request, *args, **kwargs))
+            request._conditional_fingerprint = cached
+        return cached
+
+    def etag_func(request, *args, **kwargs):
+        fp = _fingerprint(request, *args, **kwargs)
+        extra = [f(request, *args, **kwargs) for f in extra_parts_funcs]
+        return make_etag(*fp["parts"], *extra)
+
+    def last_modified_func(request, *args, **kwargs):
+        return _fingerprint(request, *args, **kwargs)["last_modified"]
+
+    return etag_func, last_modified_func
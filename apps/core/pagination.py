@@ -1,4 +1,15 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
 
 class Pagination(PageNumberPagination):
     """
@@ -7,3 +18,156 @@ class Pagination(PageNumberPagination):
     page_size = 10  # Número de productos por página
     page_size_query_param = 'page_size'  # Permitir cambiar el tamaño de la página mediante un parámetro
     max_page_size = 100  # Tamaño máximo de página permitido
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre (created_at, id), el mismo orden que
+    BaseModel.Meta.ordering con `id` como desempate.
+
+    Cada página es un `WHERE (created_at, id) < (cursor) ORDER BY ... LIMIT n+1`:
+    sin OFFSET ni COUNT, el costo no crece con la profundidad de la página.
+    El total es opcional (?with_count=true) porque reintroduce el COUNT(*).
+    El parámetro `ordering` de los filtros no aplica en este modo.
+    """
+    page_size = Pagination.page_size
+    page_size_query_param = Pagination.page_size_query_param
+    max_page_size = Pagination.max_page_size
+    cursor_query_param = 'cursor'
+    count_query_param = 'with_count'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.count = queryset.count() if self._wants_count(request) else None
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["reverse"])
+        if reverse:
+            # Página anterior: se recorre en orden ascendente y se invierte
+            qs = queryset.order_by('created_at', 'id').filter(
+                Q(created_at__gte=cursor["created_at"]),
+                Q(created_at__gt=cursor["created_at"]) | Q(id__gt=cursor["id"]),
+            )
+        else:
+            qs = queryset.order_by('-created_at', '-id')
+            if cursor:
+                # La cota simple sobre created_at permite un range scan del
+                # índice; el OR solo desempata dentro del mismo instante
+                qs = qs.filter(
+                    Q(created_at__lte=cursor["created_at"]),
+                    Q(created_at__lt=cursor["created_at"]) | Q(id__lt=cursor["id"]),
+                )
+
+        # Una fila extra indica si hay más resultados en esa dirección
+        rows = list(qs[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def _wants_count(self, request):
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    # --- Cursor ---
+    def encode_cursor(self, obj, reverse=False):
+        payload = {"t": obj.created_at.isoformat(), "id": obj.pk}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            created_at = parse_datetime(payload["t"])
+            pk = int(payload["id"])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return {"created_at": created_at, "id": pk, "reverse": bool(payload.get("r"))}
+
+    def _link(self, obj, reverse):
+        if obj is None:
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(obj, reverse)
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Página vacía tras un cursor: volver al inicio
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict()
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['next'] = self.get_next_link()
+        payload['previous'] = self.get_previous_link()
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+PAGINATION_QUERY_PARAM = 'pagination'
+
+
+def get_paginator(request):
+    """
+    Devuelve el paginador pedido por el cliente:
+    ?pagination=cursor → KeysetPagination; por defecto, Pagination (por páginas).
+    """
+    if request.query_params.get(PAGINATION_QUERY_PARAM) == 'cursor':
+        return KeysetPagination()
+    return Pagination()
+
+
+# Parámetros OpenAPI comunes a los listados que aceptan ambos paginadores
+CURSOR_PAGINATION_PARAMETERS = [
+    OpenApiParameter(name="pagination", location=OpenApiParameter.QUERY, description="'cursor' para paginación por cursor (keyset); por defecto, por número de página", required=False, type=str, enum=["cursor"]),
+    OpenApiParameter(name="cursor", location=OpenApiParameter.QUERY, description="Cursor opaco devuelto en 'next'/'previous' (solo con pagination=cursor)", required=False, type=str),
+    OpenApiParameter(name="with_count", location=OpenApiParameter.QUERY, description="Con pagination=cursor, incluye 'count' (ejecuta un COUNT adicional)", required=False, type=bool),
+]
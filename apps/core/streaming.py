@@ -0,0 +1,47 @@
+"""
+Respuestas NDJSON (un objeto JSON por línea) en streaming.
+
+Recorre el queryset con .iterator() y serializa por lotes: la memoria por
+request queda acotada por `chunk_size`, sin importar cuántas filas haya.
+"""
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+STREAM_CHUNK_SIZE = 500
+
+
+def is_stream_requested(request, param="stream") -> bool:
+    """True si el cliente pidió streaming (?stream=true)."""
+    return request.query_params.get(param, "").lower() in ("1", "true", "yes")
+
+
+def iter_ndjson(queryset, serializer_class, context=None, chunk_size=STREAM_CHUNK_SIZE):
+    """Genera líneas NDJSON serializando el queryset en lotes de `chunk_size`."""
+    def dump(batch):
+        data = serializer_class(batch, many=True, context=context or {}).data
+        return "".join(
+            json.dumps(item, cls=JSONEncoder, ensure_ascii=False) + "\n" for item in data
+        )
+
+    batch = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        batch.append(obj)
+        if len(batch) >= chunk_size:
+            yield dump(batch)
+            batch = []
+    if batch:
+        yield dump(batch)
+
+
+def ndjson_response(queryset, serializer_class, context=None, chunk_size=STREAM_CHUNK_SIZE):
+    """StreamingHttpResponse NDJSON para un queryset ya filtrado y ordenado."""
+    response = StreamingHttpResponse(
+        iter_ndjson(queryset, serializer_class, context, chunk_size),
+        content_type=NDJSON_CONTENT_TYPE,
+    )
+    # Evita que proxies (nginx) acumulen la respuesta completa antes de enviarla
+    response["X-Accel-Buffering"] = "no"
+    return response
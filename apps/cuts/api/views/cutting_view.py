@@ -8,7 +8,9 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from drf_spectacular.utils import extend_schema
 
-from apps.core.pagination import Pagination
+from apps.core.pagination import get_paginator
+from apps.core.conditional import conditional_get, fingerprint_validators
+from apps.products.utils.cache_helpers_core import list_cache_key_parts
 from apps.cuts.api.serializers.cutting_order_serializer import CuttingOrderSerializer
 from apps.cuts.api.repositories.cutting_order_repository import CuttingOrderRepository
 from apps.cuts.docs.cutting_order_doc import (
@@ -26,6 +28,21 @@ from apps.cuts.tasks import notify_cut_assignment, notify_cut_status_change
 
 logger = logging.getLogger(__name__)
 
+# ── VALIDADORES HTTP (GET condicional) ───────────────────────
+# Sin caché de respuesta: el ETag sale de la huella del queryset (COUNT + MAX de
+# fechas de auditoría) combinada con los parámetros canónicos y el rol.
+cutting_order_assigned_etag, _ = fingerprint_validators(
+    lambda request: CuttingOrderRepository.get_cutting_orders_assigned_to(request.user),
+    list_cache_key_parts,
+)
+cutting_order_list_etag, _ = fingerprint_validators(
+    lambda request: CuttingOrderRepository.get_all_active(),
+    list_cache_key_parts,
+)
+cutting_order_detail_etag, _ = fingerprint_validators(
+    lambda request, cuts_pk: CuttingOrderRepository.get_all_active().filter(pk=cuts_pk)
+)
+
 # --- Listar órdenes de corte asignadas al usuario ---
 @extend_schema(
     summary=list_assigned_cutting_orders_doc["summary"],
@@ -37,6 +54,7 @@ logger = logging.getLogger(__name__)
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(etag_func=cutting_order_assigned_etag)
 def cutting_order_assigned_list(request):
     """
     Endpoint para listar las órdenes de corte asignadas al usuario autenticado.
@@ -44,7 +62,7 @@ def cutting_order_assigned_list(request):
     qs = CuttingOrderRepository.get_cutting_orders_assigned_to(request.user)
 
     # 🔁 Igual que en product_list
-    paginator = Pagination()
+    paginator = get_paginator(request)
     page = paginator.paginate_queryset(qs, request)
     serializer = CuttingOrderSerializer(page, many=True, context={'request': request})
     return paginator.get_paginated_response(serializer.data)
@@ -61,6 +79,7 @@ def cutting_order_assigned_list(request):
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(etag_func=cutting_order_list_etag)
 def cutting_order_list(request):
     """
     Endpoint para listar todas las órdenes de corte activas.
@@ -68,7 +87,7 @@ def cutting_order_list(request):
     qs = CuttingOrderRepository.get_all_active()
 
     # 🔁 Consistente con product_list
-    paginator = Pagination()
+    paginator = get_paginator(request)
     page = paginator.paginate_queryset(qs, request)
     serializer = CuttingOrderSerializer(page, many=True, context={'request': request})
     return paginator.get_paginated_response(serializer.data)
@@ -155,6 +174,7 @@ def cutting_order_create(request):
 )
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
 @permission_classes([IsAuthenticated])
+@conditional_get(etag_func=cutting_order_detail_etag)
 def cutting_order_detail(request, cuts_pk):
     """
     Endpoint para:
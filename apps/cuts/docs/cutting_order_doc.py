@@ -1,3 +1,4 @@
+from apps.core.pagination import CURSOR_PAGINATION_PARAMETERS
 from apps.cuts.api.serializers import CuttingOrderSerializer
 
 # Documento para listar TODAS las órdenes de corte
@@ -7,7 +8,7 @@ list_cutting_orders_doc = {
     'description': 'Recupera una lista paginada de todas las órdenes de corte activas. Accesible para cualquier usuario autenticado.',
     'tags': ['Cutting Orders'],
     'security': [{'jwtAuth': []}],
-    'parameters': [],  # Agregado: los parámetros para este endpoint, si los tuviera, deben estar aquí
+    'parameters': [*CURSOR_PAGINATION_PARAMETERS],
     'responses': {
         200: {
             'description': 'Lista paginada de órdenes de corte activas.',
@@ -35,7 +36,7 @@ list_assigned_cutting_orders_doc = {
     'description': 'Recupera una lista paginada de las órdenes de corte que están asignadas al usuario autenticado.',
     'tags': ['Cutting Orders'],
     'security': [{'jwtAuth': []}],
-    'parameters': [],  # Agregado: los parámetros para este endpoint, si los tuviera, deben estar aquí
+    'parameters': [*CURSOR_PAGINATION_PARAMETERS],
     'responses': {
         200: {
             'description': 'Lista paginada de órdenes asignadas.',
@@ -62,6 +62,10 @@ class CuttingOrder(BaseModel):
             ('can_assign_cutting_order', 'Can assign cutting orders'),
             ('can_process_cutting_order', 'Can process cutting orders'),
         ]
+        indexes = [
+            # Paginación por cursor (keyset) sobre (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='cuttingorder_created_id_idx'),
+        ]
 
     def __str__(self):
         return f'Orden {self.pk} para {self.customer} ({self.get_workflow_status_display()})'
@@ -11,8 +11,8 @@ from apps.users.models.user_model import User
 from apps.products.models.subproduct_model import Subproduct
 from apps.products.models.product_model import Product
 from apps.stocks.services.stocks_services import (
-    check_subproduct_stock,
-    dispatch_subproduct_stock_for_cut
+    dispatch_subproduct_stock_for_cut,
+    dispatch_subproducts_stock_for_cut
 )
 
 # --- Servicio para CREAR una Orden de Corte Completa ---
@@ -39,9 +39,18 @@ def create_full_cutting_order(
     if not product.has_subproducts:
         raise ValidationError("El producto no permite subproductos.")
 
+    # Una sola consulta para todos los subproductos del pedido
+    requested_ids = {item['subproduct_id'] for item in items}
+    subproducts = {
+        subproduct.pk: subproduct
+        for subproduct in Subproduct.objects.filter(pk__in=requested_ids, status=True)
+    }
+
     validated_items = []
     for item in items:
-        subproduct = get_object_or_404(Subproduct, pk=item['subproduct_id'], status=True)
+        subproduct = subproducts.get(item['subproduct_id'])
+        if subproduct is None:
+            raise ValidationError(f"Subproducto {item['subproduct_id']} no encontrado o inactivo.")
         if subproduct.parent_id != product.id:
             raise ValidationError(f"El subproducto {subproduct.pk} no pertenece al producto indicado.")
         try:
@@ -50,7 +59,6 @@ def create_full_cutting_order(
                 raise InvalidOperation
         except (InvalidOperation, ValueError):
             raise ValidationError("Cantidad inválida en items.")
-        check_subproduct_stock(subproduct=subproduct, quantity_needed=qty)
         validated_items.append((subproduct, qty))
 
     assigned_to_user = None
@@ -67,21 +75,18 @@ def create_full_cutting_order(
         workflow_status='pending',
     )
 
-    for sub, qty in validated_items:
-        CuttingOrderItem.objects.create(
-            order=order,
-            subproduct=sub,
-            cutting_quantity=qty,
-            created_by=user_creator
-        )
-
-    for sub, qty in validated_items:
-        dispatch_subproduct_stock_for_cut(
-            subproduct=sub,
-            cutting_quantity=qty,
-            order_pk=order.pk,
-            user_performing_cut=user_creator
-        )
+    CuttingOrderItem.objects.bulk_create([
+        CuttingOrderItem(order=order, subproduct=sub, cutting_quantity=qty)
+        for sub, qty in validated_items
+    ])
+
+    # Bloquea, valida y descuenta el stock de todas las bobinas en lote;
+    # si falta stock en alguna, la transacción descarta la orden completa.
+    dispatch_subproducts_stock_for_cut(
+        validated_items,
+        order_pk=order.pk,
+        user_performing_cut=user_creator
+    )
 
     return order
 
@@ -1,9 +1,11 @@
 import os
 import logging
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import transaction
 from apps.products.models.product_image_model import ProductImage
 from apps.products.models.product_model import Product
-from apps.storages_client.services.products_files import get_product_file_url
+from apps.storages_client.services.products_files import get_product_file_urls
+from apps.storages_client.services.thumbnails import is_thumbnailable
 
 logger = logging.getLogger(__name__)
 
@@ -22,47 +24,100 @@ class ProductFileRepository:
         if ext not in allowed:
             raise ValidationError(f"Extensión de archivo no permitida: {ext}. Permitidas: {allowed}")
 
+    @staticmethod
+    def _schedule_thumbnails(images):
+        """Encola la generación de miniaturas cuando la transacción confirma."""
+        from apps.products.tasks import generate_product_image_thumbnails
+
+        # Los archivos deduplicados ya traen las miniaturas del original
+        ids = [
+            img.pk for img in images
+            if not img.thumbnails and is_thumbnailable(img.key, img.mime_type)
+        ]
+        if not ids:
+            return
+
+        def enqueue():
+            for pk in ids:
+                generate_product_image_thumbnails.delay(pk)
+
+        transaction.on_commit(enqueue)
+
     @staticmethod
     def get_all_by_product(product_id: int):
         """Lista todas las imágenes asociadas a un producto con URL generada."""
+        files = list(ProductImage.objects.filter(product_id=product_id))
+        # Firma en lote (caché de URLs presignadas): una ida a Redis por listado,
+        # originales y miniaturas juntas
+        keys = [f.key for f in files]
+        for f in files:
+            keys.extend((f.thumbnails or {}).values())
+        urls = get_product_file_urls(keys)
         return [
             {
                 "key": f.key,
                 "name": f.name,
                 "mimeType": f.mime_type,
-                "url": get_product_file_url(f.key)
+                "url": urls.get(f.key),
+                "thumbnails": {
+                    size: urls.get(thumb_key)
+                    for size, thumb_key in (f.thumbnails or {}).items()
+                },
             }
-            for f in ProductImage.objects.filter(product_id=product_id)
+            for f in files
         ]
 
     @staticmethod
-    def get_by_id(file_id: str) -> ProductImage | None:
-        try:
-            return ProductImage.objects.get(key=file_id)
-        except ProductImage.DoesNotExist:
-            return None
+    def get_by_id(file_id: str, product_id: int = None) -> ProductImage | None:
+        # Con deduplicación varias filas pueden compartir la key: se acota por producto
+        queryset = ProductImage.objects.filter(key=file_id)
+        if product_id is not None:
+            queryset = queryset.filter(product_id=product_id)
+        return queryset.first()
 
     @staticmethod
     def exists(product_id: int, file_id: str) -> bool:
         return ProductImage.objects.filter(product_id=product_id, key=file_id).exists()
 
     @staticmethod
-    def delete(file_id: str) -> ProductImage | None:
-        try:
-            image = ProductImage.objects.get(key=file_id)
+    def delete(file_id: str, product_id: int = None) -> ProductImage | None:
+        """Borra la fila (no el objeto de S3, que puede estar compartido)."""
+        image = ProductFileRepository.get_by_id(file_id, product_id)
+        if image is not None:
             image.delete()
-            return image
-        except ProductImage.DoesNotExist:
-            return None
+        return image
 
     @staticmethod
     def create(product_id: int, key: str, url: str = None, name: str = None, mime_type: str = None) -> ProductImage:
         ProductFileRepository._validate_file_extension(name or key)
         product = Product.objects.get(pk=product_id)
-        return ProductImage.objects.create(
+        image = ProductImage.objects.create(
             product=product,
             key=key,
             url=url,
             name=name,
             mime_type=mime_type
-        )
\ No newline at end of file
+        )
+        ProductFileRepository._schedule_thumbnails([image])
+        return image
+
+    @staticmethod
+    def bulk_create(product_id: int, uploads: list[dict]) -> list[ProductImage]:
+        """
+        Inserta en un solo INSERT las imágenes ya subidas al bucket.
+        `uploads` son los dicts de upload_product_file (extensión ya validada).
+        """
+        images = ProductImage.objects.bulk_create([
+            ProductImage(
+                product_id=product_id,
+                key=u["key"],
+                url=u["url"],
+                name=u["name"],
+                mime_type=u["mimeType"],
+                content_hash=u.get("contentHash"),
+                thumbnails=u.get("thumbnails") or {},
+            )
+            for u in uploads
+        ])
+        ProductFileRepository._schedule_thumbnails(images)
+        return images
@@ -1,9 +1,15 @@
 from django.utils import timezone
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db.models import Prefetch
 
 from apps.products.models.product_model import Product
 from apps.products.models.category_model import Category 
 from apps.products.models.type_model import Type       
+from apps.products.models.subproduct_model import Subproduct
+from apps.products.models.product_image_model import ProductImage
+
+# Relaciones de auditoría que BaseSerializer.to_representation resuelve por fila
+AUDIT_USER_RELATIONS = ('created_by', 'modified_by', 'deleted_by')
 
 
 class ProductRepository:
@@ -17,6 +23,48 @@ class ProductRepository:
         """Obtener todos los productos activos."""
         return Product.objects.filter(status=True).select_related('category', 'type', 'created_by')
 
+    @staticmethod
+    def get_prefetch_plan() -> list[Prefetch]:
+        """
+        Plan de prefetch para serializar productos con ProductSerializer en un
+        número constante de queries, sin importar el tamaño de la página:
+        - subproductos activos con sus usuarios de auditoría;
+        - imágenes del producto ordenadas por fecha de subida.
+        El 'parent' de cada subproducto queda cacheado por el propio prefetch.
+        """
+        subproducts_qs = (
+            Subproduct.objects
+            .filter(status=True)
+            .select_related(*AUDIT_USER_RELATIONS)
+        )
+        images_qs = ProductImage.objects.order_by('created_at')
+
+        return [
+            Prefetch('subproducts', queryset=subproducts_qs),
+            Prefetch('product_images', queryset=images_qs),
+        ]
+
+    @staticmethod
+    def get_all_active_products_detailed():
+        """
+        Productos activos listos para ProductSerializer: FKs y usuarios de
+        auditoría en el mismo JOIN y relaciones anidadas precargadas según
+        get_prefetch_plan(). El stock sale de la columna 'current_stock'.
+        """
+        return (
+            ProductRepository.get_all_active_products()
+            .select_related(*AUDIT_USER_RELATIONS)
+            .prefetch_related(*ProductRepository.get_prefetch_plan())
+        )
+
+    @staticmethod
+    def get_by_id_detailed(product_id: int) -> Product | None:
+        """Obtener un producto activo con el plan de prefetch aplicado."""
+        try:
+            return ProductRepository.get_all_active_products_detailed().get(id=product_id)
+        except Product.DoesNotExist:
+            return None
+
     @staticmethod
     def get_by_id(product_id: int) -> Product | None:
         """Obtener un producto activo por su ID."""
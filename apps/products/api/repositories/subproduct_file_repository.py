@@ -2,6 +2,8 @@ from django.core.exceptions import ObjectDoesNotExist
 from apps.products.models.subproduct_image_model import SubproductImage
 from apps.products.models.subproduct_model import Subproduct
 from django.conf import settings
+from django.db import transaction
+from apps.storages_client.services.thumbnails import is_thumbnailable
 import os
 import logging
 
@@ -19,16 +21,36 @@ class SubproductFileRepository:
 
     ALLOWED_EXTENSIONS = os.getenv("ALLOWED_UPLOAD_EXTENSIONS", ".jpg,.jpeg,.png,.webp,.pdf").split(",")
 
+    @staticmethod
+    def _schedule_thumbnails(images):
+        """Encola la generación de miniaturas cuando la transacción confirma."""
+        from apps.products.tasks import generate_subproduct_image_thumbnails
+
+        # Los archivos deduplicados ya traen las miniaturas del original
+        ids = [
+            img.pk for img in images
+            if not img.thumbnails and is_thumbnailable(img.key, img.mime_type)
+        ]
+        if not ids:
+            return
+
+        def enqueue():
+            for pk in ids:
+                generate_subproduct_image_thumbnails.delay(pk)
+
+        transaction.on_commit(enqueue)
+
     @staticmethod
     def get_all_by_subproduct(subproduct_id: int):
         return SubproductImage.objects.filter(subproduct_id=subproduct_id).order_by("created_at")
 
     @staticmethod
-    def get_by_id(file_id: str):
-        try:
-            return SubproductImage.objects.get(key=file_id)
-        except SubproductImage.DoesNotExist:
-            return None
+    def get_by_id(file_id: str, subproduct_id: int = None):
+        # Con deduplicación varias filas pueden compartir la key: se acota por subproducto
+        queryset = SubproductImage.objects.filter(key=file_id)
+        if subproduct_id is not None:
+            queryset = queryset.filter(subproduct_id=subproduct_id)
+        return queryset.first()
 
     @staticmethod
     def exists(subproduct_id: int, file_id: str) -> bool:
@@ -43,13 +65,12 @@ class SubproductFileRepository:
         return exists
 
     @staticmethod
-    def delete(file_id: str):
-        try:
-            img = SubproductImage.objects.get(key=file_id)
+    def delete(file_id: str, subproduct_id: int = None):
+        """Borra la fila (no el objeto de S3, que puede estar compartido)."""
+        img = SubproductFileRepository.get_by_id(file_id, subproduct_id)
+        if img is not None:
             img.delete()
-            return img
-        except SubproductImage.DoesNotExist:
-            return None
+        return img
 
     @staticmethod
     def create(
@@ -68,10 +89,33 @@ class SubproductFileRepository:
         except Subproduct.DoesNotExist:
             raise ValueError(f"Subproducto con ID {subproduct_id} no existe o está inactivo.")
 
-        return SubproductImage.objects.create(
+        image = SubproductImage.objects.create(
             subproduct=subp,
             key=key,
             url=url,
             name=name,
-            mimeType=mime_type
+            mime_type=mime_type
         )
+        SubproductFileRepository._schedule_thumbnails([image])
+        return image
+
+    @staticmethod
+    def bulk_create(subproduct_id: int, uploads: list[dict]) -> list[SubproductImage]:
+        """
+        Inserta en un solo INSERT los archivos ya subidos al bucket.
+        `uploads` son los dicts de upload_subproduct_file (extensión ya validada).
+        """
+        images = SubproductImage.objects.bulk_create([
+            SubproductImage(
+                subproduct_id=subproduct_id,
+                key=u["key"],
+                url=u["url"],
+                name=u["name"],
+                mime_type=u["mimeType"],
+                content_hash=u.get("contentHash"),
+                thumbnails=u.get("thumbnails") or {},
+            )
+            for u in uploads
+        ])
+        SubproductFileRepository._schedule_thumbnails(images)
+        return images
@@ -6,6 +6,10 @@ from apps.products.models.product_model import Product
 from apps.products.models.subproduct_model import Subproduct
 from typing import Optional, List, Dict, Any
 
+# parent__type cubre 'parent_type_name' y los usuarios de auditoría
+# cubren BaseSerializer.to_representation sin queries por fila.
+SUBPRODUCT_RELATIONS = ('parent__type', 'created_by', 'modified_by', 'deleted_by')
+
 class SubproductRepository:
     """
     Repositorio para Subproduct. Delega lógica de save/delete/auditoría a BaseModel.
@@ -16,7 +20,7 @@ class SubproductRepository:
     def get_by_id(subproduct_id: int) -> Optional[Subproduct]:
         """Recupera un subproducto activo por su ID."""
         try:
-            return Subproduct.objects.select_related('parent', 'created_by').get(id=subproduct_id, status=True)
+            return Subproduct.objects.select_related(*SUBPRODUCT_RELATIONS).get(id=subproduct_id, status=True)
         except Subproduct.DoesNotExist:
             return None
 
@@ -26,7 +30,7 @@ class SubproductRepository:
         Recupera todos los subproductos activos de un producto padre.
         Orden por defecto (-created_at) viene de BaseModel.Meta.
         """
-        return Subproduct.objects.filter(parent_id=parent_product_id, status=True).select_related('parent', 'created_by')
+        return Subproduct.objects.filter(parent_id=parent_product_id, status=True).select_related(*SUBPRODUCT_RELATIONS)
 
     @staticmethod
     def create(user, parent: Product, **data: Any) -> Subproduct:
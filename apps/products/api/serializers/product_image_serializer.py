@@ -2,7 +2,17 @@ from rest_framework import serializers
 from apps.products.models.product_image_model import ProductImage
 
 class ProductImageSerializer(serializers.ModelSerializer):
+    thumbnails = serializers.SerializerMethodField()
+
     class Meta:
         model = ProductImage
-        fields = ['id', 'key', 'url', 'name', 'mime_type', 'created_at']
+        fields = ['id', 'key', 'url', 'name', 'mime_type', 'thumbnails', 'created_at']
         read_only_fields = fields
+
+    def get_thumbnails(self, obj) -> dict:
+        """
+        Keys de las miniaturas WebP: {"128": key, "512": key}. Es lo que se
+        cachea; las vistas las reemplazan por URLs firmadas al responder
+        (apps.products.utils.thumbnail_urls).
+        """
+        return dict(obj.thumbnails or {})
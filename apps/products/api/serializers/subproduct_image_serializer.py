@@ -1,15 +1,17 @@
 from rest_framework import serializers
 from apps.products.models.subproduct_image_model import SubproductImage
+from apps.storages_client.services.subproducts_files import get_subproduct_file_urls
 
 class SubproductImageSerializer(serializers.ModelSerializer):
     filename = serializers.SerializerMethodField()
     content_type = serializers.SerializerMethodField()
+    thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = SubproductImage
         fields = [
             'id', 'key', 'url', 'name', 'mime_type', 'created_at',
-            'filename', 'content_type'
+            'filename', 'content_type', 'thumbnails'
         ]
         read_only_fields = fields
 
@@ -18,3 +20,11 @@ class SubproductImageSerializer(serializers.ModelSerializer):
 
     def get_content_type(self, obj):
         return obj.mime_type or 'application/octet-stream'
+
+    def get_thumbnails(self, obj) -> dict:
+        """URLs firmadas de las miniaturas WebP: {"128": url, "512": url}."""
+        variants = obj.thumbnails or {}
+        if not variants:
+            return {}
+        urls = get_subproduct_file_urls(variants.values())
+        return {size: urls.get(key) for size, key in variants.items()}
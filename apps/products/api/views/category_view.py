@@ -6,25 +6,32 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from django.views.decorators.cache import cache_page
 
 from apps.products.models.category_model import Category
 from apps.products.api.serializers.category_serializer import CategorySerializer
 from apps.products.api.repositories.category_repository import CategoryRepository
 from apps.products.filters.category_filter import CategoryFilter
-from apps.core.pagination import Pagination
+from apps.core.pagination import get_paginator
+from apps.core.conditional import conditional_get, fingerprint_validators
 
 from apps.products.utils.cache_helpers_categories import CACHE_KEY_CATEGORY_LIST
-from apps.products.utils.redis_utils import delete_keys_by_pattern
+from apps.products.utils.cache_decorators import cached_view, CATALOG_LIST_CACHE_POLICY
+from apps.products.utils.cache_helpers_core import namespace_etag
 
 logger = logging.getLogger(__name__)
 
 # ── CACHE DE LISTADO (TTL 5min) ────────────────────────────────
-cache_decorator = cache_page(None, key_prefix=CACHE_KEY_CATEGORY_LIST)
+cache_decorator = cached_view(CACHE_KEY_CATEGORY_LIST, policy=CATALOG_LIST_CACHE_POLICY)
+
+# ── VALIDADORES HTTP (GET condicional) ───────────────────────
+category_detail_etag, _ = fingerprint_validators(
+    lambda request, category_pk: Category.objects.filter(pk=category_pk, status=True)
+)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(etag_func=lambda request: namespace_etag(request, CACHE_KEY_CATEGORY_LIST))
 @cache_decorator
 def category_list(request):
     """
@@ -32,7 +39,7 @@ def category_list(request):
     """
     qs = Category.objects.filter(status=True).select_related('created_by')
     qs = CategoryFilter(request.GET, queryset=qs).qs
-    paginator = Pagination()
+    paginator = get_paginator(request)
     page = paginator.paginate_queryset(qs, request)
     data = CategorySerializer(page, many=True, context={'request': request}).data
     return paginator.get_paginated_response(data)
@@ -50,9 +57,7 @@ def create_category(request):
 
     category = serializer.save(user=request.user)
 
-    # Invalidar caché de lista
-    deleted = delete_keys_by_pattern(CACHE_KEY_CATEGORY_LIST)
-    logger.debug("Cache de category_list invalidada tras CREATE (borradas %d claves)", deleted)
+    # La caché de lista se invalida en la señal post_save (apps.products.signals)
 
     return Response(
         CategorySerializer(category, context={'request': request}).data,
@@ -62,6 +67,7 @@ def create_category(request):
 
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
+@conditional_get(etag_func=category_detail_etag)
 def category_detail(request, category_pk):
     """
     GET: obtiene detalle de categoría.
@@ -72,7 +78,7 @@ def category_detail(request, category_pk):
     if not category:
         return Response({"detail": "Categoría no encontrada."}, status=status.HTTP_404_NOT_FOUND)
 
-    # GET (sin cache_page)
+    # GET (sin caché)
     if request.method == 'GET':
         return Response(CategorySerializer(category, context={'request': request}).data)
 
@@ -96,9 +102,6 @@ def category_detail(request, category_pk):
             **serializer.validated_data
         )
 
-        deleted = delete_keys_by_pattern(CACHE_KEY_CATEGORY_LIST)
-        logger.debug("Cache de category_list invalidada tras UPDATE (borradas %d claves)", deleted)
-
         return Response(CategorySerializer(updated, context={'request': request}).data)
 
     # DELETE
@@ -108,7 +111,4 @@ def category_detail(request, category_pk):
 
         CategoryRepository.soft_delete(category, user=request.user)
 
-        deleted = delete_keys_by_pattern(CACHE_KEY_CATEGORY_LIST)
-        logger.debug("Cache de category_list invalidada tras DELETE (borradas %d claves)", deleted)
-
         return Response(status=status.HTTP_204_NO_CONTENT)
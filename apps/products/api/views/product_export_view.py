@@ -0,0 +1,122 @@
+# apps/products/api/views/product_export_view.py
+
+import logging
+import tempfile
+
+from celery.result import AsyncResult
+from django.http import FileResponse, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from drf_spectacular.utils import extend_schema
+
+from apps.products.docs.product_doc import export_products_doc, export_products_status_doc
+from apps.products.services.product_export_service import (
+    EXPORT_FORMATS,
+    ExportFormatError,
+    check_format,
+    export_download_url,
+    export_filename,
+    export_queryset,
+    export_task_owner,
+    iter_csv,
+    iter_export_rows,
+    iter_ndjson,
+    register_export_task,
+    write_xlsx,
+)
+from apps.products.tasks import export_products_task
+
+logger = logging.getLogger(__name__)
+
+# Parámetros propios del endpoint (el resto son filtros de ProductFilter)
+EXPORT_CONTROL_PARAMS = ('export_format', 'async')
+
+
+@extend_schema(
+    summary=export_products_doc["summary"],
+    description=export_products_doc["description"],
+    tags=export_products_doc["tags"],
+    operation_id=export_products_doc["operation_id"],
+    parameters=export_products_doc["parameters"],
+    responses=export_products_doc["responses"]
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_products_view(request):
+    """
+    Exporta el catálogo activo con stock. CSV/NDJSON se transmiten en streaming;
+    XLSX se arma en un temporal. Con ?async=true se genera en Celery.
+    """
+    try:
+        export_format = check_format(request.query_params.get('export_format'))
+    except ExportFormatError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    params = {k: v for k, v in request.query_params.items() if k not in EXPORT_CONTROL_PARAMS}
+
+    try:
+        queryset = export_queryset(params)
+    except ValueError as e:
+        return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
+
+    if request.query_params.get('async', '').lower() in ('1', 'true', 'yes'):
+        task = export_products_task.delay(export_format, params)
+        register_export_task(task.id, request.user.pk)
+        logger.info(f"📤 Exportación de productos encolada ({export_format}): {task.id}")
+        return Response({"task_id": task.id, "status": task.status}, status=status.HTTP_202_ACCEPTED)
+
+    filename = export_filename(export_format)
+    rows = iter_export_rows(queryset)
+    if export_format == 'xlsx':
+        tmp = tempfile.TemporaryFile()
+        try:
+            write_xlsx(rows, tmp)
+        except ExportFormatError as e:
+            tmp.close()
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        tmp.seek(0)
+        # FileResponse lee el temporal por bloques y lo cierra al terminar
+        return FileResponse(tmp, as_attachment=True, filename=filename, content_type=EXPORT_FORMATS['xlsx'])
+
+    stream = iter_csv(rows) if export_format == 'csv' else iter_ndjson(rows)
+    response = StreamingHttpResponse(stream, content_type=EXPORT_FORMATS[export_format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    # Evita que proxies (nginx) acumulen la respuesta completa antes de enviarla
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@extend_schema(
+    summary=export_products_status_doc["summary"],
+    description=export_products_status_doc["description"],
+    tags=export_products_status_doc["tags"],
+    operation_id=export_products_status_doc["operation_id"],
+    parameters=export_products_status_doc["parameters"],
+    responses=export_products_status_doc["responses"]
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_products_status_view(request, task_id: str):
+    """
+    Estado de una exportación asíncrona; al terminar incluye la URL del archivo,
+    firmada en cada consulta. Solo responde por exportaciones registradas del
+    propio usuario (o cualquiera, para staff).
+    """
+    owner = export_task_owner(task_id)
+    if owner is None or (owner != request.user.pk and not request.user.is_staff):
+        return Response({"detail": "Exportación no encontrada."}, status=status.HTTP_404_NOT_FOUND)
+
+    result = AsyncResult(task_id)
+    if result.successful():
+        data = result.result
+        return Response({
+            "status": result.status,
+            "key": data["key"],
+            "rows": data["rows"],
+            "url": export_download_url(data["key"]),
+        }, status=status.HTTP_200_OK)
+    if result.failed():
+        logger.error(f"❌ Exportación {task_id} fallida: {result.result}")
+        return Response({"status": result.status, "detail": "La exportación falló."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return Response({"status": result.status}, status=status.HTTP_202_ACCEPTED)
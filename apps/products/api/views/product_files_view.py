@@ -1,6 +1,7 @@
 # apps/products/api/views/product_files_view.py
 
 import logging
+from django.conf import settings
 from django.http import HttpResponseRedirect, Http404
 from rest_framework import status
 from rest_framework.response import Response
@@ -17,18 +18,34 @@ from apps.storages_client.services.products_files import (
     upload_product_file,
     delete_product_file,
     get_product_file_url,
+    _validate_file_extension,
 )
+from apps.products.services.file_dedup_service import (
+    delete_file_row,
+    register_deduplicated,
+    upload_deduplicated,
+)
+from apps.products.services.file_listing_service import (
+    get_product_file_rows,
+    parse_ids,
+    sign_product_listings,
+)
+from apps.storages_client.services.file_proxy import proxy_file_response, proxy_requested
+from apps.storages_client.services.upload_sessions import (
+    create_upload_session,
+    finalize_upload_session,
+)
+from apps.storages_client.exceptions import StorageUploadError
 from apps.products.docs.product_image_doc import (
     product_image_upload_doc,
     product_image_list_doc,
+    product_image_batch_list_doc,
     product_image_download_doc,
     product_image_delete_doc,
+    product_image_upload_session_doc,
+    product_image_upload_finalize_doc,
 )
-from apps.products.utils.cache_helpers_products import (
-    PRODUCT_LIST_CACHE_PREFIX,
-    PRODUCT_DETAIL_CACHE_PREFIX,
-)
-from apps.products.utils.redis_utils import delete_keys_by_pattern
+from apps.products.utils.cache_helpers_products import invalidate_product_cache
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +63,8 @@ logger = logging.getLogger(__name__)
 @permission_classes([IsAdminUser])
 def product_file_upload_view(request, product_id: str):
     """
-    Sube archivos para un producto; invalida caché de lista y detalle.
+    Sube archivos para un producto (transferencias concurrentes);
+    invalida caché de lista y detalle.
     """
     try:
         product = Product.objects.get(pk=product_id)
@@ -57,30 +75,37 @@ def product_file_upload_view(request, product_id: str):
     if not files:
         return Response({"detail": "No se proporcionaron archivos."}, status=status.HTTP_400_BAD_REQUEST)
 
-    results, errors = [], []
-    for f in files:
+    # Deduplicación por SHA-256 + transferencias a S3 en paralelo;
+    # las filas se insertan con un solo INSERT
+    uploaded, errors = upload_deduplicated(
+        files,
+        lambda f, content_hash: upload_product_file(
+            file=f, product_id=str(product.id), content_hash=content_hash
+        ),
+        url_func=get_product_file_url,
+        validate_func=_validate_file_extension,
+    )
+    results = []
+    if uploaded:
         try:
-            res = upload_product_file(file=f, product_id=str(product.id))
-            ProductFileRepository.create(
-                product_id=product.id,
-                key=res["key"],
-                url=res["url"],
-                name=res["name"],
-                mime_type=res["mimeType"],
+            registered, lost = register_deduplicated(
+                uploaded, lambda rows: ProductFileRepository.bulk_create(product.id, rows)
             )
-            results.append(res["key"])
+            results = [res["key"] for res in registered]
+            errors.extend(lost)
         except Exception as e:
-            logger.exception(f"❌ Error subiendo archivo {f.name}: {e}")
-            errors.append({f.name: str(e)})
+            logger.exception(f"❌ Error registrando archivos del producto {product.id}: {e}")
+            # Sin fila no hay referencia al objeto: se retira del bucket
+            # (salvo los reutilizados, que pertenecen a otras filas)
+            for res in uploaded:
+                if not res.get("reused"):
+                    delete_product_file(res["key"])
+                errors.append({res["name"]: str(e)})
 
     if results:
         # Invalidar caché de lista y detalle
-        deleted_list   = delete_keys_by_pattern(PRODUCT_LIST_CACHE_PREFIX)
-        deleted_detail = delete_keys_by_pattern(PRODUCT_DETAIL_CACHE_PREFIX)
-        logger.debug(
-            "[Cache] product_list invalidada (%d) y product_detail invalidada (%d) tras UPLOAD",
-            deleted_list, deleted_detail
-        )
+        invalidate_product_cache(product.id)
+        logger.debug("[Cache] producto %s invalidado tras UPLOAD", product.id)
 
     if errors and not results:
         only_ext_errors = all("Extensión de archivo no permitida" in list(err.values())[0] for err in errors)
@@ -94,6 +119,80 @@ def product_file_upload_view(request, product_id: str):
     )
 
 
+@extend_schema(
+    tags=product_image_upload_session_doc["tags"],
+    summary=product_image_upload_session_doc["summary"],
+    operation_id=product_image_upload_session_doc["operation_id"],
+    description=product_image_upload_session_doc["description"],
+    parameters=product_image_upload_session_doc["parameters"],
+    request=product_image_upload_session_doc["request"]["content"]["application/json"]["schema"],
+    responses=product_image_upload_session_doc["responses"],
+)
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def product_file_upload_session_view(request, product_id: str):
+    """
+    Crea una sesión de subida directa al bucket (POST presignado):
+    los bytes del archivo no pasan por el servidor.
+    """
+    try:
+        product = Product.objects.get(pk=product_id)
+    except Product.DoesNotExist:
+        raise ProductNotFound(f"Producto con ID {product_id} no existe.")
+
+    try:
+        session = create_upload_session(
+            scope={"product_id": product.id, "subproduct_id": None},
+            filename=request.data.get("filename"),
+            content_type=request.data.get("content_type"),
+            size=request.data.get("size"),
+        )
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(session, status=status.HTTP_201_CREATED)
+
+
+@extend_schema(
+    tags=product_image_upload_finalize_doc["tags"],
+    summary=product_image_upload_finalize_doc["summary"],
+    operation_id=product_image_upload_finalize_doc["operation_id"],
+    description=product_image_upload_finalize_doc["description"],
+    parameters=product_image_upload_finalize_doc["parameters"],
+    request=product_image_upload_finalize_doc["request"]["content"]["application/json"]["schema"],
+    responses=product_image_upload_finalize_doc["responses"],
+)
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def product_file_upload_finalize_view(request, product_id: str):
+    """
+    Confirma una subida directa (HEAD del objeto) y registra el archivo;
+    invalida caché de lista y detalle.
+    """
+    try:
+        product = Product.objects.get(pk=product_id)
+    except Product.DoesNotExist:
+        raise ProductNotFound(f"Producto con ID {product_id} no existe.")
+
+    try:
+        res = finalize_upload_session(
+            request.data.get("token"),
+            scope={"product_id": product.id, "subproduct_id": None},
+            register=lambda res: ProductFileRepository.bulk_create(product.id, [res]),
+        )
+    except LookupError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+    except StorageUploadError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        # La sesión se restauró: el cliente puede reintentar con el mismo token
+        logger.exception(f"❌ Error registrando subida directa del producto {product.id}: {e}")
+        return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    invalidate_product_cache(product.id)
+    logger.debug("[Cache] producto %s invalidado tras UPLOAD directo", product.id)
+    return Response({"uploaded": [res["key"]], "errors": None}, status=status.HTTP_201_CREATED)
+
+
 @extend_schema(
     tags=product_image_list_doc["tags"],
     summary=product_image_list_doc["summary"],
@@ -105,18 +204,48 @@ def product_file_upload_view(request, product_id: str):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def product_file_list_view(request, product_id: str):
-    try:
-        Product.objects.get(pk=product_id)
-    except Product.DoesNotExist:
+    # Listado cacheado por producto; las URLs se firman en lote al responder
+    listings = get_product_file_rows([int(product_id)]) if product_id.isdigit() else {}
+    if not listings:
         raise ProductNotFound(f"Producto con ID {product_id} no existe.")
     try:
-        files = ProductFileRepository.get_all_by_product(product_id)
+        files = sign_product_listings(listings)[int(product_id)]
         return Response({"files": files}, status=status.HTTP_200_OK)
     except Exception as e:
         logger.exception(f"❌ Error listando archivos de producto {product_id}: {e}")
         return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@extend_schema(
+    tags=product_image_batch_list_doc["tags"],
+    summary=product_image_batch_list_doc["summary"],
+    operation_id=product_image_batch_list_doc["operation_id"],
+    description=product_image_batch_list_doc["description"],
+    parameters=product_image_batch_list_doc["parameters"],
+    responses=product_image_batch_list_doc["responses"],
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def product_file_batch_list_view(request):
+    """
+    Lista los archivos de varios productos (?ids=1,2,3) en una sola respuesta.
+    """
+    try:
+        ids = parse_ids(request.query_params.get("ids"))
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    listings = get_product_file_rows(ids)
+    signed = sign_product_listings(listings)
+    return Response(
+        {
+            "results": {str(pk): files for pk, files in signed.items()},
+            "not_found": [pk for pk in ids if pk not in listings],
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
 @extend_schema(
     tags=product_image_download_doc["tags"],
     summary=product_image_download_doc["summary"],
@@ -132,9 +261,12 @@ def product_file_download_view(request, product_id: str, file_id: str):
         Product.objects.get(pk=product_id)
     except Product.DoesNotExist:
         raise ProductNotFound(f"Producto con ID {product_id} no existe.")
-    if not ProductFileRepository.exists(product_id, file_id):
+    image = ProductFileRepository.get_by_id(file_id, product_id=product_id)
+    if image is None:
         raise Http404("Archivo no vinculado al producto.")
     try:
+        if proxy_requested(request):
+            return proxy_file_response(request, settings.AWS_PRODUCT_BUCKET_NAME, file_id, filename=image.name)
         url = get_product_file_url(file_id)
         return HttpResponseRedirect(url)
     except Exception as e:
@@ -160,15 +292,13 @@ def product_file_delete_view(request, product_id: str, file_id: str):
     if not ProductFileRepository.exists(product_id, file_id):
         return Response({"detail": "Archivo no vinculado al producto."}, status=status.HTTP_404_NOT_FOUND)
     try:
-        delete_product_file(file_id)
-        ProductFileRepository.delete(file_id)
-        # Invalidar caché de lista y detalle
-        deleted_list   = delete_keys_by_pattern(PRODUCT_LIST_CACHE_PREFIX)
-        deleted_detail = delete_keys_by_pattern(PRODUCT_DETAIL_CACHE_PREFIX)
-        logger.debug(
-            "[Cache] product_list invalidada (%d) y product_detail invalidada (%d) tras DELETE",
-            deleted_list, deleted_detail
+        # El objeto puede estar compartido por archivos deduplicados
+        delete_file_row(
+            file_id, lambda: ProductFileRepository.delete(file_id, product_id=product_id), delete_product_file
         )
+        # Invalidar caché de lista y detalle
+        invalidate_product_cache(product_id)
+        logger.debug("[Cache] producto %s invalidado tras DELETE", product_id)
         return Response({"detail": "Archivo eliminado correctamente."}, status=status.HTTP_200_OK)
     except Exception as e:
         logger.exception(f"❌ Error eliminando archivo {file_id}: {e}")
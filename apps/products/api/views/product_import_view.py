@@ -0,0 +1,52 @@
+# apps/products/api/views/product_import_view.py
+
+import logging
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from drf_spectacular.utils import extend_schema
+
+from apps.products.docs.product_doc import import_products_doc
+from apps.products.services.product_import_service import (
+    ImportFileError,
+    import_products,
+    iter_import_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@extend_schema(
+    summary=import_products_doc["summary"],
+    description=import_products_doc["description"],
+    tags=import_products_doc["tags"],
+    operation_id=import_products_doc["operation_id"],
+    parameters=import_products_doc["parameters"],
+    request=import_products_doc["requestBody"],
+    responses=import_products_doc["responses"]
+)
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+@parser_classes([MultiPartParser])
+def import_products_view(request):
+    """
+    Importa productos en lote desde un CSV/XLSX y devuelve el reporte por fila.
+    """
+    uploaded = request.FILES.get('file')
+    if uploaded is None:
+        return Response({"detail": "Se requiere el archivo en el campo 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+    dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true', 'yes')
+
+    try:
+        rows = iter_import_rows(uploaded.file, uploaded.name)
+        report = import_products(rows, request.user, dry_run=dry_run)
+    except ImportFileError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.exception(f"❌ Error importando productos: {e}")
+        return Response({"detail": "Error inesperado durante la importación."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    return Response(report, status=status.HTTP_200_OK)
@@ -6,7 +6,6 @@ from decimal import Decimal, InvalidOperation
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.views.decorators.cache import cache_page
 from django.shortcuts import get_object_or_404
 
 from rest_framework import status, serializers
@@ -15,40 +14,66 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from drf_spectacular.utils import extend_schema
 
-from django.db.models import Sum, F, Case, When, DecimalField, OuterRef, Subquery
-
-from apps.core.pagination import Pagination
+from apps.core.pagination import get_paginator
+from apps.core.conditional import conditional_get, make_etag
 from apps.products.api.serializers.product_serializer import ProductSerializer
 from apps.products.api.repositories.product_repository import ProductRepository
 from apps.products.filters.product_filter import ProductFilter
+from apps.products.services.batch_read_service import get_products_batch
+from apps.products.services.file_listing_service import parse_ids
 from apps.products.docs.product_doc import (
     list_product_doc,
     create_product_doc,
     get_product_by_id_doc,
     update_product_by_id_doc,
-    delete_product_by_id_doc
+    delete_product_by_id_doc,
+    batch_product_doc
 )
 from apps.products.utils.cache_helpers_products import (
     PRODUCT_LIST_CACHE_PREFIX,
     PRODUCT_DETAIL_CACHE_PREFIX,
     product_detail_cache_key,
+    product_version_namespace,
+    invalidate_product_cache,
+)
+from apps.products.utils.cache_helpers_core import (
+    bump_namespace_version,
+    get_namespace_version,
+    namespace_etag,
+)
+from apps.products.utils.cache_decorators import cached_view, LIST_CACHE_POLICY
+from apps.products.utils.thumbnail_urls import signed_thumbnails, thumbnail_etag
+from apps.stocks.models import ProductStock
+from apps.stocks.services import (
+    initialize_product_stock,
+    adjust_product_stock,
+    rebuild_current_stock
 )
-from apps.products.utils.redis_utils import delete_keys_by_pattern
-from apps.stocks.models import ProductStock, SubproductStock
-from apps.stocks.services import initialize_product_stock, adjust_product_stock
 
 logger = logging.getLogger(__name__)
 
 # ── CACHE DECORATORS ──────────────────────────────────────────
 list_cache = (
-    cache_page(None, key_prefix=PRODUCT_LIST_CACHE_PREFIX)
+    cached_view(PRODUCT_LIST_CACHE_PREFIX, policy=LIST_CACHE_POLICY)
     if not settings.DEBUG else (lambda fn: fn)
 )
 detail_cache = (
-    cache_page(None, key_prefix=PRODUCT_DETAIL_CACHE_PREFIX)
+    cached_view(
+        PRODUCT_DETAIL_CACHE_PREFIX,
+        key_func=lambda request, pk: product_detail_cache_key(pk)
+    )
     if not settings.DEBUG else (lambda fn: fn)
 )
 
+# ── VALIDADORES HTTP (GET condicional) ───────────────────────
+# Las respuestas llevan miniaturas firmadas: el ETag incluye la ventana de firma
+def product_list_etag(request):
+    return thumbnail_etag(namespace_etag(request, PRODUCT_LIST_CACHE_PREFIX))
+
+
+def product_detail_etag(request, prod_pk):
+    return thumbnail_etag(make_etag(get_namespace_version(product_version_namespace(prod_pk))))
+
 
 @extend_schema(
     summary=list_product_doc["summary"],
@@ -60,35 +85,16 @@ detail_cache = (
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(etag_func=product_list_etag)
+@signed_thumbnails
 @list_cache
 def product_list(request):
     """
     Listar productos activos con paginación y stock calculado.
-    TTL de cache: 
+    Cache: namespace versionado, TTL settings.CACHE_TTL (LIST_CACHE_POLICY).
     """
-    # Subqueries para stock
-    product_stock_sq = ProductStock.objects.filter(
-        product=OuterRef('pk'), status=True
-    ).values('quantity')[:1]
-    subp_stock_sq = SubproductStock.objects.filter(
-        subproduct__parent_id=OuterRef('pk'),
-        status=True,
-        subproduct__status=True
-    ).values('subproduct__parent').annotate(total=Sum('quantity')).values('total')
-
-    qs = ProductRepository.get_all_active_products().annotate(
-        individual_stock_qty=Subquery(product_stock_sq, output_field=DecimalField()),
-        subproduct_stock_total=Subquery(subp_stock_sq, output_field=DecimalField())
-    ).annotate(
-        current_stock=Case(
-            When(has_subproducts=False, individual_stock_qty__isnull=False,
-                 then=F('individual_stock_qty')),
-            When(has_subproducts=True, subproduct_stock_total__isnull=False,
-                 then=F('subproduct_stock_total')),
-            default=Decimal('0.00'),
-            output_field=DecimalField()
-        )
-    )
+    # Stock anotado + plan de prefetch (subproductos, imágenes y auditoría)
+    qs = ProductRepository.get_all_active_products_detailed()
 
     # Filtrado
     f = ProductFilter(request.GET, queryset=qs)
@@ -97,7 +103,7 @@ def product_list(request):
     qs = f.qs
 
     # Paginación y serialización
-    paginator = Pagination()
+    paginator = get_paginator(request)
     page = paginator.paginate_queryset(qs, request)
     data = ProductSerializer(page, many=True, context={'request': request}).data
     return paginator.get_paginated_response(data)
@@ -113,6 +119,7 @@ def product_list(request):
 )
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
+@signed_thumbnails
 def create_product(request):
     """
     Crear un nuevo producto (solo admins), con opción de inicializar stock.
@@ -152,6 +159,7 @@ def create_product(request):
                     initial_quantity=initial_qty,
                     reason=reason
                 )
+        product.refresh_from_db(fields=['current_stock'])
     except Exception as e:
         logger.error(f"Error creando producto: {e}")
         detail = getattr(e, 'detail', str(e))
@@ -160,12 +168,10 @@ def create_product(request):
                 else status.HTTP_500_INTERNAL_SERVER_ERROR)
         return Response({"detail": detail}, status=code)
 
-    # Invalidar cache de lista
-    deleted = delete_keys_by_pattern(PRODUCT_LIST_CACHE_PREFIX)
-    logger.debug(
-        "[Cache] '%s' invalidado tras CREATE (%d claves borradas)",
-        PRODUCT_LIST_CACHE_PREFIX, deleted
-    )
+    # Invalidar cache de lista tras el commit (la señal post_save corre dentro
+    # de la transacción y una lectura concurrente podría re-cachear datos viejos)
+    bump_namespace_version(PRODUCT_LIST_CACHE_PREFIX)
+    logger.debug("[Cache] '%s' invalidado tras CREATE", PRODUCT_LIST_CACHE_PREFIX)
 
     return Response(
         ProductSerializer(product, context={'request': request}).data,
@@ -173,6 +179,33 @@ def create_product(request):
     )
 
 
+@extend_schema(
+    summary=batch_product_doc["summary"],
+    description=batch_product_doc["description"],
+    tags=batch_product_doc["tags"],
+    operation_id=batch_product_doc["operation_id"],
+    parameters=batch_product_doc["parameters"],
+    responses=batch_product_doc["responses"]
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@signed_thumbnails
+def product_batch(request):
+    """
+    Varios productos por ID (?ids=1,2,3) reutilizando la caché de detalle.
+    """
+    try:
+        ids = parse_ids(request.query_params.get('ids'))
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    results, not_found = get_products_batch(ids, context={'request': request})
+    return Response(
+        {"results": {str(pk): data for pk, data in results.items()}, "not_found": not_found},
+        status=status.HTTP_200_OK
+    )
+
+
 @extend_schema(
     summary=get_product_by_id_doc["summary"],
     description=get_product_by_id_doc["description"],
@@ -200,6 +233,8 @@ def create_product(request):
 )
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
+@conditional_get(etag_func=product_detail_etag)
+@signed_thumbnails
 def product_detail(request, prod_pk):
     """
     GET: detalle cacheado (TTL 5min).
@@ -210,12 +245,12 @@ def product_detail(request, prod_pk):
     if not product:
         return Response({"detail": "Producto no encontrado."}, status=status.HTTP_404_NOT_FOUND)
 
-    # GET con cache_page
+    # GET cacheado (clave versionada por el namespace del producto)
     if request.method == 'GET':
         @detail_cache
         def cached_get(req, pk):
             obj = get_object_or_404(
-                ProductRepository.get_all_active_products(), pk=pk
+                ProductRepository.get_all_active_products_detailed(), pk=pk
             )
             return Response(ProductSerializer(obj, context={'request': req}).data)
 
@@ -232,14 +267,18 @@ def product_detail(request, prod_pk):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+        had_subproducts = product.has_subproducts
         try:
             with transaction.atomic():
                 updated = serializer.save(user=request.user)
+                if updated.has_subproducts != had_subproducts:
+                    # Cambia el origen del stock materializado: recalcular la columna
+                    rebuild_current_stock(product_ids=[updated.pk])
                 qty_change = serializer.validated_data.get('quantity_change')
                 reason     = serializer.validated_data.get('reason')
                 if qty_change is not None:
                     if not updated.has_subproducts:
-                        stock_rec = ProductStock.objects.select_for_update().get(product=updated)
+                        stock_rec = ProductStock.objects.get(product=updated)
                         adjust_product_stock(
                             product_stock=stock_rec,
                             quantity_change=qty_change,
@@ -248,6 +287,7 @@ def product_detail(request, prod_pk):
                         )
                     else:
                         raise ValidationError("No se puede ajustar stock de un producto con subproductos.")
+            updated.refresh_from_db(fields=['current_stock'])
         except Exception as e:
             logger.error(f"Error actualizando producto {prod_pk}: {e}")
             detail = getattr(e, 'detail', str(e))
@@ -257,13 +297,8 @@ def product_detail(request, prod_pk):
             return Response({"detail": detail}, status=code)
 
         # Invalidar cache de lista y detalle
-        deleted_list   = delete_keys_by_pattern(PRODUCT_LIST_CACHE_PREFIX)
-        deleted_detail = delete_keys_by_pattern(PRODUCT_DETAIL_CACHE_PREFIX)
-        logger.debug(
-            "[Cache] '%s' (%d) y '%s' (%d) invalidos tras UPDATE",
-            PRODUCT_LIST_CACHE_PREFIX, deleted_list,
-            PRODUCT_DETAIL_CACHE_PREFIX, deleted_detail
-        )
+        invalidate_product_cache(updated.pk)
+        logger.debug("[Cache] producto %s invalidado tras UPDATE", updated.pk)
 
         return Response(ProductSerializer(updated, context={'request': request}).data)
 
@@ -272,15 +307,7 @@ def product_detail(request, prod_pk):
         if not request.user.is_staff:
             return Response({"detail": "Permiso denegado."}, status=status.HTTP_403_FORBIDDEN)
 
-        product.delete(user=request.user)
-
-        # Invalidar cache de lista y detalle
-        deleted_list   = delete_keys_by_pattern(PRODUCT_LIST_CACHE_PREFIX)
-        deleted_detail = delete_keys_by_pattern(PRODUCT_DETAIL_CACHE_PREFIX)
-        logger.debug(
-            "[Cache] '%s' (%d) y '%s' (%d) invalidos tras DELETE",
-            PRODUCT_LIST_CACHE_PREFIX, deleted_list,
-            PRODUCT_DETAIL_CACHE_PREFIX, deleted_detail
-        )
+        # La caché del producto (detalle, subproductos y listados) se invalida en la señal post_save
+        ProductRepository.soft_delete(product, user=request.user)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
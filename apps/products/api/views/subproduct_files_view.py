@@ -1,6 +1,7 @@
 # apps/products/api/views/subproduct_files_view.py
 
 import logging
+from django.conf import settings
 from django.http import HttpResponseRedirect, Http404
 from rest_framework import status
 from rest_framework.response import Response
@@ -17,18 +18,34 @@ from apps.storages_client.services.subproducts_files import (
     upload_subproduct_file,
     delete_subproduct_file,
     get_subproduct_file_url,
+    _validate_file_extension,
 )
+from apps.products.services.file_dedup_service import (
+    delete_file_row,
+    register_deduplicated,
+    upload_deduplicated,
+)
+from apps.products.services.file_listing_service import (
+    get_subproduct_file_rows,
+    parse_ids,
+    sign_subproduct_listings,
+)
+from apps.storages_client.services.file_proxy import proxy_file_response, proxy_requested
+from apps.storages_client.services.upload_sessions import (
+    create_upload_session,
+    finalize_upload_session,
+)
+from apps.storages_client.exceptions import StorageUploadError
 from apps.products.docs.subproduct_image_doc import (
     subproduct_image_upload_doc,
     subproduct_image_list_doc,
+    subproduct_image_batch_list_doc,
     subproduct_image_download_doc,
     subproduct_image_delete_doc,
+    subproduct_image_upload_session_doc,
+    subproduct_image_upload_finalize_doc,
 )
-from apps.products.utils.cache_helpers_subproducts import (
-    SUBPRODUCT_LIST_CACHE_PREFIX,
-    SUBPRODUCT_DETAIL_CACHE_PREFIX,
-)
-from apps.products.utils.redis_utils import delete_keys_by_pattern
+from apps.products.utils.cache_helpers_subproducts import invalidate_subproduct_cache
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +63,7 @@ logger = logging.getLogger(__name__)
 @permission_classes([IsAdminUser])
 def subproduct_file_upload_view(request, product_id: str, subproduct_id: str):
     """
-    Sube uno o varios archivos para un subproducto.
+    Sube uno o varios archivos para un subproducto (transferencias concurrentes).
     Invalida caché de lista y detalle tras una subida exitosa.
     """
     # Verificar existencia de producto y subproducto
@@ -67,32 +84,38 @@ def subproduct_file_upload_view(request, product_id: str, subproduct_id: str):
     if not files:
         return Response({"detail": "No se proporcionaron archivos."}, status=status.HTTP_400_BAD_REQUEST)
 
-    results, errors = [], []
-    for f in files:
+    # Deduplicación por SHA-256 + transferencias a S3 en paralelo;
+    # las filas se insertan con un solo INSERT
+    uploaded, errors = upload_deduplicated(
+        files,
+        lambda f, content_hash: upload_subproduct_file(
+            file=f, product_id=product.id, subproduct_id=subproduct.id,
+            content_hash=content_hash,
+        ),
+        url_func=get_subproduct_file_url,
+        validate_func=_validate_file_extension,
+    )
+    results = []
+    if uploaded:
         try:
-            res = upload_subproduct_file(
-                file=f, product_id=product.id, subproduct_id=subproduct.id
+            registered, lost = register_deduplicated(
+                uploaded, lambda rows: SubproductFileRepository.bulk_create(subproduct.id, rows)
             )
-            SubproductFileRepository.create(
-                subproduct_id=subproduct.id,
-                key=res["key"],
-                url=res["url"],
-                name=res["name"],
-                mime_type=res["mimeType"],
-            )
-            results.append(res["key"])
+            results = [res["key"] for res in registered]
+            errors.extend(lost)
         except Exception as e:
-            logger.exception(f"❌ Error subiendo archivo {f.name}: {e}")
-            errors.append({f.name: str(e)})
+            logger.exception(f"❌ Error registrando archivos del subproducto {subproduct.id}: {e}")
+            # Sin fila no hay referencia al objeto: se retira del bucket
+            # (salvo los reutilizados, que pertenecen a otras filas)
+            for res in uploaded:
+                if not res.get("reused"):
+                    delete_subproduct_file(res["key"])
+                errors.append({res["name"]: str(e)})
 
     # Invalidar caché si hubo subidas exitosas
     if results:
-        deleted_list   = delete_keys_by_pattern(SUBPRODUCT_LIST_CACHE_PREFIX)
-        deleted_detail = delete_keys_by_pattern(SUBPRODUCT_DETAIL_CACHE_PREFIX)
-        logger.debug(
-            "[Cache] subproduct_list borrado (%d) y subproduct_detail borrado (%d) tras UPLOAD",
-            deleted_list, deleted_detail
-        )
+        invalidate_subproduct_cache(product.id, subproduct.id)
+        logger.debug("[Cache] subproducto %s invalidado tras UPLOAD", subproduct.id)
 
     # Si todos fallaron, devolvemos error apropiado
     if errors and not results:
@@ -110,6 +133,83 @@ def subproduct_file_upload_view(request, product_id: str, subproduct_id: str):
     )
 
 
+def _get_active_subproduct(product_id, subproduct_id):
+    try:
+        product = Product.objects.get(pk=product_id, status=True)
+    except Product.DoesNotExist:
+        raise ProductNotFound(f"Producto con ID {product_id} no existe.")
+    try:
+        return Subproduct.objects.get(pk=subproduct_id, parent_id=product.id, status=True)
+    except Subproduct.DoesNotExist:
+        raise Http404(
+            f"Subproducto con ID {subproduct_id} no existe para el producto {product_id}."
+        )
+
+
+@extend_schema(
+    tags=subproduct_image_upload_session_doc["tags"],
+    summary=subproduct_image_upload_session_doc["summary"],
+    operation_id=subproduct_image_upload_session_doc["operation_id"],
+    description=subproduct_image_upload_session_doc["description"],
+    parameters=subproduct_image_upload_session_doc["parameters"],
+    request=subproduct_image_upload_session_doc["request"]["content"]["application/json"]["schema"],
+    responses=subproduct_image_upload_session_doc["responses"],
+)
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def subproduct_file_upload_session_view(request, product_id: str, subproduct_id: str):
+    """
+    Crea una sesión de subida directa al bucket (POST presignado) para un subproducto.
+    """
+    subproduct = _get_active_subproduct(product_id, subproduct_id)
+    try:
+        session = create_upload_session(
+            scope={"product_id": subproduct.parent_id, "subproduct_id": subproduct.id},
+            filename=request.data.get("filename"),
+            content_type=request.data.get("content_type"),
+            size=request.data.get("size"),
+        )
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(session, status=status.HTTP_201_CREATED)
+
+
+@extend_schema(
+    tags=subproduct_image_upload_finalize_doc["tags"],
+    summary=subproduct_image_upload_finalize_doc["summary"],
+    operation_id=subproduct_image_upload_finalize_doc["operation_id"],
+    description=subproduct_image_upload_finalize_doc["description"],
+    parameters=subproduct_image_upload_finalize_doc["parameters"],
+    request=subproduct_image_upload_finalize_doc["request"]["content"]["application/json"]["schema"],
+    responses=subproduct_image_upload_finalize_doc["responses"],
+)
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def subproduct_file_upload_finalize_view(request, product_id: str, subproduct_id: str):
+    """
+    Confirma una subida directa (HEAD del objeto) y registra el archivo del subproducto.
+    """
+    subproduct = _get_active_subproduct(product_id, subproduct_id)
+    try:
+        res = finalize_upload_session(
+            request.data.get("token"),
+            scope={"product_id": subproduct.parent_id, "subproduct_id": subproduct.id},
+            register=lambda res: SubproductFileRepository.bulk_create(subproduct.id, [res]),
+        )
+    except LookupError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+    except StorageUploadError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        # La sesión se restauró: el cliente puede reintentar con el mismo token
+        logger.exception(f"❌ Error registrando subida directa del subproducto {subproduct.id}: {e}")
+        return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    invalidate_subproduct_cache(subproduct.parent_id, subproduct.id)
+    logger.debug("[Cache] subproducto %s invalidado tras UPLOAD directo", subproduct.id)
+    return Response({"uploaded": [res["key"]], "errors": None}, status=status.HTTP_201_CREATED)
+
+
 @extend_schema(
     tags=subproduct_image_list_doc["tags"],
     summary=subproduct_image_list_doc["summary"],
@@ -122,29 +222,58 @@ def subproduct_file_upload_view(request, product_id: str, subproduct_id: str):
 @permission_classes([IsAuthenticated])
 def subproduct_file_list_view(request, product_id: str, subproduct_id: str):
     """
-    Lista archivos de un subproducto.
+    Lista archivos de un subproducto (listado cacheado, URLs firmadas en lote).
     """
-    try:
-        product = Product.objects.get(pk=product_id, status=True)
-    except Product.DoesNotExist:
-        raise ProductNotFound(f"Producto con ID {product_id} no existe.")
-    try:
-        subproduct = Subproduct.objects.get(
-            pk=subproduct_id, parent_id=product.id, status=True
-        )
-    except Subproduct.DoesNotExist:
+    listings = {}
+    if product_id.isdigit() and subproduct_id.isdigit():
+        listings = get_subproduct_file_rows([int(subproduct_id)], parent_id=int(product_id))
+    if not listings:
         raise Http404(
             f"Subproducto con ID {subproduct_id} no existe para el producto {product_id}."
         )
 
     try:
-        files = SubproductFileRepository.get_all_by_subproduct(subproduct.id)
+        files = sign_subproduct_listings(listings)[int(subproduct_id)]
         return Response({"files": files}, status=status.HTTP_200_OK)
     except Exception as e:
         logger.exception(f"❌ Error listando archivos de subproducto {subproduct_id}: {e}")
         return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@extend_schema(
+    tags=subproduct_image_batch_list_doc["tags"],
+    summary=subproduct_image_batch_list_doc["summary"],
+    operation_id=subproduct_image_batch_list_doc["operation_id"],
+    description=subproduct_image_batch_list_doc["description"],
+    parameters=subproduct_image_batch_list_doc["parameters"],
+    responses=subproduct_image_batch_list_doc["responses"],
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def subproduct_file_batch_list_view(request, product_id: str):
+    """
+    Lista los archivos de varios subproductos de un producto (?ids=1,2,3).
+    """
+    try:
+        product = Product.objects.only("pk").get(pk=product_id, status=True)
+    except (Product.DoesNotExist, ValueError):
+        raise Http404(f"Producto con ID {product_id} no existe.")
+    try:
+        ids = parse_ids(request.query_params.get("ids"))
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    listings = get_subproduct_file_rows(ids, parent_id=product.pk)
+    signed = sign_subproduct_listings(listings)
+    return Response(
+        {
+            "results": {str(pk): files for pk, files in signed.items()},
+            "not_found": [pk for pk in ids if pk not in listings],
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
 @extend_schema(
     tags=subproduct_image_download_doc["tags"],
     summary=subproduct_image_download_doc["summary"],
@@ -157,7 +286,8 @@ def subproduct_file_list_view(request, product_id: str, subproduct_id: str):
 @permission_classes([IsAuthenticated])
 def subproduct_file_download_view(request, product_id: str, subproduct_id: str, file_id: str):
     """
-    Redirige a la URL presignada de un archivo de subproducto.
+    Redirige a la URL presignada de un archivo de subproducto,
+    o lo sirve por el proxy streaming (Range) si se pide.
     """
     try:
         product = Product.objects.get(pk=product_id, status=True)
@@ -172,10 +302,13 @@ def subproduct_file_download_view(request, product_id: str, subproduct_id: str,
             f"Subproducto con ID {subproduct_id} no existe para el producto {product_id}."
         )
 
-    if not SubproductFileRepository.exists(subproduct.id, file_id):
+    image = SubproductFileRepository.get_by_id(file_id, subproduct_id=subproduct.id)
+    if image is None:
         raise Http404(f"Archivo {file_id} no está vinculado al subproducto {subproduct_id}.")
 
     try:
+        if proxy_requested(request):
+            return proxy_file_response(request, settings.AWS_PRODUCT_BUCKET_NAME, file_id, filename=image.name)
         url = get_subproduct_file_url(file_id)
         return HttpResponseRedirect(url)
     except Exception as e:
@@ -215,15 +348,14 @@ def subproduct_file_delete_view(request, product_id: str, subproduct_id: str, fi
                         status=status.HTTP_404_NOT_FOUND)
 
     try:
-        delete_subproduct_file(file_id)
-        SubproductFileRepository.delete(file_id)
-
-        deleted_list   = delete_keys_by_pattern(SUBPRODUCT_LIST_CACHE_PREFIX)
-        deleted_detail = delete_keys_by_pattern(SUBPRODUCT_DETAIL_CACHE_PREFIX)
-        logger.debug(
-            "[Cache] subproduct_list borrado (%d) y subproduct_detail borrado (%d) tras DELETE",
-            deleted_list, deleted_detail
+        # El objeto puede estar compartido por archivos deduplicados
+        delete_file_row(
+            file_id, lambda: SubproductFileRepository.delete(file_id, subproduct_id=subproduct.id),
+            delete_subproduct_file,
         )
+
+        invalidate_subproduct_cache(product.id, subproduct.id)
+        logger.debug("[Cache] subproducto %s invalidado tras DELETE", subproduct.id)
         return Response({"detail": "Archivo eliminado correctamente."}, status=status.HTTP_200_OK)
     except Exception as e:
         logger.exception(f"❌ Error eliminando archivo {file_id} de subproducto {subproduct_id}: {e}")
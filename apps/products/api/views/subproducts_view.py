@@ -1,55 +1,81 @@
 # apps/products/api/views/subproducts_view.py
 
 import logging
-from decimal import Decimal
 
 from django.conf import settings
 from django.db import transaction
-from django.db.models import OuterRef, Subquery, DecimalField
-from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 
 from rest_framework import status, serializers
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from django.views.decorators.cache import cache_page
 from drf_spectacular.utils import extend_schema
 
-from apps.core.pagination import Pagination
+from apps.core.pagination import get_paginator
+from apps.core.conditional import conditional_get, make_etag
 from apps.products.api.serializers.subproduct_serializer import SubProductSerializer
 from apps.products.api.repositories.subproduct_repository import SubproductRepository
 from apps.products.filters.subproduct_filter import SubproductFilter
+from apps.products.services.batch_read_service import get_subproducts_batch
+from apps.products.services.file_listing_service import parse_ids
 from apps.products.docs.subproduct_doc import (
     list_subproducts_doc,
     create_subproduct_doc,
     get_subproduct_by_id_doc,
     update_subproduct_by_id_doc,
-    delete_subproduct_by_id_doc
+    delete_subproduct_by_id_doc,
+    batch_subproduct_doc
 )
 from apps.products.models.product_model import Product
 from apps.products.models.subproduct_model import Subproduct
 from apps.stocks.models import SubproductStock
-from apps.stocks.services import initialize_subproduct_stock, adjust_subproduct_stock
+from apps.stocks.services import (
+    initialize_subproduct_stock,
+    adjust_subproduct_stock,
+    rebuild_current_stock
+)
 
 from apps.products.utils.cache_helpers_subproducts import (
     SUBPRODUCT_LIST_CACHE_PREFIX,
-    SUBPRODUCT_DETAIL_CACHE_PREFIX
+    SUBPRODUCT_DETAIL_CACHE_PREFIX,
+    subproduct_detail_cache_key,
+    subproduct_list_namespace,
+    invalidate_subproduct_cache,
 )
-from apps.products.utils.redis_utils import delete_keys_by_pattern
+from apps.products.utils.cache_helpers_products import product_version_namespace
+from apps.products.utils.cache_helpers_core import get_namespace_version, namespace_etag
+from apps.products.utils.cache_decorators import cached_view, LIST_CACHE_POLICY
 
 logger = logging.getLogger(__name__)
 
 # ── CACHE DECORATORS ──────────────────────────────────────────
+# Listado versionado por producto padre; detalle con clave fija por pk.
 list_cache = (
-    cache_page(None, key_prefix=SUBPRODUCT_LIST_CACHE_PREFIX)
+    cached_view(
+        lambda request, prod_pk: subproduct_list_namespace(prod_pk),
+        label=SUBPRODUCT_LIST_CACHE_PREFIX,
+        policy=LIST_CACHE_POLICY
+    )
     if not settings.DEBUG else (lambda fn: fn)
 )
 detail_cache = (
-    cache_page(None, key_prefix=SUBPRODUCT_DETAIL_CACHE_PREFIX)
+    cached_view(
+        SUBPRODUCT_DETAIL_CACHE_PREFIX,
+        key_func=lambda request, prod_id, subp_id: subproduct_detail_cache_key(prod_id, subp_id)
+    )
     if not settings.DEBUG else (lambda fn: fn)
 )
 
+# ── VALIDADORES HTTP (GET condicional) ───────────────────────
+def subproduct_list_etag(request, prod_pk):
+    return namespace_etag(request, subproduct_list_namespace(prod_pk))
+
+
+def subproduct_detail_etag(request, prod_pk, subp_pk):
+    # Toda escritura de un subproducto bumpea la versión de su producto padre
+    return make_etag(get_namespace_version(product_version_namespace(prod_pk)), subp_pk)
+
 
 @extend_schema(
     summary=list_subproducts_doc["summary"],
@@ -61,6 +87,7 @@ detail_cache = (
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(etag_func=subproduct_list_etag)
 @list_cache
 def subproduct_list(request, prod_pk):
     """
@@ -68,30 +95,15 @@ def subproduct_list(request, prod_pk):
     """
     parent = get_object_or_404(Product, pk=prod_pk, status=True)
 
-    stock_sq = SubproductStock.objects.filter(
-        subproduct=OuterRef('pk'), status=True
-    ).values('quantity')[:1]
-
-    qs = SubproductRepository.get_all_active(parent.pk).annotate(
-        current_stock_val=Subquery(
-            stock_sq,
-            output_field=DecimalField(max_digits=15, decimal_places=2)
-        )
-    ).annotate(
-        current_stock=Coalesce(
-            'current_stock_val',
-            Decimal('0.00'),
-            output_field=DecimalField(max_digits=15, decimal_places=2)
-        )
-    )
+    # 'current_stock' es una columna materializada: no requiere anotación
+    qs = SubproductRepository.get_all_active(parent.pk)
 
     filt = SubproductFilter(request.GET, queryset=qs)
     if not filt.is_valid():
         return Response(filt.errors, status=status.HTTP_400_BAD_REQUEST)
     qs = filt.qs
 
-    paginator = Pagination()
-    paginator.page_size = 10
+    paginator = get_paginator(request)
     page = paginator.paginate_queryset(qs, request)
     data = SubProductSerializer(
         page, many=True,
@@ -100,6 +112,33 @@ def subproduct_list(request, prod_pk):
     return paginator.get_paginated_response(data)
 
 
+@extend_schema(
+    summary=batch_subproduct_doc["summary"],
+    description=batch_subproduct_doc["description"],
+    tags=batch_subproduct_doc["tags"],
+    operation_id=batch_subproduct_doc["operation_id"],
+    parameters=batch_subproduct_doc["parameters"],
+    responses=batch_subproduct_doc["responses"]
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def subproduct_batch(request, prod_pk):
+    """
+    Varios subproductos de un producto por ID (?ids=1,2,3) reutilizando la caché de detalle.
+    """
+    parent = get_object_or_404(Product, pk=prod_pk, status=True)
+    try:
+        ids = parse_ids(request.query_params.get('ids'))
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    results, not_found = get_subproducts_batch(parent, ids, context={'request': request})
+    return Response(
+        {"results": {str(pk): data for pk, data in results.items()}, "not_found": not_found},
+        status=status.HTTP_200_OK
+    )
+
+
 @extend_schema(
     summary=create_subproduct_doc["summary"],
     description=create_subproduct_doc["description"] + "\n\nInvalidará caché de lista y detalle tras CREATE.",
@@ -126,17 +165,14 @@ def create_subproduct(request, prod_pk):
         with transaction.atomic():
             subp = serializer.save(user=request.user)
             initialize_subproduct_stock(subp, request.user)
+        subp.refresh_from_db(fields=['current_stock'])
     except Exception as e:
         logger.error(f"Error creando subproducto: {e}")
         return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    # Invalidar caché de lista y detalle
-    deleted_list   = delete_keys_by_pattern(SUBPRODUCT_LIST_CACHE_PREFIX)
-    deleted_detail = delete_keys_by_pattern(SUBPRODUCT_DETAIL_CACHE_PREFIX)
-    logger.debug(
-        "[Cache] subproduct_list invalidada (%d claves) y subproduct_detail invalidada (%d claves) tras CREATE",
-        deleted_list, deleted_detail
-    )
+    # Invalidar caché tras el commit (el stock se materializa con UPDATE, sin señales)
+    invalidate_subproduct_cache(parent.pk, subp.pk)
+    logger.debug("[Cache] subproducto %s y producto %s invalidados tras CREATE", subp.pk, parent.pk)
 
     data = SubProductSerializer(
         subp,
@@ -172,6 +208,7 @@ def create_subproduct(request, prod_pk):
 )
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
+@conditional_get(etag_func=subproduct_detail_etag)
 def subproduct_detail(request, prod_pk, subp_pk):
     """
     GET: detalle cacheado (TTL=5min).
@@ -180,26 +217,11 @@ def subproduct_detail(request, prod_pk, subp_pk):
     """
     parent = get_object_or_404(Product, pk=prod_pk, status=True)
 
-    # GET con cache_page
+    # GET cacheado (clave versionada por el namespace del producto)
     if request.method == 'GET':
         @detail_cache
         def cached_get(req, prod_id, subp_id):
-            stock_sq = SubproductStock.objects.filter(
-                subproduct=OuterRef('pk'), status=True
-            ).values('quantity')[:1]
-            qs = Subproduct.objects.annotate(
-                current_stock_val=Subquery(
-                    stock_sq,
-                    output_field=DecimalField(max_digits=15, decimal_places=2)
-                )
-            ).annotate(
-                current_stock=Coalesce(
-                    'current_stock_val',
-                    Decimal('0.00'),
-                    output_field=DecimalField(max_digits=15, decimal_places=2)
-                )
-            )
-            inst = get_object_or_404(qs, pk=subp_id, parent=parent)
+            inst = get_object_or_404(Subproduct, pk=subp_id, parent=parent)
             ser = SubProductSerializer(
                 inst,
                 context={'request': req, 'parent_product': parent}
@@ -230,7 +252,7 @@ def subproduct_detail(request, prod_pk, subp_pk):
                 qty_change = serializer.validated_data.get('quantity_change')
                 reason     = serializer.validated_data.get('reason')
                 if qty_change is not None:
-                    stock_rec = SubproductStock.objects.select_for_update().get(
+                    stock_rec = SubproductStock.objects.get(
                         subproduct=updated, status=True
                     )
                     adjust_subproduct_stock(
@@ -239,17 +261,14 @@ def subproduct_detail(request, prod_pk, subp_pk):
                         reason=reason,
                         user=request.user
                     )
+            updated.refresh_from_db(fields=['current_stock'])
         except Exception as e:
             logger.error(f"Error actualizando subproducto {subp_pk}: {e}")
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         # Invalidar caché de lista y detalle
-        deleted_list   = delete_keys_by_pattern(SUBPRODUCT_LIST_CACHE_PREFIX)
-        deleted_detail = delete_keys_by_pattern(SUBPRODUCT_DETAIL_CACHE_PREFIX)
-        logger.debug(
-            "[Cache] subproduct_list invalidada (%d) y subproduct_detail invalidada (%d) tras UPDATE",
-            deleted_list, deleted_detail
-        )
+        invalidate_subproduct_cache(parent.pk, updated.pk)
+        logger.debug("[Cache] subproducto %s y producto %s invalidados tras UPDATE", updated.pk, parent.pk)
 
         data = SubProductSerializer(
             updated,
@@ -262,18 +281,17 @@ def subproduct_detail(request, prod_pk, subp_pk):
             return Response({"detail": "Sin permiso."}, status=status.HTTP_403_FORBIDDEN)
 
         try:
-            instance.delete(user=request.user)
+            with transaction.atomic():
+                SubproductRepository.soft_delete(instance, user=request.user)
+                # El subproducto deja de sumar al stock materializado del padre
+                rebuild_current_stock(product_ids=[parent.pk])
         except Exception as e:
             logger.error(f"Error eliminando subproducto {subp_pk}: {e}")
             return Response({"detail": "Error interno al eliminar."},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         # Invalidar caché de lista y detalle
-        deleted_list   = delete_keys_by_pattern(SUBPRODUCT_LIST_CACHE_PREFIX)
-        deleted_detail = delete_keys_by_pattern(SUBPRODUCT_DETAIL_CACHE_PREFIX)
-        logger.debug(
-            "[Cache] subproduct_list invalidada (%d) y subproduct_detail invalidada (%d) tras DELETE",
-            deleted_list, deleted_detail
-        )
+        invalidate_subproduct_cache(parent.pk, instance.pk)
+        logger.debug("[Cache] subproducto %s y producto %s invalidados tras DELETE", instance.pk, parent.pk)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -7,10 +7,10 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from django.views.decorators.cache import cache_page
 from drf_spectacular.utils import extend_schema
 
-from apps.core.pagination import Pagination
+from apps.core.pagination import get_paginator
+from apps.core.conditional import conditional_get, fingerprint_validators
 from apps.products.api.serializers.type_serializer import TypeSerializer
 from apps.products.api.repositories.type_repository import TypeRepository
 from apps.products.filters.type_filter import TypeFilter
@@ -22,17 +22,24 @@ from apps.products.docs.type_doc import (
     delete_type_by_id_doc
 )
 from apps.products.utils.cache_helpers_types import CACHE_KEY_TYPE_LIST
-from apps.products.utils.redis_utils import delete_keys_by_pattern
+from apps.products.utils.cache_decorators import cached_view, CATALOG_LIST_CACHE_POLICY
+from apps.products.utils.cache_helpers_core import namespace_etag
+from apps.products.models.type_model import Type
 
 logger = logging.getLogger(__name__)
 
 # ── CACHE DE LISTADO () ───────────────────────────────────
 cache_decorator = (
-    cache_page(None, key_prefix=CACHE_KEY_TYPE_LIST)
+    cached_view(CACHE_KEY_TYPE_LIST, policy=CATALOG_LIST_CACHE_POLICY)
     if not settings.DEBUG
     else (lambda fn: fn)
 )
 
+# ── VALIDADORES HTTP (GET condicional) ───────────────────────
+type_detail_etag, _ = fingerprint_validators(
+    lambda request, type_pk: Type.objects.filter(pk=type_pk, status=True)
+)
+
 
 @extend_schema(
     summary=list_type_doc["summary"],
@@ -47,6 +54,7 @@ cache_decorator = (
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(etag_func=lambda request: namespace_etag(request, CACHE_KEY_TYPE_LIST))
 @cache_decorator
 def type_list(request):
     """
@@ -55,7 +63,7 @@ def type_list(request):
     queryset = TypeRepository.get_all_active()
     filtered_qs = TypeFilter(request.GET, queryset=queryset).qs
 
-    paginator = Pagination()
+    paginator = get_paginator(request)
     page = paginator.paginate_queryset(filtered_qs, request)
     data = TypeSerializer(page, many=True, context={'request': request}).data
     return paginator.get_paginated_response(data)
@@ -79,12 +87,8 @@ def create_type(request):
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    # La caché de lista se invalida en la señal post_save (apps.products.signals)
     instance = serializer.save(user=request.user)
-    deleted = delete_keys_by_pattern(CACHE_KEY_TYPE_LIST)
-    logger.debug(
-        "Cache de type_list invalidada tras CREATE (borradas %d claves)",
-        deleted
-    )
 
     return Response(
         TypeSerializer(instance, context={'request': request}).data,
@@ -119,6 +123,7 @@ def create_type(request):
 )
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
+@conditional_get(etag_func=type_detail_etag)
 def type_detail(request, type_pk):
     """
     GET: detalle (no cacheado).
@@ -142,11 +147,6 @@ def type_detail(request, type_pk):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         updated = serializer.save(user=request.user)
-        deleted = delete_keys_by_pattern(CACHE_KEY_TYPE_LIST)
-        logger.debug(
-            "Cache de type_list invalidada tras UPDATE (borradas %d claves)",
-            deleted
-        )
         return Response(TypeSerializer(updated, context={'request': request}).data)
 
     # --- DELETE
@@ -154,9 +154,4 @@ def type_detail(request, type_pk):
         if not request.user.is_staff:
             return Response({"detail": "Sin permiso."}, status=status.HTTP_403_FORBIDDEN)
         TypeRepository.soft_delete(obj, user=request.user)
-        deleted = delete_keys_by_pattern(CACHE_KEY_TYPE_LIST)
-        logger.debug(
-            "Cache de type_list invalidada tras DELETE (borradas %d claves)",
-            deleted
-        )
         return Response(status=status.HTTP_204_NO_CONTENT)
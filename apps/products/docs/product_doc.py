@@ -1,5 +1,7 @@
 from drf_spectacular.utils import OpenApiResponse, OpenApiParameter
 
+from apps.core.pagination import CURSOR_PAGINATION_PARAMETERS
+
 # --- Listar productos ---
 list_product_doc = {
     "tags": ["Products"],
@@ -14,7 +16,11 @@ list_product_doc = {
     "parameters": [
         OpenApiParameter(name="category", location=OpenApiParameter.QUERY, description="Filtra productos por ID de categoría", required=False, type=int),
         OpenApiParameter(name="type", location=OpenApiParameter.QUERY, description="Filtra productos por ID de tipo", required=False, type=int),
-        OpenApiParameter(name="status", location=OpenApiParameter.QUERY, description="Filtra productos activos o inactivos", required=False, type=bool)
+        OpenApiParameter(name="status", location=OpenApiParameter.QUERY, description="Filtra productos activos o inactivos", required=False, type=bool),
+        OpenApiParameter(name="stock_lt", location=OpenApiParameter.QUERY, description="Productos con stock actual menor al valor indicado", required=False, type=float),
+        OpenApiParameter(name="stock_gt", location=OpenApiParameter.QUERY, description="Productos con stock actual mayor al valor indicado", required=False, type=float),
+        OpenApiParameter(name="ordering", location=OpenApiParameter.QUERY, description="Orden: current_stock, created_at, name o code (prefijo '-' para descendente)", required=False, type=str),
+        *CURSOR_PAGINATION_PARAMETERS,
     ],
     "responses": {
         200: OpenApiResponse(
@@ -115,3 +121,140 @@ delete_product_by_id_doc = {
         404: OpenApiResponse(description="Producto no encontrado")
     }
 }
+
+# --- Importación masiva de productos (CSV/XLSX) ---
+import_products_doc = {
+    "tags": ["Products"],
+    "summary": "Importar productos desde CSV o XLSX",
+    "operation_id": "import_products",
+    "description": (
+        "Crea productos en lote a partir de un archivo `.csv` o `.xlsx` (campo `file`). "
+        "Columnas: `name`, `code`, `description`, `brand`, `location`, `position`, "
+        "`category` y `type` (ID o nombre), `initial_stock_quantity`, `initial_stock_reason`. "
+        "Las filas se procesan por lotes: cada lote se inserta en una transacción junto con su "
+        "stock inicial. Las filas inválidas (categoría inexistente, código o nombre repetido, "
+        "cantidad inválida) no se crean y se informan en `errors` con su número de fila. "
+        "Con `?dry_run=true` solo se valida."
+    ),
+    "parameters": [
+        OpenApiParameter(name="dry_run", location=OpenApiParameter.QUERY, required=False, type=bool, description="Validar sin crear productos"),
+    ],
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        }
+    },
+    "responses": {
+        200: OpenApiResponse(
+            description="Reporte de la importación",
+            response={
+                'application/json': {
+                    'schema': {
+                        'type': 'object',
+                        'properties': {
+                            'total_rows': {'type': 'integer'},
+                            'created': {'type': 'integer'},
+                            'failed': {'type': 'integer'},
+                            'dry_run': {'type': 'boolean'},
+                            'errors': {
+                                'type': 'array',
+                                'items': {
+                                    'type': 'object',
+                                    'properties': {
+                                        'row': {'type': 'integer'},
+                                        'errors': {'type': 'object'},
+                                    }
+                                }
+                            },
+                        }
+                    }
+                }
+            }
+        ),
+        400: OpenApiResponse(description="Archivo ausente, con formato no soportado o encabezados inválidos")
+    }
+}
+
+# --- Exportación del catálogo (CSV/NDJSON/XLSX) ---
+export_products_doc = {
+    "tags": ["Products"],
+    "summary": "Exportar catálogo activo con stock",
+    "operation_id": "export_products",
+    "description": (
+        "Exporta todos los productos activos con su stock actual en un solo archivo, "
+        "sin paginar. CSV y NDJSON se transmiten en streaming a medida que se leen de la base; "
+        "XLSX se genera en un archivo temporal. Acepta los mismos filtros que el listado. "
+        "Con `?async=true` la exportación se genera en segundo plano, se guarda en el bucket "
+        "de productos y se responde 202 con un `task_id` para consultar su estado."
+    ),
+    "parameters": [
+        OpenApiParameter(name="export_format", location=OpenApiParameter.QUERY, description="Formato: csv (por defecto), ndjson o xlsx", required=False, type=str),
+        OpenApiParameter(name="async", location=OpenApiParameter.QUERY, description="Generar en segundo plano y guardar en el bucket", required=False, type=bool),
+        OpenApiParameter(name="category", location=OpenApiParameter.QUERY, description="Filtra por nombre de categoría (parcial)", required=False, type=str),
+        OpenApiParameter(name="type", location=OpenApiParameter.QUERY, description="Filtra por nombre de tipo (parcial)", required=False, type=str),
+        OpenApiParameter(name="stock_lt", location=OpenApiParameter.QUERY, description="Productos con stock actual menor al valor indicado", required=False, type=float),
+        OpenApiParameter(name="stock_gt", location=OpenApiParameter.QUERY, description="Productos con stock actual mayor al valor indicado", required=False, type=float),
+    ],
+    "responses": {
+        200: OpenApiResponse(description="Archivo de exportación (descarga)"),
+        202: OpenApiResponse(description="Exportación encolada; devuelve task_id"),
+        400: OpenApiResponse(description="Formato o filtros inválidos")
+    }
+}
+
+# --- Estado de una exportación asíncrona ---
+export_products_status_doc = {
+    "tags": ["Products"],
+    "summary": "Consultar exportación asíncrona",
+    "operation_id": "export_products_status",
+    "description": (
+        "Devuelve el estado de una exportación encolada con `?async=true` por el mismo usuario. "
+        "Al finalizar incluye `key`, `rows` y `url` (presignada en cada consulta)."
+    ),
+    "parameters": [
+        OpenApiParameter(name="task_id", location=OpenApiParameter.PATH, required=True, description="ID de la tarea de exportación", type=str)
+    ],
+    "responses": {
+        200: OpenApiResponse(description="Exportación lista"),
+        202: OpenApiResponse(description="Exportación en curso"),
+        404: OpenApiResponse(description="No es una exportación del usuario"),
+        500: OpenApiResponse(description="La exportación falló")
+    }
+}
+
+# --- Lectura en lote de productos ---
+batch_product_doc = {
+    "tags": ["Products"],
+    "summary": "Obtener varios productos por ID",
+    "operation_id": "batch_retrieve_products",
+    "description": (
+        "Devuelve en una sola respuesta los productos activos indicados en `ids` (máximo 100), "
+        "con el mismo formato que el detalle y agrupados por ID. Reutiliza la caché de detalle "
+        "de cada producto y resuelve los faltantes con una sola consulta. "
+        "Los ids inexistentes o inactivos se devuelven en `not_found`."
+    ),
+    "parameters": [
+        OpenApiParameter(name="ids", location=OpenApiParameter.QUERY, required=True, description="IDs de productos separados por coma (ej.: 1,2,3)", type=str)
+    ],
+    "responses": {
+        200: OpenApiResponse(description="Productos por ID", response={
+            'application/json': {
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'results': {'type': 'object', 'additionalProperties': {'$ref': '#/components/schemas/Product'}},
+                        'not_found': {'type': 'array', 'items': {'type': 'integer'}}
+                    }
+                }
+            }
+        }),
+        400: OpenApiResponse(description="Parámetro 'ids' ausente o inválido")
+    }
+}
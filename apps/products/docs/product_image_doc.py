@@ -8,7 +8,9 @@ product_image_upload_doc = {
     "description": (
         "Sube uno o varios archivos multimedia (imágenes o videos) asociados a un producto. "
         "Solo administradores pueden realizar esta acción. "
-        "Los formatos permitidos son configurables vía `ALLOWED_UPLOAD_EXTENSIONS` en el entorno."
+        "Los formatos permitidos son configurables vía `ALLOWED_UPLOAD_EXTENSIONS` en el entorno. "
+        "Los archivos con contenido idéntico (SHA-256) a uno ya registrado reutilizan el objeto "
+        "existente en el bucket en lugar de subirse de nuevo."
     ),
     "parameters": [
         OpenApiParameter(
@@ -56,6 +58,8 @@ product_image_list_doc = {
     "operation_id": "listProductFiles",
     "description": (
         "Devuelve una lista de archivos multimedia (imágenes o videos) asociados a un producto. "
+        "Las imágenes incluyen `thumbnails` ({lado: URL firmada}) con las miniaturas WebP, "
+        "vacío hasta que la tarea en segundo plano las genera. "
         "Requiere autenticación."
     ),
     "parameters": [
@@ -82,6 +86,11 @@ product_image_list_doc = {
                                     "id": {"type": "string"},
                                     "name": {"type": "string"},
                                     "mimeType": {"type": "string"},
+                                    "url": {"type": "string"},
+                                    "thumbnails": {
+                                        "type": "object",
+                                        "additionalProperties": {"type": "string"}
+                                    },
                                     "createdTime": {"type": "string", "format": "date-time"}
                                 }
                             }
@@ -95,6 +104,46 @@ product_image_list_doc = {
     }
 }
 
+# --- Listar archivos de varios productos ---
+product_image_batch_list_doc = {
+    "tags": ["Productos - Archivos"],
+    "summary": "Listar archivos de varios productos",
+    "operation_id": "batchListProductFiles",
+    "description": (
+        "Devuelve en una sola respuesta los archivos de los productos indicados en `ids` "
+        "(máximo 100), agrupados por id de producto. Los listados se cachean por producto "
+        "y se invalidan al subir o eliminar archivos; las URLs se firman en lote en cada respuesta. "
+        "Los ids inexistentes o inactivos se devuelven en `not_found`. Requiere autenticación."
+    ),
+    "parameters": [
+        OpenApiParameter(
+            name="ids",
+            location=OpenApiParameter.QUERY,
+            required=True,
+            type=str,
+            description="IDs de productos separados por coma (ej.: 1,2,3)"
+        )
+    ],
+    "responses": {
+        200: OpenApiResponse(
+            description="Archivos agrupados por producto",
+            response={
+                "application/json": {
+                    "type": "object",
+                    "properties": {
+                        "results": {
+                            "type": "object",
+                            "additionalProperties": {"type": "array", "items": {"type": "object"}}
+                        },
+                        "not_found": {"type": "array", "items": {"type": "integer"}}
+                    }
+                }
+            }
+        ),
+        400: OpenApiResponse(description="Parámetro `ids` ausente o inválido")
+    }
+}
+
 # --- Eliminar archivo multimedia del producto ---
 product_image_delete_doc = {
     "tags": ["Productos - Archivos"],
@@ -135,7 +184,10 @@ product_image_download_doc = {
     "description": (
         "Descarga un archivo multimedia (imagen o video) vinculado a un producto. "
         "Requiere autenticación con token JWT. "
-        "El archivo se devuelve como binario con cabecera `Content-Disposition: inline`. "
+        "Por defecto redirige (302) a una URL presignada. Con `?proxy=true` (o "
+        "STORAGE_DOWNLOAD_PROXY activo) el archivo se sirve en streaming con cabecera "
+        "`Content-Disposition: inline`, soporte de `Range` (206) y ETag, desde una caché "
+        "local en disco cuando el objeto ya fue servido. "
         "El parámetro `?force=true` permite omitir validación de asociación."
     ),
     "parameters": [
@@ -159,11 +211,87 @@ product_image_download_doc = {
             required=False,
             type=bool,
             description="Omitir validación de vinculación del archivo con el producto"
+        ),
+        OpenApiParameter(
+            name="proxy",
+            location=OpenApiParameter.QUERY,
+            required=False,
+            type=bool,
+            description="Servir el archivo a través de la API (streaming con soporte de Range) en lugar de redirigir"
         )
     ],
     "responses": {
         200: OpenApiResponse(description="Archivo descargado exitosamente"),
+        206: OpenApiResponse(description="Rango parcial del archivo (modo proxy con cabecera Range)"),
+        302: OpenApiResponse(description="Redirección a la URL presignada"),
+        416: OpenApiResponse(description="Rango no satisfacible"),
         404: OpenApiResponse(description="Archivo no encontrado o acceso no permitido"),
         500: OpenApiResponse(description="Error inesperado al descargar archivo")
     }
 }
+
+# --- Sesión de subida directa al bucket ---
+product_image_upload_session_doc = {
+    "tags": ["Productos - Archivos"],
+    "summary": "Crear sesión de subida directa (producto)",
+    "operation_id": "createProductFileUploadSession",
+    "description": (
+        "Devuelve un POST presignado para subir un archivo directamente a MinIO/S3, sin pasar por el servidor. "
+        "La política exige el `content_type` declarado y un tamaño de 1 a `size` bytes "
+        "(máximo `STORAGE_DIRECT_UPLOAD_MAX_BYTES`). Enviar el archivo como multipart/form-data a `upload.url` "
+        "con los `upload.fields` y luego confirmar con el endpoint de finalización. Solo administradores."
+    ),
+    "parameters": product_image_upload_doc["parameters"],
+    "request": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "filename": {"type": "string", "example": "bobina.mp4"},
+                        "content_type": {"type": "string", "example": "video/mp4"},
+                        "size": {"type": "integer", "description": "Tamaño en bytes", "example": 10485760}
+                    },
+                    "required": ["filename", "content_type", "size"]
+                }
+            }
+        }
+    },
+    "responses": {
+        201: OpenApiResponse(description="Sesión creada: token, key, upload (url + fields), expires_in, max_size"),
+        400: OpenApiResponse(description="Nombre, tipo o tamaño inválidos"),
+        404: OpenApiResponse(description="Producto no encontrado")
+    }
+}
+
+# --- Finalizar subida directa ---
+product_image_upload_finalize_doc = {
+    "tags": ["Productos - Archivos"],
+    "summary": "Finalizar subida directa (producto)",
+    "operation_id": "finalizeProductFileUpload",
+    "description": (
+        "Verifica (HEAD) que el archivo de la sesión esté en el bucket con el tamaño y tipo declarados "
+        "y registra el archivo del producto. Cada token se puede finalizar una sola vez."
+    ),
+    "parameters": product_image_upload_doc["parameters"],
+    "request": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "token": {"type": "string", "description": "Token devuelto al crear la sesión"}
+                    },
+                    "required": ["token"]
+                }
+            }
+        }
+    },
+    "responses": {
+        201: OpenApiResponse(description="Archivo registrado"),
+        400: OpenApiResponse(description="El archivo no está en el bucket o no coincide con la sesión"),
+        404: OpenApiResponse(description="Sesión inexistente o vencida, o producto no encontrado")
+    }
+}
@@ -1,5 +1,7 @@
 from drf_spectacular.utils import OpenApiResponse, OpenApiParameter
 
+from apps.core.pagination import CURSOR_PAGINATION_PARAMETERS
+
 # --- Listar subproductos ---
 list_subproducts_doc = {
     "tags": ["Subproducts"],
@@ -18,6 +20,28 @@ list_subproducts_doc = {
             required=True,
             type=int
         ),
+        OpenApiParameter(
+            name="stock_lt",
+            location=OpenApiParameter.QUERY,
+            description="Subproductos con stock actual menor al valor indicado",
+            required=False,
+            type=float
+        ),
+        OpenApiParameter(
+            name="stock_gt",
+            location=OpenApiParameter.QUERY,
+            description="Subproductos con stock actual mayor al valor indicado",
+            required=False,
+            type=float
+        ),
+        OpenApiParameter(
+            name="ordering",
+            location=OpenApiParameter.QUERY,
+            description="Orden: current_stock, created_at o number_coil (prefijo '-' para descendente)",
+            required=False,
+            type=str
+        ),
+        *CURSOR_PAGINATION_PARAMETERS,
     ],
     "responses": {
         200: OpenApiResponse(description="Lista de subproductos con stock y paginación para el producto padre"),
@@ -159,3 +183,25 @@ delete_subproduct_by_id_doc = {
         404: OpenApiResponse(description="Subproducto no encontrado")
     }
 }
+
+# --- Lectura en lote de subproductos ---
+batch_subproduct_doc = {
+    "tags": ["Subproducts"],
+    "summary": "Obtener varios subproductos por ID",
+    "operation_id": "batch_retrieve_subproducts",
+    "description": (
+        "Devuelve en una sola respuesta los subproductos activos del producto indicados en `ids` "
+        "(máximo 100), con el mismo formato que el detalle y agrupados por ID. Reutiliza la caché "
+        "de detalle de cada subproducto y resuelve los faltantes con una sola consulta. "
+        "Los ids inexistentes, inactivos o de otro producto se devuelven en `not_found`."
+    ),
+    "parameters": [
+        OpenApiParameter(name="prod_pk", location=OpenApiParameter.PATH, required=True, description="ID del producto padre", type=int),
+        OpenApiParameter(name="ids", location=OpenApiParameter.QUERY, required=True, description="IDs de subproductos separados por coma (ej.: 1,2,3)", type=str)
+    ],
+    "responses": {
+        200: OpenApiResponse(description="Subproductos por ID"),
+        400: OpenApiResponse(description="Parámetro 'ids' ausente o inválido"),
+        404: OpenApiResponse(description="Producto padre no encontrado")
+    }
+}
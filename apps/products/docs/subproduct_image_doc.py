@@ -9,7 +9,9 @@ subproduct_image_upload_doc = {
     "description": (
         "Sube uno o varios archivos multimedia (imágenes o PDFs) a un subproducto específico. "
         "Solo administradores pueden realizar esta acción. "
-        "Los formatos permitidos son configurables vía `ALLOWED_UPLOAD_EXTENSIONS` en el entorno."
+        "Los formatos permitidos son configurables vía `ALLOWED_UPLOAD_EXTENSIONS` en el entorno. "
+        "Los archivos con contenido idéntico (SHA-256) a uno ya registrado reutilizan el objeto "
+        "existente en el bucket en lugar de subirse de nuevo."
     ),
     "parameters": [
         OpenApiParameter(name="product_id", location=OpenApiParameter.PATH, required=True, type=str, description="ID del producto padre"),
@@ -47,7 +49,10 @@ subproduct_image_list_doc = {
     "tags": ["Subproductos - Archivos"],
     "summary": "Listar archivos del subproducto",
     "operation_id": "listSubproductFiles",
-    "description": "Devuelve todos los archivos registrados en la base de datos para un subproducto.",
+    "description": (
+        "Devuelve todos los archivos registrados en la base de datos para un subproducto. "
+        "Las imágenes incluyen `thumbnails` ({lado: URL firmada}) con las miniaturas WebP."
+    ),
     "parameters": [
         OpenApiParameter(name="product_id", location=OpenApiParameter.PATH, required=True, type=str, description="ID del producto padre"),
         OpenApiParameter(name="subproduct_id", location=OpenApiParameter.PATH, required=True, type=str, description="ID del subproducto")
@@ -62,6 +67,28 @@ subproduct_image_list_doc = {
     }
 }
 
+# --- Listar archivos de varios subproductos ---
+subproduct_image_batch_list_doc = {
+    "tags": ["Subproductos - Archivos"],
+    "summary": "Listar archivos de varios subproductos",
+    "operation_id": "batchListSubproductFiles",
+    "description": (
+        "Devuelve los archivos de los subproductos del producto indicados en `ids` (máximo 100), "
+        "agrupados por id de subproducto, con el mismo formato que el listado individual. "
+        "Los listados se cachean por subproducto; los ids que no pertenecen al producto o están "
+        "inactivos se devuelven en `not_found`."
+    ),
+    "parameters": [
+        OpenApiParameter(name="product_id", location=OpenApiParameter.PATH, required=True, type=str, description="ID del producto padre"),
+        OpenApiParameter(name="ids", location=OpenApiParameter.QUERY, required=True, type=str, description="IDs de subproductos separados por coma (ej.: 1,2,3)")
+    ],
+    "responses": {
+        200: OpenApiResponse(description="Archivos agrupados por subproducto: {results: {id: [...]}, not_found: [...]}"),
+        400: OpenApiResponse(description="Parámetro `ids` ausente o inválido"),
+        404: OpenApiResponse(description="Producto no encontrado")
+    }
+}
+
 # --- Descargar archivo del subproducto ---
 subproduct_image_download_doc = {
     "tags": ["Subproductos - Archivos"],
@@ -69,15 +96,21 @@ subproduct_image_download_doc = {
     "operation_id": "downloadSubproductFile",
     "description": (
         "Descarga un archivo multimedia (imagen o PDF) asociado a un subproducto. "
-        "Requiere autenticación y validación de asociación con el subproducto correspondiente."
+        "Requiere autenticación y validación de asociación con el subproducto correspondiente. "
+        "Por defecto redirige a una URL presignada; con `?proxy=true` se sirve en streaming "
+        "con soporte de `Range` (206) y ETag, desde caché local en disco si está disponible."
     ),
     "parameters": [
         OpenApiParameter(name="product_id", location=OpenApiParameter.PATH, required=True, type=str, description="ID del producto padre"),
         OpenApiParameter(name="subproduct_id", location=OpenApiParameter.PATH, required=True, type=str, description="ID del subproducto"),
         OpenApiParameter(name="file_id", location=OpenApiParameter.PATH, required=True, type=str, description="ID del archivo a descargar"),
+        OpenApiParameter(name="proxy", location=OpenApiParameter.QUERY, required=False, type=bool, description="Servir el archivo por la API (streaming con Range) en lugar de redirigir"),
     ],
     "responses": {
         200: OpenApiResponse(description="Archivo descargado correctamente"),
+        206: OpenApiResponse(description="Rango parcial del archivo (modo proxy)"),
+        302: OpenApiResponse(description="Redirección a la URL presignada"),
+        416: OpenApiResponse(description="Rango no satisfacible"),
         404: OpenApiResponse(description="Archivo no vinculado o subproducto inexistente"),
         500: OpenApiResponse(description="Error al intentar descargar el archivo")
     }
@@ -103,3 +136,69 @@ subproduct_image_delete_doc = {
         500: OpenApiResponse(description="Error inesperado al eliminar archivo")
     }
 }
+
+# --- Sesión de subida directa al bucket ---
+subproduct_image_upload_session_doc = {
+    "tags": ["Subproductos - Archivos"],
+    "summary": "Crear sesión de subida directa (subproducto)",
+    "operation_id": "createSubproductFileUploadSession",
+    "description": (
+        "Devuelve un POST presignado para subir un archivo directamente a MinIO/S3, sin pasar por el servidor. "
+        "La política exige el `content_type` declarado y un tamaño de 1 a `size` bytes "
+        "(máximo `STORAGE_DIRECT_UPLOAD_MAX_BYTES`). Enviar el archivo como multipart/form-data a `upload.url` "
+        "con los `upload.fields` y luego confirmar con el endpoint de finalización. Solo administradores."
+    ),
+    "parameters": subproduct_image_upload_doc["parameters"],
+    "request": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "filename": {"type": "string", "example": "bobina.mp4"},
+                        "content_type": {"type": "string", "example": "video/mp4"},
+                        "size": {"type": "integer", "description": "Tamaño en bytes", "example": 10485760}
+                    },
+                    "required": ["filename", "content_type", "size"]
+                }
+            }
+        }
+    },
+    "responses": {
+        201: OpenApiResponse(description="Sesión creada: token, key, upload (url + fields), expires_in, max_size"),
+        400: OpenApiResponse(description="Nombre, tipo o tamaño inválidos"),
+        404: OpenApiResponse(description="Subproducto no encontrado")
+    }
+}
+
+# --- Finalizar subida directa ---
+subproduct_image_upload_finalize_doc = {
+    "tags": ["Subproductos - Archivos"],
+    "summary": "Finalizar subida directa (subproducto)",
+    "operation_id": "finalizeSubproductFileUpload",
+    "description": (
+        "Verifica (HEAD) que el archivo de la sesión esté en el bucket con el tamaño y tipo declarados "
+        "y registra el archivo del subproducto. Cada token se puede finalizar una sola vez."
+    ),
+    "parameters": subproduct_image_upload_doc["parameters"],
+    "request": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "token": {"type": "string", "description": "Token devuelto al crear la sesión"}
+                    },
+                    "required": ["token"]
+                }
+            }
+        }
+    },
+    "responses": {
+        201: OpenApiResponse(description="Archivo registrado"),
+        400: OpenApiResponse(description="El archivo no está en el bucket o no coincide con la sesión"),
+        404: OpenApiResponse(description="Sesión inexistente o vencida, o subproducto no encontrado")
+    }
+}
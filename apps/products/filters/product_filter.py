@@ -10,6 +10,8 @@ class ProductFilter(django_filters.FilterSet):
     Filtro para el modelo Product:
     - code: búsqueda parcial por prefijo (startswith)
     - category/type: búsqueda insensible a mayúsculas (icontains)
+    - stock_lt/stock_gt: umbral sobre la columna materializada 'current_stock'
+    - ordering: orden por stock, fecha, nombre o código (prefijo '-' = desc)
     """
 
     code = django_filters.CharFilter(
@@ -30,6 +32,28 @@ class ProductFilter(django_filters.FilterSet):
         label='Filtrar por tipo (nombre parcial)'
     )
 
+    stock_lt = django_filters.NumberFilter(
+        field_name='current_stock',
+        lookup_expr='lt',
+        label='Stock actual menor que'
+    )
+
+    stock_gt = django_filters.NumberFilter(
+        field_name='current_stock',
+        lookup_expr='gt',
+        label='Stock actual mayor que'
+    )
+
+    ordering = django_filters.OrderingFilter(
+        fields=(
+            ('current_stock', 'current_stock'),
+            ('created_at', 'created_at'),
+            ('name', 'name'),
+            ('code', 'code'),
+        ),
+        label='Ordenar por (current_stock, created_at, name, code)'
+    )
+
     def __init__(self, data=None, queryset=None, *, request=None, prefix=None):
         # Validar que code tenga solo dígitos (no letras o símbolos)
         if data and 'code' in data and data['code'] != '':
@@ -39,4 +63,4 @@ class ProductFilter(django_filters.FilterSet):
 
     class Meta:
         model = Product
-        fields = ['code', 'category', 'type']
+        fields = ['code', 'category', 'type', 'stock_lt', 'stock_gt']
@@ -5,7 +5,8 @@ class SubproductFilter(django_filters.FilterSet):
     """
     Filtro para Subproduct que permite 
     — además de otros filtros que quieras añadir —
-    filtrar por su campo 'status' (activo/inactivo).
+    filtrar por su campo 'status' (activo/inactivo), por umbral de stock
+    ('stock_lt'/'stock_gt' sobre 'current_stock') y ordenar con 'ordering'.
     """
     status = django_filters.BooleanFilter(
         field_name='status',
@@ -13,7 +14,28 @@ class SubproductFilter(django_filters.FilterSet):
         help_text='True para activos, False para inactivos'
     )
 
+    stock_lt = django_filters.NumberFilter(
+        field_name='current_stock',
+        lookup_expr='lt',
+        label='Stock actual menor que'
+    )
+
+    stock_gt = django_filters.NumberFilter(
+        field_name='current_stock',
+        lookup_expr='gt',
+        label='Stock actual mayor que'
+    )
+
+    ordering = django_filters.OrderingFilter(
+        fields=(
+            ('current_stock', 'current_stock'),
+            ('created_at', 'created_at'),
+            ('number_coil', 'number_coil'),
+        ),
+        label='Ordenar por (current_stock, created_at, number_coil)'
+    )
+
     class Meta:
         model = Subproduct
-        fields = ['status']
+        fields = ['status', 'stock_lt', 'stock_gt']
         # aquí podrías añadir más campos si en el futuro quieres filtrar por brand, location, etc.
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+
+from apps.products.models import ProductImage, SubproductImage
+from apps.products.tasks import (
+    generate_product_image_thumbnails,
+    generate_subproduct_image_thumbnails,
+)
+from apps.storages_client.services.thumbnails import is_thumbnailable
+
+TARGETS = {
+    "products": (ProductImage, generate_product_image_thumbnails),
+    "subproducts": (SubproductImage, generate_subproduct_image_thumbnails),
+}
+
+
+class Command(BaseCommand):
+    """
+    Genera las miniaturas de las imágenes existentes que todavía no las tienen.
+    """
+    help = "Encola (o ejecuta con --sync) la generación de miniaturas WebP de imágenes existentes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            choices=sorted(TARGETS),
+            help="Procesa solo imágenes de productos o de subproductos."
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help="Regenera también las imágenes que ya tienen miniaturas."
+        )
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help="Genera en este proceso en lugar de encolar tareas de Celery."
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help="Cantidad máxima de imágenes a procesar por tipo."
+        )
+
+    def handle(self, *args, **options):
+        targets = [options['only']] if options['only'] else sorted(TARGETS)
+        for label in targets:
+            model, task = TARGETS[label]
+            queryset = model.objects.order_by('pk').only('pk', 'key', 'mime_type')
+            if not options['force']:
+                queryset = queryset.filter(thumbnails={})
+
+            processed = 0
+            for image in queryset.iterator(chunk_size=500):
+                if options['limit'] is not None and processed >= options['limit']:
+                    break
+                if not is_thumbnailable(image.key, image.mime_type):
+                    continue
+                if options['sync']:
+                    task(image.pk, force=options['force'])
+                else:
+                    task.delay(image.pk, force=options['force'])
+                processed += 1
+
+            action = "procesadas" if options['sync'] else "encoladas"
+            self.stdout.write(self.style.SUCCESS(f"✅ {label}: {processed} imágenes {action}."))
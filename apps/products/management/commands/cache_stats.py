@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from apps.products.utils.cache_helpers_core import get_cache_stats, reset_cache_stats
+from apps.products.utils.cache_helpers_categories import CACHE_KEY_CATEGORY_LIST
+from apps.products.utils.cache_helpers_types import CACHE_KEY_TYPE_LIST
+from apps.products.utils.cache_helpers_products import (
+    PRODUCT_LIST_CACHE_PREFIX,
+    PRODUCT_DETAIL_CACHE_PREFIX,
+)
+from apps.products.utils.cache_helpers_subproducts import (
+    SUBPRODUCT_LIST_CACHE_PREFIX,
+    SUBPRODUCT_DETAIL_CACHE_PREFIX,
+)
+
+CACHED_VIEW_LABELS = [
+    CACHE_KEY_CATEGORY_LIST,
+    CACHE_KEY_TYPE_LIST,
+    PRODUCT_LIST_CACHE_PREFIX,
+    PRODUCT_DETAIL_CACHE_PREFIX,
+    SUBPRODUCT_LIST_CACHE_PREFIX,
+    SUBPRODUCT_DETAIL_CACHE_PREFIX,
+]
+
+
+class Command(BaseCommand):
+    """
+    Muestra los contadores de hit/miss de las vistas cacheadas.
+    """
+    help = "Muestra (o reinicia con --reset) los contadores de hit/miss de la caché de vistas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help="Pone a cero los contadores después de mostrarlos."
+        )
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats(CACHED_VIEW_LABELS)
+        self.stdout.write(f"{'namespace':<20} {'hits':>10} {'misses':>10} {'hit rate':>10}")
+        for label, row in stats.items():
+            rate = f"{row['hit_rate'] * 100:.1f}%" if row['hit_rate'] is not None else "-"
+            self.stdout.write(f"{label:<20} {row['hits']:>10} {row['misses']:>10} {rate:>10}")
+
+        if options['reset']:
+            reset_cache_stats(CACHED_VIEW_LABELS)
+            self.stdout.write(self.style.SUCCESS("✅ Contadores reiniciados."))
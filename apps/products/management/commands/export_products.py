@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.products.services.product_export_service import (
+    EXPORT_FORMATS,
+    ExportFormatError,
+    export_queryset,
+    export_to_bucket,
+    iter_export_rows,
+    write_export,
+)
+
+
+class Command(BaseCommand):
+    """
+    Exporta el catálogo activo con stock a un archivo local o al bucket de productos.
+    """
+    help = "Exporta productos activos con stock (csv, ndjson o xlsx) en memoria constante."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            dest='export_format',
+            choices=sorted(EXPORT_FORMATS),
+            default='csv',
+            help="Formato de salida."
+        )
+        parser.add_argument(
+            '--output',
+            help="Ruta del archivo a escribir."
+        )
+        parser.add_argument(
+            '--upload',
+            action='store_true',
+            help="Sube la exportación al bucket de productos en lugar de escribirla en disco."
+        )
+
+    def handle(self, *args, **options):
+        export_format = options['export_format']
+        if options['upload']:
+            try:
+                result = export_to_bucket(export_format)
+            except ExportFormatError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {result['rows']} productos exportados a {result['key']}\n{result['url']}"
+            ))
+            return
+
+        if not options['output']:
+            raise CommandError("Indique --output o --upload.")
+        try:
+            with open(options['output'], 'wb') as fh:
+                write_export(export_format, iter_export_rows(export_queryset()), fh)
+        except (OSError, ExportFormatError) as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"✅ Exportación escrita en {options['output']}"))
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.products.services.product_import_service import (
+    DEFAULT_IMPORT_CHUNK_SIZE,
+    ImportFileError,
+    import_products,
+    iter_import_rows,
+)
+
+
+class Command(BaseCommand):
+    """
+    Importa productos en lote desde un CSV/XLSX (mismo motor que el endpoint).
+    """
+    help = "Crea productos y su stock inicial desde un archivo .csv o .xlsx."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Ruta del archivo .csv o .xlsx.")
+        parser.add_argument(
+            '--user',
+            required=True,
+            help="Username que queda como creador de los productos."
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_IMPORT_CHUNK_SIZE,
+            help="Filas por lote (una transacción por lote)."
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Solo valida, sin crear productos."
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"El usuario '{options['user']}' no existe.")
+
+        try:
+            with open(options['path'], 'rb') as fh:
+                report = import_products(
+                    iter_import_rows(fh, options['path']),
+                    user,
+                    chunk_size=options['chunk_size'],
+                    dry_run=options['dry_run'],
+                )
+        except (OSError, ImportFileError) as e:
+            raise CommandError(str(e))
+
+        for error in report['errors']:
+            details = "; ".join(f"{field}: {msg}" for field, msg in error['errors'].items())
+            self.stderr.write(f"Fila {error['row']}: {details}")
+        action = "validadas" if options['dry_run'] else "creadas"
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {report['total_rows']} filas, {report['created']} {action}, {report['failed']} con errores."
+        ))
@@ -28,6 +28,10 @@ class BaseModel(models.Model):
 
     status = models.BooleanField(default=True, verbose_name="Activo")
 
+    # Columnas mantenidas con UPDATE atómicos (F()) fuera de save(): un save()
+    # completo de una instancia leída antes no debe pisarlas.
+    MATERIALIZED_FIELDS = ()
+
     class Meta:
         abstract = True
         ordering = ['-created_at']
@@ -53,6 +57,12 @@ class BaseModel(models.Model):
             if user:
                 self.modified_by = user
 
+        if not is_new and self.MATERIALIZED_FIELDS and not args and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.MATERIALIZED_FIELDS
+            ]
+
         # Llamar al método save original UNA VEZ para persistir todos los cambios
         super().save(*args, **kwargs)
 
@@ -30,11 +30,27 @@ class ProductImage(models.Model):
         null=True,
         verbose_name="Tipo MIME"
     )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        db_index=True,
+        verbose_name="SHA-256 del contenido"
+    )
+    thumbnails = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Miniaturas WebP ({lado: key})"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name = "Imagen de Producto"
         verbose_name_plural = "Imágenes de Productos"
+        indexes = [
+            # Conteo de referencias al objeto de S3 (archivos deduplicados)
+            models.Index(fields=["key"], name="productimage_key_idx"),
+        ]
 
     def __str__(self):
         return f"Imagen {self.id} de {self.product.name}"
@@ -74,11 +74,29 @@ class Product(BaseModel):
     )
     # -----------------------------------------
 
+    # --- Stock materializado ---
+    # Lo mantiene apps.stocks.services dentro de la misma transacción que el
+    # movimiento de stock: stock propio si has_subproducts=False, o la suma del
+    # stock de los subproductos activos si has_subproducts=True.
+    current_stock = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=0,
+        db_index=True,
+        verbose_name="Stock Actual"
+    )
+
+    MATERIALIZED_FIELDS = ('current_stock',)
+
     class Meta:
         verbose_name = "Producto"
         verbose_name_plural = "Productos"
         # <— Aquí forzamos el orden descendente por fecha de creación
         ordering = ['-created_at']
+        indexes = [
+            # Paginación por cursor (keyset) sobre (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='product_created_id_idx'),
+        ]
 
     def __str__(self):
         name_display = self.name or "Producto sin nombre"
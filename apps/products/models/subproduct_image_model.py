@@ -32,6 +32,18 @@ class SubproductImage(models.Model):
         null=True,
         verbose_name="Tipo MIME"
     )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        db_index=True,
+        verbose_name="SHA-256 del contenido"
+    )
+    thumbnails = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Miniaturas WebP ({lado: key})"
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Creado en"
@@ -40,6 +52,10 @@ class SubproductImage(models.Model):
     class Meta:
         verbose_name = "Imagen de Subproducto"
         verbose_name_plural = "Imágenes de Subproductos"
+        indexes = [
+            # Conteo de referencias al objeto de S3 (archivos deduplicados)
+            models.Index(fields=["key"], name="subproductimage_key_idx"),
+        ]
 
     def __str__(self):
         return f"Imagen {self.id} de Subproducto {self.subproduct.id}"
@@ -80,6 +80,15 @@ class Subproduct(BaseModel):
         verbose_name="Observaciones"
     )
 
+    # --- Stock materializado (mantenido por apps.stocks.services) ---
+    current_stock = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=0,
+        db_index=True,
+        verbose_name="Stock Actual"
+    )
+
     parent = models.ForeignKey(
         Product,
         on_delete=models.PROTECT,
@@ -89,10 +98,16 @@ class Subproduct(BaseModel):
         verbose_name="Producto Padre"
     )
 
+    MATERIALIZED_FIELDS = ('current_stock',)
+
     class Meta:
         verbose_name = "Subproducto"
         verbose_name_plural = "Subproductos"
         ordering = ['-created_at']
+        indexes = [
+            # Paginación por cursor dentro de un producto padre
+            models.Index(fields=['parent', '-created_at', '-id'], name='subproduct_parent_created_idx'),
+        ]
 
         # 🚫 Protección anti-duplicado por parent + number_coil cuando el subproducto está activo
         constraints = [
@@ -0,0 +1,79 @@
+"""
+Lectura en lote de productos y subproductos por ID.
+
+Reutiliza las entradas de caché de detalle (mismas claves y mismo formato
+que product_detail / subproduct_detail): un get_many para todos los ids y,
+para los faltantes, una única consulta pk__in con el plan de prefetch del
+detalle. Lo leído de la base vuelve a la caché con un set_many, así que el
+lote también calienta los detalles individuales.
+
+Las claves son las versionadas del detalle, con las versiones leídas al
+empezar: si una escritura invalida un producto mientras el lote lee la base,
+el set_many guarda bajo la versión vieja y no reaparece en lecturas nuevas.
+"""
+import logging
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.products.api.repositories.product_repository import ProductRepository
+from apps.products.api.repositories.subproduct_repository import SubproductRepository
+from apps.products.api.serializers.product_serializer import ProductSerializer
+from apps.products.api.serializers.subproduct_serializer import SubProductSerializer
+from apps.products.models import Product
+from apps.products.utils.cache_helpers_products import product_detail_cache_keys
+from apps.products.utils.cache_helpers_subproducts import subproduct_detail_cache_keys
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_enabled() -> bool:
+    # Mismo criterio que los decoradores de caché de las vistas de detalle
+    return not settings.DEBUG
+
+
+def _batch_read(ids: List[int], keys_func: Callable[[Iterable[int]], Dict[int, str]],
+                load_missing: Callable[[List[int]], Dict[int, dict]]) -> Tuple[Dict[int, dict], List[int]]:
+    """Devuelve ({id: datos serializados}, [ids no encontrados]) respetando el orden pedido."""
+    found = {}
+    keys = {}
+    if _cache_enabled():
+        keys = keys_func(ids)
+        cached = cache.get_many(list(keys.values()))
+        for pk, key in keys.items():
+            data = cached.get(key)
+            # El detalle de subproducto puede haber cacheado uno dado de baja
+            if data is not None and data.get("status", True):
+                found[pk] = data
+
+    missing = [pk for pk in ids if pk not in found]
+    if missing:
+        loaded = load_missing(missing)
+        found.update(loaded)
+        if loaded and keys:
+            cache.set_many({keys[pk]: data for pk, data in loaded.items()}, getattr(settings, "CACHE_TTL", None))
+        logger.debug("[Cache] lote: %s en caché, %s leídos de la base", len(ids) - len(missing), len(loaded))
+
+    results = {pk: found[pk] for pk in ids if pk in found}
+    return results, [pk for pk in ids if pk not in found]
+
+
+def get_products_batch(ids: List[int], context: dict = None):
+    """Productos activos por ID, con el mismo formato que product_detail."""
+    def load(missing):
+        queryset = ProductRepository.get_all_active_products_detailed().filter(pk__in=missing)
+        return {item["id"]: item for item in ProductSerializer(queryset, many=True, context=context or {}).data}
+
+    return _batch_read(ids, product_detail_cache_keys, load)
+
+
+def get_subproducts_batch(parent: Product, ids: List[int], context: dict = None):
+    """Subproductos activos de `parent` por ID, con el mismo formato que subproduct_detail."""
+    context = {**(context or {}), "parent_product": parent}
+
+    def load(missing):
+        queryset = SubproductRepository.get_all_active(parent.pk).filter(pk__in=missing)
+        return {item["id"]: item for item in SubProductSerializer(queryset, many=True, context=context).data}
+
+    return _batch_read(ids, lambda pks: subproduct_detail_cache_keys(parent.pk, pks), load)
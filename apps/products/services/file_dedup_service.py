@@ -0,0 +1,184 @@
+"""
+Deduplicación por contenido de archivos de productos y subproductos.
+
+Cada archivo subido se identifica por su SHA-256. Si ya existe una fila
+(ProductImage o SubproductImage) con el mismo hash, la nueva fila reutiliza la
+key de S3 de esa fila en lugar de volver a subir los bytes. El objeto del
+bucket queda compartido: se borra solo cuando no quedan filas con esa key
+(conteo de referencias sobre el índice de `key`).
+
+Reutilizar una key y liberar la última referencia se serializan bloqueando
+las filas de esa key (select_for_update): el registro de una fila que
+reutiliza la key y el borrado de la última fila no pueden cruzarse, así que
+nunca queda una fila apuntando a un objeto borrado del bucket.
+"""
+import logging
+from mimetypes import guess_type
+from typing import Callable, Iterable, List, Tuple
+
+from django.db import transaction
+
+from apps.products.models import ProductImage, SubproductImage
+from apps.storages_client.services.batch_upload import upload_files_concurrently
+from apps.storages_client.services.content_hash import compute_sha256
+from apps.storages_client.services.thumbnails import delete_thumbnails
+
+logger = logging.getLogger(__name__)
+
+FILE_MODELS = (ProductImage, SubproductImage)
+
+
+def find_files_by_hash(content_hashes: Iterable[str]) -> dict:
+    """
+    Busca filas existentes por hash de contenido.
+    Devuelve {hash: {"key", "mime_type", "thumbnails"}} (una fila por hash).
+    """
+    hashes = {h for h in content_hashes if h}
+    if not hashes:
+        return {}
+    found = {}
+    for model in FILE_MODELS:
+        pending = hashes - found.keys()
+        if not pending:
+            break
+        rows = (
+            model.objects.filter(content_hash__in=pending)
+            .values("content_hash", "key", "mime_type", "thumbnails")
+            .order_by("pk")
+        )
+        for row in rows:
+            found.setdefault(row.pop("content_hash"), row)
+    return found
+
+
+def count_key_references(key: str) -> int:
+    """Cantidad de filas (productos + subproductos) que apuntan a `key`."""
+    return sum(model.objects.filter(key=key).count() for model in FILE_MODELS)
+
+
+def unreferenced_keys(keys: Iterable[str]) -> set:
+    """Subconjunto de `keys` sin ninguna fila que las referencie (una consulta por tabla)."""
+    keys = set(keys)
+    for model in FILE_MODELS:
+        if not keys:
+            break
+        keys -= set(model.objects.filter(key__in=keys).values_list("key", flat=True))
+    return keys
+
+
+def lock_key_rows(keys: Iterable[str]) -> set:
+    """
+    Bloquea (select_for_update) las filas que referencian `keys`, siempre en el
+    mismo orden de tablas, y devuelve las keys que tienen al menos una fila.
+    Debe llamarse dentro de transaction.atomic.
+    """
+    keys = set(keys)
+    alive = set()
+    for model in FILE_MODELS:
+        if keys:
+            alive.update(model.objects.select_for_update().filter(key__in=keys).values_list("key", flat=True))
+    return alive
+
+
+def register_deduplicated(uploaded: List[dict], create_func: Callable[[List[dict]], object]) -> Tuple[List[dict], List[dict]]:
+    """
+    Registra con `create_func(resultados)` lo devuelto por upload_deduplicated.
+    Las keys reutilizadas de filas existentes se bloquean antes del INSERT: si
+    entretanto se borró su última fila (y con ella, el objeto), ese archivo no
+    se registra. Devuelve (registrados, errores).
+    """
+    fresh_keys = {res["key"] for res in uploaded if not res.get("reused")}
+    shared_keys = {res["key"] for res in uploaded if res.get("reused")} - fresh_keys
+    with transaction.atomic():
+        alive = lock_key_rows(shared_keys) if shared_keys else set()
+        registered = [res for res in uploaded if res["key"] not in shared_keys or res["key"] in alive]
+        if registered:
+            create_func(registered)
+    errors = [
+        {res["name"]: "El archivo original fue eliminado durante la subida; vuelva a subirlo."}
+        for res in uploaded if res["key"] in shared_keys - alive
+    ]
+    return registered, errors
+
+
+def delete_file_row(key: str, delete_row: Callable[[], object], delete_func: Callable[[str], bool]):
+    """
+    Borra la fila de un archivo con `delete_row()` (devuelve la fila o None) y,
+    si era la última referencia a `key`, el objeto (con `delete_func`) y sus
+    miniaturas. Las filas de `key` quedan bloqueadas hasta confirmar el borrado.
+    """
+    with transaction.atomic():
+        lock_key_rows([key])
+        row = delete_row()
+        referenced = count_key_references(key)
+    if referenced:
+        logger.info(f"♻️ {key} sigue referenciado: se conserva el objeto en el bucket")
+        return row
+    delete_func(key)
+    delete_thumbnails(row.thumbnails if row else None)
+    return row
+
+
+def upload_deduplicated(files, upload_func: Callable, url_func: Callable[[str], str],
+                        validate_func: Callable[[str], None]) -> Tuple[List[dict], List[dict]]:
+    """
+    Etapa de subida con deduplicación, mismo contrato que upload_files_concurrently.
+    - Hashea cada archivo (lectura por bloques) y resuelve en una consulta los
+      que ya existen: se reutiliza su key (y sus miniaturas) sin subir nada.
+    - Archivos repetidos dentro del mismo request se suben una sola vez.
+    - El resto se sube en paralelo con `upload_func(file, content_hash=...)`.
+    Los resultados reutilizados llevan "reused": True; el llamador los registra
+    con register_deduplicated y no debe borrar esos objetos si falla el registro.
+    """
+    uploaded, errors = [], []
+    hashes = {}
+    for f in files:
+        try:
+            validate_func(f.name)
+        except Exception as e:
+            errors.append({f.name: str(e)})
+            continue
+        hashes[f] = compute_sha256(f)
+
+    existing = find_files_by_hash(hashes.values())
+    to_upload, repeated, first_by_hash = [], [], {}
+    for f, content_hash in hashes.items():
+        source = existing.get(content_hash)
+        if source is not None:
+            uploaded.append(_reused_result(f, content_hash, source["key"], url_func(source["key"]),
+                                           source["thumbnails"]))
+        elif content_hash in first_by_hash:
+            repeated.append(f)
+        else:
+            first_by_hash[content_hash] = f
+            to_upload.append(f)
+
+    fresh, upload_errors = upload_files_concurrently(
+        to_upload,
+        lambda f: {**upload_func(f, content_hash=hashes[f]), "contentHash": hashes[f]},
+    )
+    errors.extend(upload_errors)
+    by_hash = {res["contentHash"]: res for res in fresh}
+    for f in repeated:
+        source = by_hash.get(hashes[f])
+        if source is None:
+            errors.append({f.name: "No se pudo subir el archivo original del lote."})
+            continue
+        uploaded.append(_reused_result(f, hashes[f], source["key"], source["url"], {}))
+
+    if len(fresh) < len(hashes):
+        logger.info(f"♻️ {len(hashes) - len(fresh)} archivos deduplicados por contenido")
+    return fresh + uploaded, errors
+
+
+def _reused_result(file, content_hash: str, key: str, url: str, thumbnails: dict) -> dict:
+    mime_type, _ = guess_type(file.name)
+    return {
+        "key": key,
+        "url": url,
+        "name": file.name,
+        "mimeType": mime_type or "application/octet-stream",
+        "contentHash": content_hash,
+        "thumbnails": thumbnails or {},
+        "reused": True,
+    }
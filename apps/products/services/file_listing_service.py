@@ -0,0 +1,158 @@
+"""
+Listados de archivos de productos y subproductos, en lote y cacheados.
+
+Se cachea por producto/subproducto la parte estable del listado (key, nombre,
+tipo, miniaturas) y no las URLs: esas se firman al responder, en una sola
+pasada por la caché de URLs presignadas para todos los ids pedidos.
+Las claves se invalidan junto con el resto de la caché del producto o
+subproducto (subida, borrado, miniaturas, baja).
+
+Costo por request: un get_many a la caché; ante faltantes, una consulta de
+existencia y una de archivos para todos los ids que faltan.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.products.models import Product, ProductImage, Subproduct, SubproductImage
+from apps.products.utils.cache_helpers_products import product_files_cache_key
+from apps.products.utils.cache_helpers_subproducts import subproduct_files_cache_key
+from apps.storages_client.services.products_files import get_product_file_urls
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FILE_LISTING_CACHE_TTL = 3600
+MAX_BATCH_IDS = 100
+
+FILE_FIELDS = ("id", "key", "name", "mime_type", "thumbnails", "created_at")
+
+
+def parse_ids(raw: str) -> List[int]:
+    """
+    Convierte '1,2,3' en [1, 2, 3] (sin repetidos, en orden).
+    Lanza ValueError si hay valores no numéricos o más de MAX_BATCH_IDS.
+    """
+    ids = []
+    for part in (raw or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit():
+            raise ValueError(f"Id inválido: '{part}'.")
+        ids.append(int(part))
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise ValueError("Se requiere el parámetro 'ids' (ej.: ?ids=1,2,3).")
+    if len(ids) > MAX_BATCH_IDS:
+        raise ValueError(f"Máximo {MAX_BATCH_IDS} ids por consulta.")
+    return ids
+
+
+def _cache_ttl() -> int:
+    return getattr(settings, "FILE_LISTING_CACHE_TTL", DEFAULT_FILE_LISTING_CACHE_TTL)
+
+
+def _cached_listings(ids, key_func, load_missing) -> Dict[int, List[dict]]:
+    keys = {owner_id: key_func(owner_id) for owner_id in ids}
+    cached = cache.get_many(list(keys.values()))
+    listings = {owner_id: cached[key] for owner_id, key in keys.items() if key in cached}
+
+    missing = [owner_id for owner_id in ids if owner_id not in listings]
+    if missing:
+        loaded = load_missing(missing)
+        cache.set_many({keys[owner_id]: rows for owner_id, rows in loaded.items()}, _cache_ttl())
+        listings.update(loaded)
+        logger.debug("[Cache] listados de archivos cargados: %s", sorted(loaded))
+    # Solo los ids existentes (y activos) tienen listado
+    return {owner_id: listings[owner_id] for owner_id in ids if owner_id in listings}
+
+
+def _group_rows(queryset, owner_field: str, owner_ids) -> Dict[int, List[dict]]:
+    grouped = defaultdict(list)
+    for row in queryset.values(owner_field, *FILE_FIELDS).order_by(owner_field, "created_at", "id"):
+        grouped[row.pop(owner_field)].append(row)
+    return {owner_id: grouped.get(owner_id, []) for owner_id in owner_ids}
+
+
+def get_product_file_rows(product_ids: Iterable[int]) -> Dict[int, List[dict]]:
+    """{product_id: [filas]} de los productos activos entre `product_ids`."""
+    def load(missing):
+        existing = list(Product.objects.filter(pk__in=missing, status=True).values_list("pk", flat=True))
+        if not existing:
+            return {}
+        return _group_rows(ProductImage.objects.filter(product_id__in=existing), "product_id", existing)
+
+    return _cached_listings(list(product_ids), product_files_cache_key, load)
+
+
+def get_subproduct_file_rows(subproduct_ids: Iterable[int], parent_id: int) -> Dict[int, List[dict]]:
+    """{subproduct_id: [filas]} de los subproductos activos de `parent_id`."""
+    def load(missing):
+        existing = list(
+            Subproduct.objects.filter(pk__in=missing, parent_id=parent_id, status=True)
+            .values_list("pk", flat=True)
+        )
+        if not existing:
+            return {}
+        return _group_rows(SubproductImage.objects.filter(subproduct_id__in=existing), "subproduct_id", existing)
+
+    return _cached_listings(
+        list(subproduct_ids), lambda subp_id: subproduct_files_cache_key(parent_id, subp_id), load
+    )
+
+
+def _sign(listings: Dict[int, List[dict]]) -> dict:
+    """Firma en lote las keys (originales + miniaturas) de todos los listados."""
+    keys = []
+    for rows in listings.values():
+        for row in rows:
+            keys.append(row["key"])
+            keys.extend((row["thumbnails"] or {}).values())
+    return get_product_file_urls(keys) if keys else {}
+
+
+def _thumbnail_urls(row: dict, urls: dict) -> dict:
+    return {size: urls.get(key) for size, key in (row["thumbnails"] or {}).items()}
+
+
+def sign_product_listings(listings: Dict[int, List[dict]]) -> Dict[int, List[dict]]:
+    """Mismo formato que ProductFileRepository.get_all_by_product."""
+    urls = _sign(listings)
+    return {
+        product_id: [
+            {
+                "key": row["key"],
+                "name": row["name"],
+                "mimeType": row["mime_type"],
+                "url": urls.get(row["key"]),
+                "thumbnails": _thumbnail_urls(row, urls),
+            }
+            for row in rows
+        ]
+        for product_id, rows in listings.items()
+    }
+
+
+def sign_subproduct_listings(listings: Dict[int, List[dict]]) -> Dict[int, List[dict]]:
+    """Mismo formato que SubproductImageSerializer, con URL firmada vigente."""
+    urls = _sign(listings)
+    return {
+        subproduct_id: [
+            {
+                "id": row["id"],
+                "key": row["key"],
+                "url": urls.get(row["key"]),
+                "name": row["name"],
+                "mime_type": row["mime_type"],
+                "created_at": row["created_at"],
+                "filename": row["name"] or row["key"],
+                "content_type": row["mime_type"] or "application/octet-stream",
+                "thumbnails": _thumbnail_urls(row, urls),
+            }
+            for row in rows
+        ]
+        for subproduct_id, rows in listings.items()
+    }
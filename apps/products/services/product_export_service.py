@@ -0,0 +1,224 @@
+"""
+Exportación del catálogo activo con stock (CSV, NDJSON o XLSX) en memoria constante.
+
+Las filas se leen con values_list().iterator(chunk_size): sin instanciar
+modelos ni cachear el queryset, así que la memoria no depende de la cantidad
+de productos. CSV y NDJSON se generan en bloques para StreamingHttpResponse;
+XLSX usa el modo write-only de openpyxl sobre un archivo temporal.
+
+Para exportaciones grandes, export_to_bucket() escribe el archivo en el
+bucket de productos (lo usa la tarea de Celery) y devuelve su key; la URL
+presignada se genera al consultar el estado (export_download_url), así nunca
+se entrega una URL vencida. Solo se consultan tareas registradas como
+exportaciones (register_export_task).
+"""
+import csv
+import io
+import json
+import logging
+import tempfile
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.core.streaming import NDJSON_CONTENT_TYPE
+from apps.products.api.repositories.product_repository import ProductRepository
+from apps.products.filters.product_filter import ProductFilter
+from apps.storages_client.clients.minio_client import get_minio_client
+from apps.storages_client.services.presigned_cache import get_presigned_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPORT_CHUNK_SIZE = 2000
+EXPORT_KEY_PREFIX = "exports/products/"
+EXPORT_TASK_CACHE_PREFIX = "product_export_task"
+DEFAULT_EXPORT_TASK_TTL = 24 * 3600
+
+# (encabezado, lookup) en el orden de las columnas
+EXPORT_COLUMNS = (
+    ("id", "id"),
+    ("code", "code"),
+    ("name", "name"),
+    ("description", "description"),
+    ("brand", "brand"),
+    ("location", "location"),
+    ("position", "position"),
+    ("category", "category__name"),
+    ("type", "type__name"),
+    ("has_subproducts", "has_subproducts"),
+    ("current_stock", "current_stock"),
+    ("created_at", "created_at"),
+)
+EXPORT_HEADERS = tuple(header for header, _ in EXPORT_COLUMNS)
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": NDJSON_CONTENT_TYPE,
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+class ExportFormatError(ValueError):
+    """Formato desconocido o sin la dependencia necesaria."""
+
+
+def check_format(export_format: str) -> str:
+    export_format = (export_format or "csv").lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ExportFormatError(f"Formato no soportado. Opciones: {', '.join(EXPORT_FORMATS)}.")
+    return export_format
+
+
+def export_queryset(params=None):
+    """
+    Productos activos (ProductRepository) con los filtros de product_list,
+    ordenados por id. Lanza ValueError si los filtros son inválidos.
+    """
+    queryset = ProductRepository.get_all_active_products()
+    if params:
+        product_filter = ProductFilter(params, queryset=queryset)
+        if not product_filter.is_valid():
+            raise ValueError(product_filter.errors)
+        queryset = product_filter.qs
+    return queryset.order_by("pk")
+
+
+def iter_export_rows(queryset, chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE) -> Iterator[tuple]:
+    """Tuplas planas en el orden de EXPORT_COLUMNS, leídas por lotes del cursor."""
+    lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+    return queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+def _plain(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _batched(lines: Iterable[str], batch_size: int = 500) -> Iterator[str]:
+    """Agrupa líneas para no emitir un chunk HTTP por fila."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def iter_csv(rows: Iterable[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values):
+        writer.writerow(["" if v is None else _plain(v) for v in values])
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return text
+
+    # BOM para que Excel detecte UTF-8
+    yield "\ufeff" + line(EXPORT_HEADERS)
+    yield from _batched(line(row) for row in rows)
+
+
+def iter_ndjson(rows: Iterable[tuple]) -> Iterator[str]:
+    yield from _batched(
+        json.dumps({h: _plain(v) for h, v in zip(EXPORT_HEADERS, row)}, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def write_xlsx(rows: Iterable[tuple], fileobj) -> None:
+    """Escribe el XLSX en `fileobj` con el modo write-only (memoria constante)."""
+    try:
+        from openpyxl import Workbook
+    except ImportError:  # dependencia opcional
+        raise ExportFormatError("La exportación a XLSX requiere el paquete 'openpyxl'.")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Productos")
+    sheet.append(EXPORT_HEADERS)
+    for row in rows:
+        # XLSX admite Decimal y datetime sin zona horaria
+        sheet.append([
+            timezone.localtime(v).replace(tzinfo=None) if isinstance(v, datetime) and timezone.is_aware(v) else v
+            for v in row
+        ])
+    workbook.save(fileobj)
+
+
+def write_export(export_format: str, rows: Iterable[tuple], fileobj) -> None:
+    """Vuelca la exportación completa en un archivo binario."""
+    if export_format == "xlsx":
+        write_xlsx(rows, fileobj)
+        return
+    chunks = iter_csv(rows) if export_format == "csv" else iter_ndjson(rows)
+    for chunk in chunks:
+        fileobj.write(chunk.encode("utf-8"))
+
+
+def export_filename(export_format: str) -> str:
+    return f"productos_{timezone.localtime():%Y%m%d_%H%M%S}.{export_format}"
+
+
+def export_to_bucket(export_format: str, params=None) -> dict:
+    """
+    Genera la exportación en un temporal y la sube al bucket de productos.
+    Devuelve {'key', 'rows'} (serializable como resultado de Celery).
+    """
+    export_format = check_format(export_format)
+    queryset = export_queryset(params)
+    counter = {"rows": 0}
+
+    def counted(rows):
+        for row in rows:
+            counter["rows"] += 1
+            yield row
+
+    filename = export_filename(export_format)
+    key = f"{EXPORT_KEY_PREFIX}{uuid.uuid4().hex}/{filename}"
+    bucket = settings.AWS_PRODUCT_BUCKET_NAME
+    with tempfile.TemporaryFile() as tmp:
+        write_export(export_format, counted(iter_export_rows(queryset)), tmp)
+        tmp.seek(0)
+        get_minio_client().upload_fileobj(
+            Fileobj=tmp,
+            Bucket=bucket,
+            Key=key,
+            ExtraArgs={
+                "ContentType": EXPORT_FORMATS[export_format],
+                "ContentDisposition": f'attachment; filename="{filename}"',
+            },
+        )
+    logger.info("📤 Exportación de productos subida a %s (%s filas)", key, counter["rows"])
+    return {"key": key, "rows": counter["rows"]}
+
+
+def export_download_url(key: str) -> str:
+    """URL presignada vigente del archivo exportado `key`."""
+    return get_presigned_url(bucket=settings.AWS_PRODUCT_BUCKET_NAME, object_name=key)
+
+
+def _export_task_key(task_id: str) -> str:
+    return f"{EXPORT_TASK_CACHE_PREFIX}:{task_id}"
+
+
+def register_export_task(task_id: str, user_id: int) -> None:
+    """Registra `task_id` como exportación de `user_id` (vive lo que el resultado de Celery)."""
+    ttl = getattr(settings, "CELERY_RESULT_EXPIRES", None) or DEFAULT_EXPORT_TASK_TTL
+    cache.set(_export_task_key(task_id), user_id, ttl)
+
+
+def export_task_owner(task_id: str):
+    """Id del usuario que encoló la exportación `task_id`, o None si no es una exportación registrada."""
+    return cache.get(_export_task_key(task_id))
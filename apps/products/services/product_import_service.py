@@ -0,0 +1,314 @@
+"""
+Importación masiva de productos desde CSV o XLSX.
+
+Las filas se leen de a una (el archivo nunca se carga completo) y se procesan
+por lotes de `chunk_size`:
+- categoría y tipo se resuelven contra mapas en memoria cargados una vez;
+- la unicidad de código y nombre se verifica con una consulta por lote
+  (más los repetidos dentro del mismo archivo);
+- productos, ProductStock y StockEvent iniciales se insertan con bulk_create
+  dentro de una transacción por lote.
+
+bulk_create no dispara post_save: la caché de listados se invalida una sola
+vez al final. Los productos nuevos no tienen detalle cacheado todavía.
+
+Columnas: name, code, description, brand, location, position, category,
+type (ID o nombre), initial_stock_quantity, initial_stock_reason.
+"""
+import csv
+import io
+import logging
+import os
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Iterator, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from apps.products.models import Category, Product, Type
+from apps.products.utils.cache_helpers_core import bump_namespace_version
+from apps.products.utils.cache_helpers_products import PRODUCT_LIST_CACHE_PREFIX
+from apps.stocks.models import ProductStock, StockEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMPORT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+DEFAULT_STOCK_REASON = "Stock inicial por importación"
+
+TEXT_FIELDS = {
+    "name": Product._meta.get_field("name").max_length,
+    "code": Product._meta.get_field("code").max_length,
+    "brand": Product._meta.get_field("brand").max_length,
+    "location": Product._meta.get_field("location").max_length,
+    "position": Product._meta.get_field("position").max_length,
+}
+# max_digits / decimal_places de la columna: se validan por fila antes del INSERT
+QUANTITY_FIELD = ProductStock._meta.get_field("quantity")
+COLUMNS = (
+    "name", "code", "description", "brand", "location", "position",
+    "category", "type", "initial_stock_quantity", "initial_stock_reason",
+)
+
+
+class ImportFileError(ValueError):
+    """El archivo no se puede leer (formato, encabezados, dependencia faltante)."""
+
+
+# ────────────────────────── LECTURA ──────────────────────────
+
+def _clean(value) -> str:
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _check_header(header) -> list:
+    header = [_clean(col).lower() for col in header]
+    if "category" not in header:
+        raise ImportFileError("El archivo debe incluir la columna 'category'.")
+    unknown = sorted(set(header) - set(COLUMNS) - {""})
+    if unknown:
+        raise ImportFileError(f"Columnas desconocidas: {', '.join(unknown)}.")
+    return header
+
+
+def _iter_csv(fileobj) -> Iterator[Tuple[int, dict]]:
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        sample = text.read(4096)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(text, dialect)
+        header = _check_header(next(reader, []))
+        for row_number, values in enumerate(reader, start=2):
+            if any(_clean(v) for v in values):
+                yield row_number, dict(zip(header, (_clean(v) for v in values)))
+    except UnicodeDecodeError:
+        raise ImportFileError("El CSV debe estar codificado en UTF-8.")
+    finally:
+        text.detach()
+
+
+def _iter_xlsx(fileobj) -> Iterator[Tuple[int, dict]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:  # dependencia opcional
+        raise ImportFileError("La importación de XLSX requiere el paquete 'openpyxl'.")
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except Exception as exc:
+        raise ImportFileError(f"No se pudo leer el XLSX: {exc}")
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = _check_header(next(rows, ()))
+        for row_number, values in enumerate(rows, start=2):
+            if any(_clean(v) for v in values):
+                yield row_number, dict(zip(header, (_clean(v) for v in values)))
+    finally:
+        workbook.close()
+
+
+def iter_import_rows(fileobj, filename: str) -> Iterator[Tuple[int, dict]]:
+    """Genera (número de fila, {columna: valor}) según la extensión del archivo."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".csv":
+        return _iter_csv(fileobj)
+    if extension == ".xlsx":
+        return _iter_xlsx(fileobj)
+    raise ImportFileError("Formato no soportado. Use un archivo .csv o .xlsx.")
+
+
+# ────────────────────────── VALIDACIÓN ──────────────────────────
+
+def _normalize_name(name: str) -> str:
+    # Mismo criterio que BaseSerializer._get_normalized_name
+    return name.strip().lower().replace(" ", "")
+
+
+def _load_lookup(model) -> dict:
+    """{'<id>': obj, '<nombre en minúsculas>': obj} de las filas activas."""
+    lookup = {}
+    for obj in model.objects.filter(status=True):
+        lookup[str(obj.pk)] = obj
+        lookup[obj.name.strip().lower()] = obj
+    return lookup
+
+
+def _validate_row(row: dict, categories: dict, types: dict):
+    """Devuelve (datos limpios, errores por campo)."""
+    errors = {}
+    data = {}
+    for field, max_length in TEXT_FIELDS.items():
+        value = row.get(field) or None
+        if value and len(value) > max_length:
+            errors[field] = f"Máximo {max_length} caracteres."
+        data[field] = value
+    data["description"] = row.get("description") or None
+
+    category = categories.get((row.get("category") or "").lower())
+    if category is None:
+        errors["category"] = f"La categoría '{row.get('category', '')}' no existe."
+    data["category"] = category
+
+    data["type"] = None
+    if row.get("type"):
+        type_obj = types.get(row["type"].lower())
+        if type_obj is None:
+            errors["type"] = f"El tipo '{row['type']}' no existe."
+        elif category is not None and type_obj.category_id != category.pk:
+            errors["type"] = f"El tipo '{row['type']}' no pertenece a la categoría."
+        data["type"] = type_obj
+
+    raw_quantity = (row.get("initial_stock_quantity") or "0").replace(",", ".")
+    try:
+        quantity = Decimal(raw_quantity)
+        QUANTITY_FIELD.run_validators(quantity)
+        if quantity < 0:
+            errors["initial_stock_quantity"] = "La cantidad inicial no puede ser negativa."
+    except InvalidOperation:
+        quantity = None
+        errors["initial_stock_quantity"] = f"Valor inválido ('{raw_quantity}') para cantidad inicial."
+    except ValidationError as exc:
+        quantity = None
+        errors["initial_stock_quantity"] = " ".join(exc.messages)
+    data["initial_stock_quantity"] = quantity
+    data["initial_stock_reason"] = row.get("initial_stock_reason") or DEFAULT_STOCK_REASON
+    return data, errors
+
+
+def _existing_conflicts(candidates) -> Tuple[set, set]:
+    """Códigos y nombres normalizados del lote que ya existen (una consulta cada uno)."""
+    codes = {data["code"] for _, data in candidates if data["code"]}
+    names = {_normalize_name(data["name"]) for _, data in candidates if data["name"]}
+    # code es UNIQUE en la tabla: también choca con productos dados de baja
+    taken_codes = set(
+        Product.objects.filter(code__in=codes).values_list("code", flat=True)
+    ) if codes else set()
+    taken_names = set(
+        Product.objects.annotate(lname=Lower("name"))
+        .filter(lname__in=names).values_list("lname", flat=True)
+    ) if names else set()
+    return taken_codes, taken_names
+
+
+# ────────────────────────── ESCRITURA ──────────────────────────
+
+def _insert_chunk(valid, user) -> int:
+    """Inserta productos, stock y eventos iniciales del lote en una transacción."""
+    with transaction.atomic():
+        products = Product.objects.bulk_create([
+            Product(
+                name=data["name"],
+                code=data["code"],
+                description=data["description"],
+                brand=data["brand"],
+                location=data["location"],
+                position=data["position"],
+                category=data["category"],
+                type=data["type"],
+                has_subproducts=False,
+                # Stock propio: current_stock refleja ProductStock.quantity
+                current_stock=data["initial_stock_quantity"],
+                created_by=user,
+            )
+            for _, data in valid
+        ])
+        stocks = ProductStock.objects.bulk_create([
+            ProductStock(product=product, quantity=product.current_stock, created_by=user)
+            for product in products
+        ])
+        StockEvent.objects.bulk_create([
+            StockEvent(
+                product_stock=stock,
+                quantity_change=stock.quantity,
+                event_type="ingreso_inicial",
+                created_by=user,
+                notes=data["initial_stock_reason"],
+            )
+            for stock, (_, data) in zip(stocks, valid)
+            if stock.quantity > 0
+        ])
+    return len(products)
+
+
+def import_products(rows: Iterable[Tuple[int, dict]], user,
+                    chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE,
+                    dry_run: bool = False) -> dict:
+    """
+    Importa las filas de iter_import_rows(). Las filas inválidas se reportan y
+    no frenan al resto. Con dry_run solo valida.
+    Devuelve {'total_rows', 'created', 'failed', 'errors': [{'row', 'errors'}]}.
+    """
+    categories = _load_lookup(Category)
+    types = _load_lookup(Type)
+    seen_codes, seen_names = set(), set()
+    report = {"total_rows": 0, "created": 0, "failed": 0, "errors": [], "dry_run": dry_run}
+
+    def fail(row_number, errors):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": row_number, "errors": errors})
+
+    def process(chunk):
+        candidates = []
+        for row_number, row in chunk:
+            data, errors = _validate_row(row, categories, types)
+            if errors:
+                fail(row_number, errors)
+            else:
+                candidates.append((row_number, data))
+
+        taken_codes, taken_names = _existing_conflicts(candidates)
+        valid = []
+        for row_number, data in candidates:
+            errors = {}
+            code = data["code"]
+            name = _normalize_name(data["name"]) if data["name"] else None
+            if code and (code in taken_codes or code in seen_codes):
+                errors["code"] = f"El código '{code}' ya existe."
+            if name and (name in taken_names or name in seen_names):
+                errors["name"] = f"El nombre '{data['name']}' ya existe."
+            if errors:
+                fail(row_number, errors)
+                continue
+            if code:
+                seen_codes.add(code)
+            if name:
+                seen_names.add(name)
+            valid.append((row_number, data))
+
+        if not valid:
+            return
+        if dry_run:
+            report["created"] += len(valid)
+            return
+        try:
+            report["created"] += _insert_chunk(valid, user)
+        except IntegrityError as exc:
+            # Carrera con una escritura concurrente: el lote entero se revierte
+            logger.warning("⚠️ Importación: lote revertido por conflicto: %s", exc)
+            for row_number, _ in valid:
+                fail(row_number, {"non_field_errors": "Conflicto de unicidad al guardar; reintente la fila."})
+
+    chunk = []
+    for row_number, row in rows:
+        report["total_rows"] += 1
+        chunk.append((row_number, row))
+        if len(chunk) >= chunk_size:
+            process(chunk)
+            chunk = []
+    if chunk:
+        process(chunk)
+
+    if report["created"] and not dry_run:
+        bump_namespace_version(PRODUCT_LIST_CACHE_PREFIX)
+    logger.info(
+        "📦 Importación de productos: %s filas, %s creadas, %s con errores%s",
+        report["total_rows"], report["created"], report["failed"], " (dry run)" if dry_run else "",
+    )
+    return report
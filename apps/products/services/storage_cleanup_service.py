@@ -0,0 +1,113 @@
+"""
+Limpieza de archivos de productos en el bucket.
+
+- purge_expired_deleted_files: la baja de un producto o subproducto es
+  reversible y conserva sus archivos; pasado el período de retención se
+  eliminan sus filas de archivos y, en lotes (DeleteObjects), los objetos que
+  quedaron sin referencias y sus miniaturas.
+- find_orphan_objects: recorre `products/` con el paginador de S3 y compara
+  contra el conjunto de keys registradas (originales + miniaturas).
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.products.models import ProductImage, SubproductImage
+from apps.products.services.file_dedup_service import FILE_MODELS, lock_key_rows, unreferenced_keys
+from apps.storages_client.services.batch_delete import delete_objects_batched, iter_objects
+
+logger = logging.getLogger(__name__)
+
+ORPHAN_SCAN_PREFIX = "products/"
+DEFAULT_ORPHAN_GRACE_HOURS = 24
+DEFAULT_DELETED_FILES_RETENTION_DAYS = 30
+
+
+def _purge_images(queryset) -> dict:
+    images = list(queryset.values_list("pk", "key", "thumbnails"))
+    if not images:
+        return {"rows": 0, "deleted": 0, "errors": 0}
+
+    with transaction.atomic():
+        # Mismo bloqueo que el registro de keys reutilizadas (ver file_dedup_service)
+        lock_key_rows({key for _, key, _ in images})
+        queryset.model.objects.filter(pk__in=[pk for pk, _, _ in images]).delete()
+        # Solo se borran del bucket las keys que no comparten otras filas (deduplicación)
+        released = unreferenced_keys(key for _, key, _ in images)
+
+    keys = []
+    for _, key, thumbnails in images:
+        if key in released:
+            keys.append(key)
+            keys.extend((thumbnails or {}).values())
+    result = delete_objects_batched(settings.AWS_PRODUCT_BUCKET_NAME, keys) if keys else {
+        "deleted": 0, "errors": []
+    }
+    return {"rows": len(images), "deleted": result["deleted"], "errors": len(result["errors"])}
+
+
+def purge_expired_deleted_files(retention_days: int = None) -> dict:
+    """
+    Elimina los archivos de productos y subproductos dados de baja hace más de
+    `retention_days` (incluye los subproductos de un producto dado de baja).
+    Las keys compartidas con otras filas (deduplicación) se conservan.
+    """
+    if retention_days is None:
+        retention_days = getattr(
+            settings, "STORAGE_DELETED_FILES_RETENTION_DAYS", DEFAULT_DELETED_FILES_RETENTION_DAYS
+        )
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    products = _purge_images(
+        ProductImage.objects.filter(product__status=False, product__deleted_at__lt=cutoff)
+    )
+    subproducts = _purge_images(SubproductImage.objects.filter(
+        Q(subproduct__status=False, subproduct__deleted_at__lt=cutoff)
+        | Q(subproduct__parent__status=False, subproduct__parent__deleted_at__lt=cutoff)
+    ))
+    summary = {k: products[k] + subproducts[k] for k in products}
+    logger.info(f"🧹 Archivos de bajas con más de {retention_days} días eliminados: {summary}")
+    return summary
+
+
+def referenced_keys() -> set:
+    """Todas las keys registradas en la base: originales y miniaturas."""
+    keys = set()
+    for model in FILE_MODELS:
+        for key, thumbnails in model.objects.values_list("key", "thumbnails").iterator(chunk_size=2000):
+            keys.add(key)
+            keys.update((thumbnails or {}).values())
+    return keys
+
+
+def find_orphan_objects(prefix: str = ORPHAN_SCAN_PREFIX, grace_hours: int = None) -> list:
+    """
+    Keys del bucket bajo `prefix` sin fila que las referencie.
+    Ignora objetos más nuevos que `grace_hours`: una subida directa (presigned
+    POST) existe en el bucket antes de que su sesión se finalice.
+    """
+    if grace_hours is None:
+        grace_hours = getattr(settings, "STORAGE_ORPHAN_GRACE_HOURS", DEFAULT_ORPHAN_GRACE_HOURS)
+    cutoff = timezone.now() - timedelta(hours=grace_hours)
+    known = referenced_keys()
+    return [
+        key for key, last_modified in iter_objects(settings.AWS_PRODUCT_BUCKET_NAME, prefix)
+        if key not in known and last_modified < cutoff
+    ]
+
+
+def sweep_orphan_objects(purge: bool = False, prefix: str = ORPHAN_SCAN_PREFIX) -> dict:
+    """Reporta (y con purge=True borra en lote) los objetos huérfanos del bucket."""
+    orphans = find_orphan_objects(prefix)
+    summary = {"orphans": len(orphans), "sample": orphans[:20], "deleted": 0, "errors": 0}
+    if purge and orphans:
+        result = delete_objects_batched(settings.AWS_PRODUCT_BUCKET_NAME, orphans)
+        summary.update(deleted=result["deleted"], errors=len(result["errors"]))
+    logger.info(
+        f"🧹 Barrido de huérfanos en {prefix}: {summary['orphans']} encontrados, "
+        f"{summary['deleted']} borrados"
+    )
+    return summary
@@ -6,17 +6,11 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 from apps.products.models import Product, Category, Type, Subproduct
-from apps.products.utils.redis_utils import delete_keys_by_pattern
+from apps.products.utils.cache_helpers_core import bump_namespace_version
 from apps.products.utils.cache_helpers_categories import CACHE_KEY_CATEGORY_LIST
 from apps.products.utils.cache_helpers_types      import CACHE_KEY_TYPE_LIST
-from apps.products.utils.cache_helpers_products   import (
-    PRODUCT_LIST_CACHE_PREFIX,
-    PRODUCT_DETAIL_CACHE_PREFIX,
-)
-from apps.products.utils.cache_helpers_subproducts import (
-    SUBPRODUCT_LIST_CACHE_PREFIX,
-    SUBPRODUCT_DETAIL_CACHE_PREFIX,
-)
+from apps.products.utils.cache_helpers_products   import invalidate_product_cache
+from apps.products.utils.cache_helpers_subproducts import invalidate_subproduct_cache
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +20,8 @@ def clear_category_cache(sender, **kwargs):
     """
     Invalida la caché de la lista de categorías tras crear, actualizar o borrar.
     """
-    deleted = delete_keys_by_pattern(CACHE_KEY_CATEGORY_LIST)
-    logger.debug("[Cache][Signal] category_list borrado (%d claves).", deleted)
+    bump_namespace_version(CACHE_KEY_CATEGORY_LIST)
+    logger.debug("[Cache][Signal] category_list invalidado.")
 
 
 @receiver([post_save, post_delete], sender=Type)
@@ -35,31 +29,25 @@ def clear_type_cache(sender, **kwargs):
     """
     Invalida la caché de la lista de tipos tras crear, actualizar o borrar.
     """
-    deleted = delete_keys_by_pattern(CACHE_KEY_TYPE_LIST)
-    logger.debug("[Cache][Signal] type_list borrado (%d claves).", deleted)
+    bump_namespace_version(CACHE_KEY_TYPE_LIST)
+    logger.debug("[Cache][Signal] type_list invalidado.")
 
 
 @receiver([post_save, post_delete], sender=Product)
-def clear_product_cache(sender, **kwargs):
+def clear_product_cache(sender, instance, **kwargs):
     """
-    Invalida la caché de lista y detalle de productos tras crear, actualizar o borrar.
+    Invalida solo la caché del producto afectado (detalle, subproductos) y los
+    listados de productos tras crear, actualizar o borrar.
     """
-    deleted_list   = delete_keys_by_pattern(PRODUCT_LIST_CACHE_PREFIX)
-    deleted_detail = delete_keys_by_pattern(PRODUCT_DETAIL_CACHE_PREFIX)
-    logger.debug(
-        "[Cache][Signal] product_list borrado (%d), product_detail borrado (%d).",
-        deleted_list, deleted_detail
-    )
+    invalidate_product_cache(instance.pk)
+    logger.debug("[Cache][Signal] producto %s invalidado.", instance.pk)
 
 
 @receiver([post_save, post_delete], sender=Subproduct)
-def clear_subproduct_cache(sender, **kwargs):
+def clear_subproduct_cache(sender, instance, **kwargs):
     """
-    Invalida la caché de lista y detalle de subproductos tras crear, actualizar o borrar.
+    Invalida la caché del subproducto afectado y la de su producto padre (que
+    anida sus subproductos y su stock) tras crear, actualizar o borrar.
     """
-    deleted_list   = delete_keys_by_pattern(SUBPRODUCT_LIST_CACHE_PREFIX)
-    deleted_detail = delete_keys_by_pattern(SUBPRODUCT_DETAIL_CACHE_PREFIX)
-    logger.debug(
-        "[Cache][Signal] subproduct_list borrado (%d), subproduct_detail borrado (%d).",
-        deleted_list, deleted_detail
-    )
+    invalidate_subproduct_cache(instance.parent_id, instance.pk)
+    logger.debug("[Cache][Signal] subproducto %s invalidado.", instance.pk)
@@ -0,0 +1,101 @@
+from celery import shared_task
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+import logging
+
+from apps.products.models import ProductImage, SubproductImage
+from apps.products.utils.cache_helpers_products import invalidate_product_cache
+from apps.products.utils.cache_helpers_subproducts import invalidate_subproduct_cache
+from apps.products.services.product_export_service import export_to_bucket
+from apps.products.services.storage_cleanup_service import (
+    purge_expired_deleted_files,
+    sweep_orphan_objects,
+)
+from apps.storages_client.services.thumbnails import generate_thumbnails, is_thumbnailable
+
+logger = logging.getLogger(__name__)
+
+
+def _thumbnail_image(image, force: bool = False):
+    """
+    Genera y registra las miniaturas de `image`. Devuelve el dict de variantes,
+    o None si no corresponde (no es imagen, archivo ilegible).
+    Los errores de S3 se propagan para que Celery reintente.
+    """
+    if not is_thumbnailable(image.key, image.mime_type):
+        return None
+    if image.thumbnails and not force:
+        return image.thumbnails
+    try:
+        variants = generate_thumbnails(image.key)
+    except (BotoCoreError, ClientError):
+        raise
+    except Exception as e:
+        # Archivo corrupto o formato que Pillow no decodifica: no tiene sentido reintentar
+        logger.error(f"❌ No se pudieron generar miniaturas de {image.key}: {e}")
+        return None
+    # update() directo: no pisa otros campos si la fila cambió mientras tanto
+    type(image).objects.filter(pk=image.pk).update(thumbnails=variants)
+    return variants
+
+
+@shared_task(autoretry_for=(BotoCoreError, ClientError), retry_backoff=True, max_retries=3)
+def generate_product_image_thumbnails(image_id: int, force: bool = False):
+    """Genera las miniaturas WebP de una ProductImage y guarda sus keys."""
+    image = ProductImage.objects.filter(pk=image_id).first()
+    if image is None:
+        logger.info(f"🛑 ProductImage {image_id} ya no existe: sin miniaturas")
+        return None
+    variants = _thumbnail_image(image, force)
+    if variants:
+        # El detalle cacheado del producto incluye product_images
+        invalidate_product_cache(image.product_id)
+    return variants
+
+
+@shared_task(autoretry_for=(BotoCoreError, ClientError), retry_backoff=True, max_retries=3)
+def generate_subproduct_image_thumbnails(image_id: int, force: bool = False):
+    """Genera las miniaturas WebP de una SubproductImage y guarda sus keys."""
+    image = SubproductImage.objects.select_related("subproduct").filter(pk=image_id).first()
+    if image is None:
+        logger.info(f"🛑 SubproductImage {image_id} ya no existe: sin miniaturas")
+        return None
+    variants = _thumbnail_image(image, force)
+    if variants:
+        invalidate_subproduct_cache(image.subproduct.parent_id, image.subproduct_id)
+    return variants
+
+
+# Sin reintentos: las filas se borran antes que los objetos; si S3 falla, los
+# objetos quedan huérfanos y los recoge sweep_orphan_storage_objects.
+@shared_task
+def purge_deleted_files(retention_days: int = None):
+    """
+    Task programada (Celery beat): elimina en lote los archivos de productos y
+    subproductos dados de baja hace más de STORAGE_DELETED_FILES_RETENTION_DAYS.
+    """
+    return purge_expired_deleted_files(retention_days)
+
+
+@shared_task
+def sweep_orphan_storage_objects(purge: bool = None):
+    """
+    Task programada (Celery beat): busca objetos de `products/` sin fila en la
+    base. Por defecto solo reporta; borra si STORAGE_ORPHAN_SWEEP_PURGE o purge=True.
+    """
+    if purge is None:
+        purge = getattr(settings, "STORAGE_ORPHAN_SWEEP_PURGE", False)
+    summary = sweep_orphan_objects(purge=purge)
+    if summary["orphans"] and not purge:
+        logger.warning(f"⚠️ {summary['orphans']} objetos huérfanos en el bucket (ej.: {summary['sample'][:5]})")
+    return summary
+
+
+@shared_task(autoretry_for=(BotoCoreError, ClientError), retry_backoff=True, max_retries=3)
+def export_products_task(export_format: str = "csv", params: dict = None):
+    """
+    Genera la exportación del catálogo y la deja en el bucket de productos.
+    Devuelve {'key', 'rows'} (resultado consultable por task_id; la URL se
+    firma al consultar el estado).
+    """
+    return export_to_bucket(export_format, params)
@@ -0,0 +1,202 @@
+# apps/products/utils/cache_decorators.py
+
+"""
+Decorador de caché para vistas DRF basadas en funciones.
+Reemplaza a cache_page: guarda `response.data` bajo una clave propia, que puede ser
+- versionada por namespace (listados): se invalida con bump_namespace_version.
+  Se guarda junto al ETag de la versión con que se calculó, y las respuestas
+  servidas desde caché lo emiten: una copia stale nunca sale con el ETag de la
+  versión nueva;
+- por objeto (detalles, vía key_func): la clave embebe la versión del
+  namespace del objeto y se invalida con su bump.
+
+Protección contra estampidas (por endpoint):
+- single-flight: ante un MISS solo el worker que obtiene el lock (cache.add)
+  recalcula; el resto espera brevemente a que aparezca la clave fresca.
+- serve_stale (opcional por endpoint, CATALOG_LIST_CACHE_POLICY): mientras
+  otro worker tiene el lock de recálculo, los que esperan reciben la copia
+  anterior ("stale"). El primer request tras una invalidación siempre
+  recalcula, y un request con `Cache-Control: no-cache` nunca recibe la copia
+  stale: quien acaba de escribir puede leer sus propios cambios.
+"""
+import logging
+import time
+import uuid
+from dataclasses import dataclass, replace
+from functools import wraps
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache_helpers_core import versioned_list_entry, list_cache_key_parts, record_cache_access
+
+logger = logging.getLogger(__name__)
+
+STALE_SUFFIX = "stale"
+LOCK_SUFFIX = "lock"
+WAIT_POLL_INTERVAL = 0.05
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Configuración de caché de un endpoint.
+    - timeout: TTL de la entrada fresca (None = settings.CACHE_TTL).
+    - lock_timeout: segundos que vive el lock de recálculo (cubre recálculos colgados).
+    - wait_timeout: cuánto espera un worker sin lock a la entrada fresca antes
+      de recalcular por su cuenta.
+    - serve_stale: servir la copia anterior a los workers que esperan mientras
+      otro recalcula (nunca al que tiene el lock). Opt-in por endpoint.
+    - stale_ttl: TTL de la copia "stale" (None = sin expiración).
+    """
+    timeout: Optional[int] = None
+    lock_timeout: int = 10
+    wait_timeout: float = 2.0
+    serve_stale: bool = False
+    stale_ttl: Optional[int] = 600
+
+
+# Política por defecto de los listados: single-flight sin copias stale, para
+# que el listado posterior a una escritura refleje esa escritura.
+LIST_CACHE_POLICY = CachePolicy()
+# Listados de catálogo (categorías, tipos): cambian poco y toleran el retraso
+# de un recálculo; los workers que esperan reciben la copia anterior.
+CATALOG_LIST_CACHE_POLICY = CachePolicy(serve_stale=True)
+# Los detalles se invalidan por versión al escribir: nunca se sirven stale.
+DETAIL_CACHE_POLICY = CachePolicy()
+
+
+def _resolve_policy(label: str, policy: Optional[CachePolicy], overrides: dict) -> CachePolicy:
+    """
+    Combina la política del decorador con los overrides por endpoint de
+    settings.VIEW_CACHE_POLICIES = {'<label>': {'wait_timeout': 1, ...}}.
+    """
+    resolved = policy or DETAIL_CACHE_POLICY
+    if overrides:
+        resolved = replace(resolved, **overrides)
+    setting_overrides = getattr(settings, "VIEW_CACHE_POLICIES", {}).get(label)
+    if setting_overrides:
+        resolved = replace(resolved, **setting_overrides)
+    return resolved
+
+
+def _acquire_lock(key: str, ttl: int) -> Optional[str]:
+    token = uuid.uuid4().hex
+    return token if cache.add(f"{key}:{LOCK_SUFFIX}", token, ttl) else None
+
+
+def _release_lock(key: str, token: str) -> None:
+    lock_key = f"{key}:{LOCK_SUFFIX}"
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def _cached_response(entry, etag_in_entry: bool) -> Response:
+    """Response a partir de una entrada de caché ({'data', 'etag'} en listados)."""
+    if not etag_in_entry:
+        return Response(entry)
+    response = Response(entry["data"])
+    response["ETag"] = entry["etag"]
+    return response
+
+
+def _accepts_stale(request) -> bool:
+    """`Cache-Control: no-cache` en el request pide datos vigentes (no stale)."""
+    return "no-cache" not in request.headers.get("Cache-Control", "").lower()
+
+
+def _wait_for_fresh(key: str, wait_timeout: float):
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_POLL_INTERVAL)
+        data = cache.get(key)
+        if data is not None:
+            return data
+    return None
+
+
+def cached_view(namespace, key_func=None, label=None, timeout=None,
+                policy: Optional[CachePolicy] = None, **policy_overrides):
+    """
+    Cachea las respuestas 200 de GET de una vista @api_view.
+    - namespace: nombre del namespace versionado, o callable
+      (request, *args, **kwargs) -> str para namespaces por objeto padre.
+      La clave de listado se arma con build_list_cache_key: query params
+      canónicos, page/page_size normalizados y bucket de rol (staff/operator).
+    - key_func: callable (request, *args, **kwargs) -> str con una clave fija
+      (p. ej. product_detail_cache_key); si se indica, no se usa el namespace.
+    - label: nombre para contadores hit/miss y overrides de settings (por
+      defecto, el namespace).
+    - policy / **policy_overrides: ver CachePolicy.
+    Debe aplicarse debajo de @api_view/@permission_classes para que la
+    autenticación y permisos se evalúen antes de leer la caché.
+    """
+    stats_label = label or (namespace if isinstance(namespace, str) else "view")
+    if timeout is not None:
+        policy_overrides["timeout"] = timeout
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            if request.method != "GET":
+                return view_func(request, *args, **kwargs)
+
+            conf = _resolve_policy(stats_label, policy, policy_overrides)
+            ttl = conf.timeout if conf.timeout is not None else getattr(settings, "CACHE_TTL", None)
+
+            etag = None
+            if key_func is not None:
+                key = key_func(request, *args, **kwargs)
+                stale_key = f"{key}:{STALE_SUFFIX}"
+            else:
+                ns = namespace(request, *args, **kwargs) if callable(namespace) else namespace
+                # Clave canónica: params ordenados, paginación normalizada y bucket de rol
+                key, etag = versioned_list_entry(ns, request)
+                # La copia stale no lleva versión: sobrevive al bump del namespace
+                role, digest = list_cache_key_parts(request)
+                stale_key = f"{ns}:{STALE_SUFFIX}:{role}:{digest}"
+            with_etag = etag is not None
+
+            entry = cache.get(key)
+            if entry is not None:
+                record_cache_access(stats_label, hit=True)
+                return _cached_response(entry, with_etag)
+            record_cache_access(stats_label, hit=False)
+
+            def compute():
+                response = view_func(request, *args, **kwargs)
+                if response.status_code == status.HTTP_200_OK:
+                    entry = {"data": response.data, "etag": etag} if with_etag else response.data
+                    cache.set(key, entry, ttl)
+                    if conf.serve_stale:
+                        cache.set(stale_key, entry, conf.stale_ttl)
+                    if with_etag:
+                        response["ETag"] = etag
+                    logger.debug("[Cache] MISS %s (guardado)", key)
+                return response
+
+            token = _acquire_lock(key, conf.lock_timeout)
+
+            if token is None:
+                # Otro worker está recalculando esta clave
+                stale = cache.get(stale_key) if conf.serve_stale and _accepts_stale(request) else None
+                if stale is not None:
+                    logger.debug("[Cache] STALE %s (recalculo en curso)", key)
+                    return _cached_response(stale, with_etag)
+                fresh = _wait_for_fresh(key, conf.wait_timeout)
+                if fresh is not None:
+                    return _cached_response(fresh, with_etag)
+                logger.warning("[Cache] espera agotada para %s; recalculando sin lock", key)
+                return compute()
+
+            try:
+                return compute()
+            finally:
+                _release_lock(key, token)
+
+        return _wrapped
+
+    return decorator
@@ -3,9 +3,16 @@
 """
 Módulo central para generación de claves de caché y utilidades comunes.
 """
+import hashlib
+import logging
+import time
 from urllib.parse import urlencode
 from typing import Any, Dict, List, Tuple
 
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
 
 def generate_cache_key(prefix: str, **params: Any) -> str:
     """
@@ -31,3 +38,209 @@ def generate_detail_key(prefix: str, *ids: Any) -> str:
     """
     id_parts = ":".join(str(i) for i in ids)
     return f"{prefix}:{id_parts}"
+
+
+# ── CLAVES CANÓNICAS PARA LISTADOS ────────────────────────────
+# Valores por defecto alineados con apps.core.pagination.Pagination.
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+STAFF_BUCKET = "staff"
+OPERATOR_BUCKET = "operator"
+
+
+def user_role_bucket(user) -> str:
+    """
+    Agrupa al usuario en un bucket de permisos: las respuestas se cachean por
+    bucket (no por usuario) para no multiplicar entradas idénticas.
+    """
+    return STAFF_BUCKET if getattr(user, "is_staff", False) else OPERATOR_BUCKET
+
+
+def _normalize_positive_int(raw: str, default: int, maximum: int = None) -> int:
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return default
+    if value <= 0:
+        return default
+    return min(value, maximum) if maximum else value
+
+
+def canonical_list_params(query_params, default_page_size: int = DEFAULT_PAGE_SIZE,
+                          max_page_size: int = MAX_PAGE_SIZE) -> str:
+    """
+    Serializa los query params de un listado en forma canónica:
+    - orden alfabético de claves y valores (?a=1&b=2 == ?b=2&a=1);
+    - se descartan valores vacíos (los filtros los ignoran);
+    - page y page_size normalizados como lo hace Pagination (page_size por
+      defecto y tope en max_page_size), así '?page=1' == '' y
+      '?page_size=500' == '?page_size=100'.
+    """
+    items: List[Tuple[str, str]] = []
+    for key in query_params:
+        if key in ("page", "page_size"):
+            continue
+        for value in query_params.getlist(key):
+            if value != "":
+                items.append((key, value))
+
+    # Páginas inválidas ('0', 'abc') se conservan tal cual: Pagination responde 404
+    page = query_params.get("page", "1")
+    if page.isdigit() and int(page) > 0:
+        page = str(int(page))
+    items.append(("page", page))
+    items.append(("page_size", str(_normalize_positive_int(
+        query_params.get("page_size"), default_page_size, max_page_size
+    ))))
+    return urlencode(sorted(items))
+
+
+def build_list_cache_key(namespace: str, request, **pagination) -> str:
+    """
+    Clave versionada de un listado: namespace + versión + bucket de rol +
+    hash de los parámetros canónicos.
+    Ejemplo: 'product_list:v17:staff:9f86d0...'
+    """
+    return versioned_key(namespace, *list_cache_key_parts(request, **pagination))
+
+
+def list_cache_key_parts(request, **pagination) -> Tuple[str, str]:
+    """(bucket de rol, hash de parámetros canónicos) del request de un listado."""
+    canonical = canonical_list_params(request.GET, **pagination)
+    digest = hashlib.md5(canonical.encode("utf-8")).hexdigest()
+    return user_role_bucket(getattr(request, "user", None)), digest
+
+
+# ── VERSIONADO POR NAMESPACE (invalidación O(1)) ──────────────
+# Cada namespace lógico ('product_list', 'type_list', ...) tiene un contador de
+# versión en cache. Las claves de datos embeben la versión vigente, así que
+# invalidar un namespace es un único INCR: las claves viejas quedan huérfanas
+# y expiran/se desalojan solas, sin SCAN sobre todo el keyspace.
+
+NAMESPACE_VERSION_PREFIX = "ns_version"
+
+
+def namespace_version_key(namespace: str) -> str:
+    """Clave donde se guarda el contador de versión de un namespace."""
+    return f"{NAMESPACE_VERSION_PREFIX}:{namespace}"
+
+
+def _initial_version() -> int:
+    # Semilla en microsegundos: si el contador se pierde (eviction/flush) la
+    # nueva versión nunca coincide con una anterior todavía presente en cache.
+    return time.time_ns() // 1_000
+
+
+def get_namespace_version(namespace: str) -> int:
+    """Devuelve la versión vigente del namespace, inicializándola si no existe."""
+    key = namespace_version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key) or _initial_version()
+    return int(version)
+
+
+def get_namespace_versions(namespaces: List[str]) -> Dict[str, int]:
+    """Versiones vigentes de varios namespaces con un get_many ({namespace: versión})."""
+    keys = {namespace_version_key(ns): ns for ns in dict.fromkeys(namespaces)}
+    found = cache.get_many(list(keys))
+    versions = {ns: int(found[key]) for key, ns in keys.items() if key in found}
+    for ns in keys.values():
+        if ns not in versions:
+            versions[ns] = get_namespace_version(ns)
+    return versions
+
+
+def bump_namespace_version(*namespaces: str) -> None:
+    """
+    Invalida uno o más namespaces incrementando su versión (un INCR por namespace).
+    """
+    for namespace in namespaces:
+        key = namespace_version_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Contador inexistente: cualquier clave previa queda invalidada
+            # al inicializarlo con una semilla nueva.
+            if not cache.add(key, _initial_version(), timeout=None):
+                cache.incr(key)
+        logger.debug("[Cache] namespace '%s' invalidado (nueva versión)", namespace)
+
+
+def versioned_key(namespace: str, *parts: Any) -> str:
+    """
+    Genera una clave de datos que embebe la versión vigente del namespace.
+    Ejemplo: versioned_key('product_list', 'abc123') -> 'product_list:v17:abc123'
+    """
+    suffix = ":".join(str(p) for p in parts)
+    return f"{namespace}:v{get_namespace_version(namespace)}:{suffix}"
+
+
+# ── CONTADORES DE HIT/MISS ────────────────────────────────────
+# Un par de contadores por namespace lógico, guardados en la misma cache para
+# que los agreguen todos los workers. Ver comando `cache_stats`.
+
+CACHE_STATS_PREFIX = "cache_stats"
+
+
+def _stats_key(label: str, event: str) -> str:
+    return f"{CACHE_STATS_PREFIX}:{label}:{event}"
+
+
+def record_cache_access(label: str, hit: bool) -> None:
+    """Incrementa el contador de hit o miss del namespace `label`."""
+    key = _stats_key(label, "hit" if hit else "miss")
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_cache_stats(labels: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Devuelve {label: {'hits', 'misses', 'hit_rate'}} para los namespaces dados.
+    """
+    keys = [_stats_key(label, event) for label in labels for event in ("hit", "miss")]
+    raw = cache.get_many(keys)
+    stats: Dict[str, Dict[str, Any]] = {}
+    for label in labels:
+        hits = int(raw.get(_stats_key(label, "hit"), 0))
+        misses = int(raw.get(_stats_key(label, "miss"), 0))
+        total = hits + misses
+        stats[label] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+def reset_cache_stats(labels: List[str]) -> None:
+    """Pone a cero los contadores de los namespaces dados."""
+    cache.delete_many([_stats_key(label, event) for label in labels for event in ("hit", "miss")])
+
+
+# ── VALIDADORES HTTP (ETag) ───────────────────────────────────
+
+def namespace_etag(request, *namespaces: str) -> str:
+    """
+    ETag de un endpoint cacheado: versiones de sus namespaces + parámetros
+    canónicos + bucket de rol. No toca la base de datos.
+    """
+    from apps.core.conditional import make_etag
+    versions = [get_namespace_version(ns) for ns in namespaces]
+    return make_etag(*versions, *list_cache_key_parts(request))
+
+
+def versioned_list_entry(namespace: str, request) -> Tuple[str, str]:
+    """
+    (clave versionada, ETag) de un listado leyendo la versión una sola vez: el
+    ETag describe exactamente los datos guardados bajo esa clave. Coincide con
+    namespace_etag(request, namespace) mientras la versión no cambie.
+    """
+    from apps.core.conditional import make_etag
+    version = get_namespace_version(namespace)
+    role, digest = list_cache_key_parts(request)
+    return f"{namespace}:v{version}:{role}:{digest}", make_etag(version, role, digest)
@@ -6,6 +6,7 @@
 
 PRODUCT_LIST_CACHE_PREFIX    = "product_list"
 PRODUCT_DETAIL_CACHE_PREFIX  = "product_detail"
+PRODUCT_FILES_CACHE_PREFIX   = "product_files"
 
 def product_list_cache_key(page: int = 1, page_size: int = 10, **filters) -> str:
     """
@@ -14,9 +15,85 @@ def product_list_cache_key(page: int = 1, page_size: int = 10, **filters) -> str
     from .cache_helpers_core import generate_cache_key
     return generate_cache_key(PRODUCT_LIST_CACHE_PREFIX, page=page, page_size=page_size, **filters)
 
-def product_detail_cache_key(prod_pk: int) -> str:
+def product_detail_cache_key(prod_pk: int, version: int = None) -> str:
     """
-    (Opcional) Genera una clave manual de detalle si la necesitas en otro contexto.
+    Clave de detalle de producto, versionada por product_version_namespace:
+    un GET que leyó la base antes de una escritura y guarda después lo hace
+    bajo la versión vieja, inalcanzable tras el bump de la invalidación.
+    `version` evita releer el contador si el llamador ya lo tiene.
     """
-    from .cache_helpers_core import generate_detail_key
-    return generate_detail_key(PRODUCT_DETAIL_CACHE_PREFIX, prod_pk)
+    from .cache_helpers_core import generate_detail_key, get_namespace_version
+    if version is None:
+        version = get_namespace_version(product_version_namespace(prod_pk))
+    return generate_detail_key(PRODUCT_DETAIL_CACHE_PREFIX, prod_pk, f"v{version}")
+
+def product_detail_cache_keys(prod_pks) -> dict:
+    """
+    {prod_pk: clave de detalle} de varios productos, leyendo todas las
+    versiones con un solo get_many (lecturas en lote).
+    """
+    from .cache_helpers_core import get_namespace_versions
+    versions = get_namespace_versions([product_version_namespace(pk) for pk in prod_pks])
+    return {pk: product_detail_cache_key(pk, versions[product_version_namespace(pk)]) for pk in prod_pks}
+
+def product_version_namespace(prod_pk: int) -> str:
+    """
+    Namespace versionado de un producto puntual: se bumpea en cada
+    invalidación del producto o de sus subproductos y alimenta el ETag de los
+    endpoints de detalle.
+    """
+    return f"{PRODUCT_DETAIL_CACHE_PREFIX}:{prod_pk}"
+
+
+def product_files_cache_key(prod_pk: int) -> str:
+    """Clave del listado de archivos (sin URLs firmadas) de un producto."""
+    return f"{PRODUCT_FILES_CACHE_PREFIX}:{prod_pk}"
+
+
+def invalidate_product_cache(prod_pk: int) -> None:
+    """
+    Invalidación fina tras escribir un producto: bumpea la versión de su
+    detalle (y del de sus subproductos), su listado de subproductos y los
+    listados de productos (que pueden contenerlo).
+    """
+    invalidate_products_cache([prod_pk])
+
+
+def invalidate_products_cache(prod_pks) -> None:
+    """
+    Igual que invalidate_product_cache para varios productos a la vez (escrituras
+    en lote): una consulta de subproductos, un delete_many y un bump por namespace.
+    El delete_many solo libera memoria (entradas de la versión vigente): lo que
+    invalida los detalles es el bump.
+    """
+    from django.core.cache import cache
+    from apps.products.models.subproduct_model import Subproduct
+    from .cache_helpers_core import bump_namespace_version, get_namespace_versions
+    from .cache_helpers_subproducts import (
+        subproduct_detail_cache_key,
+        subproduct_files_cache_key,
+        subproduct_list_namespace,
+    )
+
+    prod_pks = list(dict.fromkeys(prod_pks))
+    if not prod_pks:
+        return
+    subproducts = list(
+        Subproduct.objects.filter(parent_id__in=prod_pks).values_list('parent_id', 'pk')
+    )
+    versions = get_namespace_versions([product_version_namespace(pk) for pk in prod_pks])
+    version_of = lambda pk: versions[product_version_namespace(pk)]
+    keys = []
+    for prod_pk in prod_pks:
+        keys += [product_detail_cache_key(prod_pk, version_of(prod_pk)), product_files_cache_key(prod_pk)]
+    for prod_pk, subp_pk in subproducts:
+        keys += [
+            subproduct_detail_cache_key(prod_pk, subp_pk, version_of(prod_pk)),
+            subproduct_files_cache_key(prod_pk, subp_pk),
+        ]
+    cache.delete_many(keys)
+
+    namespaces = [PRODUCT_LIST_CACHE_PREFIX]
+    for prod_pk in prod_pks:
+        namespaces += [subproduct_list_namespace(prod_pk), product_version_namespace(prod_pk)]
+    bump_namespace_version(*namespaces)
@@ -5,6 +5,7 @@ from .cache_helpers_core import generate_cache_key, generate_detail_key
 
 SUBPRODUCT_LIST_CACHE_PREFIX   = "subproduct_list"
 SUBPRODUCT_DETAIL_CACHE_PREFIX = "subproduct_detail"
+SUBPRODUCT_FILES_CACHE_PREFIX  = "subproduct_files"
 
 def subproduct_list_cache_key(
     prod_pk: int,
@@ -29,9 +30,65 @@ def subproduct_list_cache_key(
 
 def subproduct_detail_cache_key(
     prod_pk: int,
-    subp_pk: int
+    subp_pk: int,
+    version: Optional[int] = None
 ) -> str:
     """
-    (Opcional) Genera la clave de detalle de subproducto.
+    Clave de detalle de subproducto, versionada por el namespace del padre
+    (product_version_namespace), que se bumpea en toda invalidación del
+    subproducto: ver product_detail_cache_key.
     """
-    return generate_detail_key(SUBPRODUCT_DETAIL_CACHE_PREFIX, prod_pk, subp_pk)
+    from .cache_helpers_core import get_namespace_version
+    from .cache_helpers_products import product_version_namespace
+    if version is None:
+        version = get_namespace_version(product_version_namespace(prod_pk))
+    return generate_detail_key(SUBPRODUCT_DETAIL_CACHE_PREFIX, prod_pk, subp_pk, f"v{version}")
+
+
+def subproduct_detail_cache_keys(prod_pk: int, subp_pks) -> Dict[int, str]:
+    """{subp_pk: clave de detalle} de subproductos de un mismo padre (una sola versión)."""
+    from .cache_helpers_core import get_namespace_version
+    from .cache_helpers_products import product_version_namespace
+    version = get_namespace_version(product_version_namespace(prod_pk))
+    return {subp_pk: subproduct_detail_cache_key(prod_pk, subp_pk, version) for subp_pk in subp_pks}
+
+
+def subproduct_files_cache_key(prod_pk: int, subp_pk: int) -> str:
+    """Clave del listado de archivos (sin URLs firmadas) de un subproducto."""
+    return f"{SUBPRODUCT_FILES_CACHE_PREFIX}:{prod_pk}:{subp_pk}"
+
+
+def subproduct_list_namespace(prod_pk: int) -> str:
+    """
+    Namespace versionado del listado de subproductos de un producto padre:
+    invalidar un padre no afecta los listados cacheados de los demás.
+    """
+    return f"{SUBPRODUCT_LIST_CACHE_PREFIX}:{prod_pk}"
+
+
+def invalidate_subproduct_cache(prod_pk: int, subp_pk: Optional[int] = None) -> None:
+    """
+    Invalidación fina tras escribir un subproducto: bumpea la versión del
+    detalle del padre (que anida subproductos y stock) y de sus subproductos,
+    el listado de subproductos de ese padre y los listados de productos.
+    """
+    from django.core.cache import cache
+    from .cache_helpers_core import bump_namespace_version, get_namespace_version
+    from .cache_helpers_products import (
+        PRODUCT_LIST_CACHE_PREFIX,
+        product_detail_cache_key,
+        product_version_namespace,
+    )
+
+    # Entradas de la versión vigente (memoria); el bump es lo que invalida
+    version = get_namespace_version(product_version_namespace(prod_pk))
+    keys = [product_detail_cache_key(prod_pk, version)]
+    if subp_pk is not None:
+        keys.append(subproduct_detail_cache_key(prod_pk, subp_pk, version))
+        keys.append(subproduct_files_cache_key(prod_pk, subp_pk))
+    cache.delete_many(keys)
+    bump_namespace_version(
+        subproduct_list_namespace(prod_pk),
+        PRODUCT_LIST_CACHE_PREFIX,
+        product_version_namespace(prod_pk),
+    )
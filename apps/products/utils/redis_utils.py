@@ -11,6 +11,9 @@ def delete_keys_by_pattern(prefix: str) -> int:
     Invalida todas las claves cuyo prefijo coincida con prefix,
     respetando el KEY_PREFIX configurado en settings.CACHES
     y capturando también los sufijos automáticos de cache_page.
+
+    ⚠️ Recorre todo el keyspace (SCAN): no usar en el camino de escritura.
+    Para invalidar cachés de vistas usar bump_namespace_version (cache_helpers_core).
     """
     # Obtener el prefijo global de cache (si existe)
     key_prefix = settings.CACHES['default'].get('KEY_PREFIX', '')
@@ -24,7 +27,7 @@ def delete_keys_by_pattern(prefix: str) -> int:
 
     # 1) Intentamos con delete_pattern (django-redis)
     try:
-        deleted = cache.delete_pattern(pattern)
+        deleted = cache.delete_pattern(pattern) or 0
         logger.debug("[Cache] borradas %d claves con patrón '%s'", deleted, pattern)
         return deleted
     except (AttributeError, NotImplementedError) as e:
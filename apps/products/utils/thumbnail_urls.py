@@ -0,0 +1,94 @@
+# apps/products/utils/thumbnail_urls.py
+
+"""
+Firma de miniaturas de producto al responder.
+
+ProductImageSerializer devuelve las keys de las variantes ({"128": key}), que
+son estables y se pueden cachear sin vencimiento. Las URLs presignadas viven
+DEFAULT_EXPIRY_SECONDS: se resuelven después de leer la caché, en un solo lote
+por respuesta (igual que file_listing_service con los listados de archivos).
+
+El ETag de los endpoints que firman incluye la ventana de firma vigente: un
+304 solo confirma un cuerpo cuyas URLs siguen vigentes.
+"""
+import time
+from functools import wraps
+
+from django.conf import settings
+from rest_framework import status
+
+from apps.core.conditional import make_etag
+from apps.storages_client.services.presigned_cache import DEFAULT_EXPIRY_SECONDS, DEFAULT_SAFE_FRACTION
+from apps.storages_client.services.products_files import get_product_file_urls
+
+SIGNED_STATUSES = (status.HTTP_200_OK, status.HTTP_201_CREATED)
+
+
+def _product_payloads(data):
+    """Productos serializados dentro de un detalle, una página o un lote."""
+    if isinstance(data, dict):
+        if "product_images" in data:
+            yield data
+            return
+        results = data.get("results")
+        if isinstance(results, dict):
+            results = list(results.values())
+        if isinstance(results, list):
+            for item in results:
+                yield from _product_payloads(item)
+    elif isinstance(data, list):
+        for item in data:
+            yield from _product_payloads(item)
+
+
+def sign_product_thumbnails(data) -> None:
+    """
+    Reemplaza en `data` las keys de miniaturas por URLs firmadas, con una sola
+    resolución de URLs para todas las imágenes. Modifica `data` en el lugar:
+    debe ser la copia de esta respuesta, no un objeto compartido.
+    """
+    images = [
+        image for product in _product_payloads(data)
+        for image in product.get("product_images") or ()
+        if image.get("thumbnails")
+    ]
+    if not images:
+        return
+    urls = get_product_file_urls([key for image in images for key in image["thumbnails"].values()])
+    for image in images:
+        image["thumbnails"] = {size: urls.get(key) for size, key in image["thumbnails"].items()}
+
+
+def signing_window() -> int:
+    """
+    Índice de la ventana de firma actual. Una URL servida desde la caché de
+    presignadas conserva al menos (1 - fracción) de su vigencia; la ventana es
+    la mitad de ese margen, así un 304 dentro de la ventana nunca confirma
+    URLs vencidas.
+    """
+    fraction = getattr(settings, "PRESIGNED_URL_CACHE_FRACTION", DEFAULT_SAFE_FRACTION)
+    window = max(1, int(DEFAULT_EXPIRY_SECONDS * (1 - fraction) // 2))
+    return int(time.time() // window)
+
+
+def thumbnail_etag(etag: str) -> str:
+    """ETag de un cuerpo con miniaturas firmadas: el de los datos + la ventana de firma."""
+    return make_etag(etag, signing_window())
+
+
+def signed_thumbnails(view_func):
+    """
+    Firma las miniaturas de la respuesta de la vista (detalle, página o lote).
+    Va por encima del decorador de caché y por debajo de conditional_get,
+    cuyo etag_func debe envolverse con thumbnail_etag.
+    """
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        if response.status_code in SIGNED_STATUSES and getattr(response, "data", None) is not None:
+            sign_product_thumbnails(response.data)
+            if response.has_header("ETag"):
+                response["ETag"] = thumbnail_etag(response["ETag"])
+        return response
+
+    return _wrapped
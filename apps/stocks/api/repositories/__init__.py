@@ -1,2 +1,3 @@
 from .stock_product_repository import StockProductRepository
 from .stock_subproduct_repository import StockSubproductRepository
+from .stock_event_repository import StockEventRepository
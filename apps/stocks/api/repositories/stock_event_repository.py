@@ -0,0 +1,40 @@
+from django.db import models
+
+from apps.stocks.models.stock_event_model import StockEvent
+from apps.stocks.models.stock_subproduct_model import SubproductStock
+
+
+class StockEventRepository:
+    """
+    Repositorio de lectura para StockEvent.
+    Los eventos se crean únicamente desde los servicios de stock.
+    """
+
+    @staticmethod
+    def _history(**stock_filter) -> models.QuerySet[StockEvent]:
+        # Filtro por la FK directa + orden (created_at, id): lo resuelve el
+        # índice compuesto (stock, created_at, id) sin JOIN ni sort en memoria
+        return (
+            StockEvent.objects
+            .filter(**stock_filter)
+            .select_related('created_by', 'modified_by', 'deleted_by')
+            .order_by('-created_at', '-id')
+        )
+
+    @staticmethod
+    def get_history_for_product_stock(stock_id: int) -> models.QuerySet[StockEvent]:
+        """Eventos de un ProductStock, más recientes primero."""
+        # product_stock__product: lo usa product_stock_info (__str__ del stock)
+        return StockEventRepository._history(
+            product_stock_id=stock_id
+        ).select_related('product_stock__product')
+
+    @staticmethod
+    def get_history_for_subproduct(subproduct_id: int) -> models.QuerySet[StockEvent]:
+        """Eventos del SubproductStock de un subproducto, más recientes primero."""
+        stock_ids = SubproductStock.objects.filter(
+            subproduct_id=subproduct_id
+        ).values_list('id', flat=True)
+        return StockEventRepository._history(
+            subproduct_stock_id__in=list(stock_ids)
+        ).select_related('subproduct_stock__subproduct__parent')
@@ -1,3 +1,4 @@
 from .stock_event_serializer import StockEventSerializer
 from .stock_product_serializer import StockProductSerializer
 from .stock_subproduct_serializer import StockSubproductSerializer
+from .stock_adjustment_serializer import BulkStockAdjustmentSerializer, StockAdjustmentItemSerializer
@@ -0,0 +1,32 @@
+from rest_framework import serializers
+
+from apps.stocks.services.stocks_services import MAX_BULK_ADJUSTMENTS
+
+
+class StockAdjustmentItemSerializer(serializers.Serializer):
+    """Un ajuste del lote: exactamente uno de product_id / subproduct_id."""
+    product_id = serializers.IntegerField(required=False, min_value=1)
+    subproduct_id = serializers.IntegerField(required=False, min_value=1)
+    quantity_change = serializers.DecimalField(max_digits=15, decimal_places=2)
+    reason = serializers.CharField(max_length=255, required=False, allow_blank=True)
+
+    def validate_quantity_change(self, value):
+        if value == 0:
+            raise serializers.ValidationError("La cantidad del ajuste no puede ser cero.")
+        return value
+
+    def validate(self, data):
+        if bool(data.get('product_id')) == bool(data.get('subproduct_id')):
+            raise serializers.ValidationError("Indique 'product_id' o 'subproduct_id' (solo uno).")
+        return data
+
+
+class BulkStockAdjustmentSerializer(serializers.Serializer):
+    """Lote de ajustes; 'reason' se usa en los ítems que no traen la suya."""
+    reason = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    adjustments = StockAdjustmentItemSerializer(many=True, allow_empty=False, max_length=MAX_BULK_ADJUSTMENTS)
+
+    def validate(self, data):
+        if not data.get('reason') and any(not item.get('reason') for item in data['adjustments']):
+            raise serializers.ValidationError({"reason": "Se requiere una razón para el ajuste de stock."})
+        return data
@@ -1,6 +1,7 @@
 from django.urls import path
 from apps.stocks.api.views.stock_event_product_view import product_stock_event_history
 from apps.stocks.api.views.stock_event_subproduct_view import subproduct_stock_event_history
+from apps.stocks.api.views.stock_adjustment_view import bulk_stock_adjustment_view
 
 urlpatterns = [
     # Historial de eventos de stock para productos
@@ -8,4 +9,7 @@ urlpatterns = [
 
     # Historial de eventos de stock para subproductos
     path('products/<int:product_pk>/subproducts/<int:subproduct_pk>/stock/events/', subproduct_stock_event_history, name='subproduct-stock-events'),
+
+    # Ajustes de stock en lote (conteos físicos)
+    path('adjustments/bulk/', bulk_stock_adjustment_view, name='stock-adjustments-bulk'),
 ]
@@ -0,0 +1,46 @@
+import logging
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from drf_spectacular.utils import extend_schema
+
+from apps.stocks.api.serializers.stock_adjustment_serializer import BulkStockAdjustmentSerializer
+from apps.stocks.docs.stock_adjustment_doc import bulk_stock_adjustment_doc
+from apps.stocks.services import bulk_adjust_stock, BulkAdjustmentError
+
+logger = logging.getLogger(__name__)
+
+
+@extend_schema(
+    summary=bulk_stock_adjustment_doc["summary"],
+    description=bulk_stock_adjustment_doc["description"],
+    tags=bulk_stock_adjustment_doc["tags"],
+    operation_id=bulk_stock_adjustment_doc["operation_id"],
+    request=BulkStockAdjustmentSerializer,
+    responses=bulk_stock_adjustment_doc["responses"],
+)
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def bulk_stock_adjustment_view(request):
+    """
+    Aplica un lote de ajustes de stock en una sola transacción (todo o nada).
+    """
+    serializer = BulkStockAdjustmentSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        result = bulk_adjust_stock(
+            serializer.validated_data['adjustments'],
+            user=request.user,
+            default_reason=serializer.validated_data.get('reason'),
+        )
+    except BulkAdjustmentError as e:
+        return Response({"errors": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.exception(f"❌ Error aplicando ajustes de stock en lote: {e}")
+        return Response({"detail": "Error inesperado al aplicar los ajustes."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    return Response(result, status=status.HTTP_200_OK)
@@ -0,0 +1,29 @@
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.core.pagination import get_paginator
+from apps.core.streaming import is_stream_requested, ndjson_response
+from apps.stocks.api.serializers.stock_event_serializer import StockEventSerializer
+from apps.stocks.filters.stock_event_filter import StockEventFilter
+
+
+def stock_event_history_response(request, queryset):
+    """
+    Respuesta común de los historiales de eventos de stock:
+    filtra (fechas, event_type) y devuelve una página
+    (?pagination=cursor para keyset) o, con ?stream=true, el historial
+    completo como NDJSON en streaming.
+    """
+    filterset = StockEventFilter(request.GET, queryset=queryset)
+    if not filterset.is_valid():
+        return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+    events = filterset.qs
+
+    context = {'request': request}
+    if is_stream_requested(request):
+        return ndjson_response(events, StockEventSerializer, context=context)
+
+    paginator = get_paginator(request)
+    page = paginator.paginate_queryset(events, request)
+    serializer = StockEventSerializer(page, many=True, context=context)
+    return paginator.get_paginated_response(serializer.data)
@@ -5,11 +5,23 @@ from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema
 from django.shortcuts import get_object_or_404 
 
-from apps.stocks.api.serializers.stock_event_serializer import StockEventSerializer
+from apps.stocks.api.repositories.stock_event_repository import StockEventRepository
 from apps.stocks.api.repositories.stock_product_repository import StockProductRepository
+from apps.stocks.api.views.stock_event_history import stock_event_history_response
 from apps.products.models.product_model import Product
+from apps.products.utils.cache_helpers_core import list_cache_key_parts
 from apps.stocks.models.stock_event_model import StockEvent
 from apps.stocks.docs.stock_event_doc import stock_event_history_doc
+from apps.core.conditional import conditional_get, fingerprint_validators
+
+# Los eventos de stock son de solo-inserción: Last-Modified es fiable
+product_events_etag, product_events_last_modified = fingerprint_validators(
+    lambda request, pk: StockEvent.objects.filter(
+        product_stock__product_id=pk, product_stock__status=True
+    ),
+    # Filtros y página forman parte de la representación
+    lambda request, pk: list_cache_key_parts(request),
+)
 
 @extend_schema(
     summary=stock_event_history_doc["summary"],
@@ -21,9 +33,10 @@ from apps.stocks.docs.stock_event_doc import stock_event_history_doc
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(etag_func=product_events_etag, last_modified_func=product_events_last_modified)
 def product_stock_event_history(request, pk):
     """
-    Obtiene el historial de eventos de stock para un producto específico
+    Obtiene el historial paginado de eventos de stock para un producto específico
     (cuando el producto NO tiene subproductos y usa ProductStock).
     Requiere que el usuario esté autenticado.
     """
@@ -38,15 +51,6 @@ def product_stock_event_history(request, pk):
             status=status.HTTP_404_NOT_FOUND
         )
 
-    # 3. Recuperar eventos de stock, más recientes primero
-    events = StockEvent.objects.filter(
-        product_stock=stock_record
-    ).select_related('created_by').order_by('-created_at')
-
-    # 4. Devolver lista vacía si no hay eventos
-    if not events.exists():
-        return Response([], status=status.HTTP_200_OK)
-
-    # 5. Serializar y devolver
-    serializer = StockEventSerializer(events, many=True, context={'request': request})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    # 3. Eventos más recientes primero: filtrados, paginados o en streaming
+    events = StockEventRepository.get_history_for_product_stock(stock_record.pk)
+    return stock_event_history_response(request, events)
@@ -1,14 +1,25 @@
-from rest_framework import status
-from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema
 from django.shortcuts import get_object_or_404
 
-from apps.stocks.api.serializers.stock_event_serializer import StockEventSerializer
+from apps.stocks.api.repositories.stock_event_repository import StockEventRepository
+from apps.stocks.api.views.stock_event_history import stock_event_history_response
 from apps.stocks.models.stock_event_model import StockEvent
 from apps.products.models.subproduct_model import Subproduct
+from apps.products.utils.cache_helpers_core import list_cache_key_parts
 from apps.stocks.docs.stock_event_doc import stock_event_history_doc
+from apps.core.conditional import conditional_get, fingerprint_validators
+
+# Los eventos de stock son de solo-inserción: Last-Modified es fiable
+subproduct_events_etag, subproduct_events_last_modified = fingerprint_validators(
+    lambda request, product_pk, subproduct_pk: StockEvent.objects.filter(
+        subproduct_stock__subproduct_id=subproduct_pk,
+        subproduct_stock__subproduct__parent_id=product_pk,
+    ),
+    # Filtros y página forman parte de la representación
+    lambda request, product_pk, subproduct_pk: list_cache_key_parts(request),
+)
 
 @extend_schema(
     summary=stock_event_history_doc["summary"],
@@ -20,9 +31,13 @@ from apps.stocks.docs.stock_event_doc import stock_event_history_doc
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(
+    etag_func=subproduct_events_etag,
+    last_modified_func=subproduct_events_last_modified
+)
 def subproduct_stock_event_history(request, product_pk, subproduct_pk):
     """
-    Obtiene el historial de eventos de stock para un subproducto específico.
+    Obtiene el historial paginado de eventos de stock para un subproducto específico.
     Requiere que el usuario esté autenticado.
     """
     # 1. Validar existencia y pertenencia al producto padre
@@ -33,15 +48,6 @@ def subproduct_stock_event_history(request, product_pk, subproduct_pk):
         status=True
     )
 
-    # 2. Recuperar todos los eventos de stock para ese subproducto
-    stock_events = StockEvent.objects.filter(
-        subproduct_stock__subproduct=subproduct
-    ).select_related('created_by', 'subproduct_stock').order_by('-created_at')
-
-    # 3. Si no hay eventos, devolvemos una lista vacía
-    if not stock_events.exists():
-        return Response([], status=status.HTTP_200_OK)
-
-    # 4. Serializar y devolver
-    serializer = StockEventSerializer(stock_events, many=True, context={'request': request})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    # 2. Eventos más recientes primero: filtrados, paginados o en streaming
+    events = StockEventRepository.get_history_for_subproduct(subproduct.pk)
+    return stock_event_history_response(request, events)
@@ -0,0 +1,40 @@
+bulk_stock_adjustment_doc = {
+    'operation_id': 'bulkStockAdjustment',
+    'summary': 'Aplica ajustes de stock en lote (conteo físico).',
+    'description': (
+        'Aplica muchos ajustes manuales de stock de productos y subproductos en una sola transacción. '
+        'Todos los registros de stock afectados se bloquean de una vez en orden de ID; si algún ajuste '
+        'es inválido (stock inexistente, producto con subproductos, stock resultante negativo) no se '
+        'aplica ninguno y se devuelven los errores por índice. Cada ajuste genera su evento de stock. '
+        'Solo administradores.'
+    ),
+    'tags': ['Stock Events'],
+    'security': [{'jwtAuth': []}],
+    'responses': {
+        200: {
+            'description': 'Ajustes aplicados.',
+            'content': {
+                'application/json': {
+                    'example': {
+                        "adjusted": 2,
+                        "stocks": [
+                            {"product_id": 1, "subproduct_id": None, "quantity": "8.00"},
+                            {"product_id": None, "subproduct_id": 3, "quantity": "120.50"}
+                        ]
+                    }
+                }
+            }
+        },
+        400: {
+            'description': 'Datos inválidos o ajustes rechazados.',
+            'content': {
+                'application/json': {
+                    'example': {"errors": [{"index": 1, "detail": "Stock resultante negativo. Disponible: 2.00, ajuste: -5.00."}]}
+                }
+            }
+        },
+        403: {
+            'description': 'Solo administradores.'
+        }
+    }
+}
@@ -1,7 +1,12 @@
 stock_event_history_doc = {
     'operation_id': 'stockEventHistory',
     'summary': 'Obtiene el historial de eventos de stock para un producto o subproducto específico.',
-    'description': 'Recupera el historial de eventos de stock para un producto o subproducto específico.',
+    'description': (
+        'Recupera el historial paginado de eventos de stock para un producto o subproducto específico, '
+        'más recientes primero. Admite filtro por rango de fechas y tipo de evento, paginación por '
+        'cursor (?pagination=cursor) y, con ?stream=true, el historial completo como NDJSON '
+        '(application/x-ndjson, un evento por línea).'
+    ),
     'tags': ['Stock Events'],
     'security': [{'jwtAuth': []}],  # Aquí se aplica correctamente la seguridad
     'parameters': [
@@ -26,26 +31,90 @@ stock_event_history_doc = {
             'description': 'ID del subproducto (solo requerido para historial de subproducto)',
             'schema': {'type': 'integer', 'example': 3}
         },
+        {
+            'name': 'created_after',
+            'in': 'query',
+            'required': False,
+            'description': 'Eventos creados desde esta fecha/fecha-hora (inclusive, ISO 8601)',
+            'schema': {'type': 'string', 'example': '2025-03-01'}
+        },
+        {
+            'name': 'created_before',
+            'in': 'query',
+            'required': False,
+            'description': 'Eventos creados antes de esta fecha/fecha-hora (exclusive, ISO 8601)',
+            'schema': {'type': 'string', 'example': '2025-04-01'}
+        },
+        {
+            'name': 'event_type',
+            'in': 'query',
+            'required': False,
+            'description': 'Tipo de evento; repetible para varios tipos',
+            'schema': {'type': 'array', 'items': {'type': 'string'}, 'example': ['ingreso', 'egreso_corte']}
+        },
+        {
+            'name': 'page',
+            'in': 'query',
+            'required': False,
+            'description': 'Número de página (paginación por defecto)',
+            'schema': {'type': 'integer', 'example': 1}
+        },
+        {
+            'name': 'page_size',
+            'in': 'query',
+            'required': False,
+            'description': 'Tamaño de página (máximo 100)',
+            'schema': {'type': 'integer', 'example': 10}
+        },
+        {
+            'name': 'pagination',
+            'in': 'query',
+            'required': False,
+            'description': "'cursor' para paginación por cursor (keyset)",
+            'schema': {'type': 'string', 'enum': ['cursor']}
+        },
+        {
+            'name': 'cursor',
+            'in': 'query',
+            'required': False,
+            'description': "Cursor opaco devuelto en 'next'/'previous' (solo con pagination=cursor)",
+            'schema': {'type': 'string'}
+        },
+        {
+            'name': 'stream',
+            'in': 'query',
+            'required': False,
+            'description': 'true para recibir el historial completo como NDJSON en streaming (sin paginar)',
+            'schema': {'type': 'boolean'}
+        },
     ],
     'responses': {
         200: {
             'description': 'Historial de eventos de stock recuperado correctamente.',
             'content': {
                 'application/json': {
-                    'example': [
-                        {
-                            "id": 1,
-                            "stock": 1,
-                            "quantity_change": 10,
-                            "event_type": "entrada",
-                            "location": "Almacén A",
-                            "created_at": "2025-03-10T12:00:00Z",
-                            "user": {
+                    'example': {
+                        "count": 1,
+                        "next": None,
+                        "previous": None,
+                        "results": [
+                            {
                                 "id": 1,
-                                "username": "admin"
+                                "quantity_change": "10.00",
+                                "event_type": "ingreso",
+                                "notes": None,
+                                "product_stock": 1,
+                                "subproduct_stock": None,
+                                "product_stock_info": "Stock de Cable: 10.00",
+                                "subproduct_stock_info": None,
+                                "created_at": "2025-03-10T12:00:00Z",
+                                "created_by": "admin"
                             }
-                        }
-                    ]
+                        ]
+                    }
+                },
+                'application/x-ndjson': {
+                    'example': '{"id": 1, "quantity_change": "10.00", "event_type": "ingreso", ...}\n'
                 }
             }
         },
@@ -0,0 +1,34 @@
+import django_filters
+from apps.stocks.models.stock_event_model import StockEvent
+
+
+class StockEventFilter(django_filters.FilterSet):
+    """
+    Filtro para el historial de StockEvent:
+    - rango de fechas semiabierto [created_after, created_before) sobre 'created_at'
+      (acepta fecha 'YYYY-MM-DD' o fecha-hora ISO 8601);
+    - 'event_type' repetible (?event_type=ingreso&event_type=egreso_corte).
+    Los filtros de rango se aplican sobre la columna directa para que el índice
+    (stock, created_at) siga resolviendo la consulta.
+    """
+    created_after = django_filters.DateTimeFilter(
+        field_name='created_at',
+        lookup_expr='gte',
+        label='Creado desde (inclusive)'
+    )
+
+    created_before = django_filters.DateTimeFilter(
+        field_name='created_at',
+        lookup_expr='lt',
+        label='Creado hasta (exclusive)'
+    )
+
+    event_type = django_filters.MultipleChoiceFilter(
+        field_name='event_type',
+        choices=StockEvent.EVENT_TYPES,
+        label='Tipo de evento'
+    )
+
+    class Meta:
+        model = StockEvent
+        fields = ['created_after', 'created_before', 'event_type']
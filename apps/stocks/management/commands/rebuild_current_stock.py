@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.stocks.services import rebuild_current_stock
+
+
+class Command(BaseCommand):
+    """
+    Recalcula la columna materializada 'current_stock' de productos y
+    subproductos a partir de ProductStock/SubproductStock.
+    Útil tras el despliegue inicial de la columna o ante sospecha de deriva.
+    """
+    help = "Recalcula Product.current_stock y Subproduct.current_stock desde los registros de stock."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--product',
+            type=int,
+            action='append',
+            dest='product_ids',
+            help="ID de producto a recalcular (repetible). Sin este flag se recalculan todos."
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            result = rebuild_current_stock(product_ids=options.get('product_ids'))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ current_stock recalculado: {result['products']} productos, "
+            f"{result['subproducts']} subproductos."
+        ))
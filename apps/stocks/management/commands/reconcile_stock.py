@@ -0,0 +1,58 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.stocks.services import validate_and_correct_stock
+from apps.stocks.services.stocks_services import RECONCILE_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    """
+    Reconcilia el stock de los productos con subproductos contra la suma de
+    sus subproductos y muestra un reporte de la deriva encontrada.
+    """
+    help = "Reconcilia ProductStock de productos con subproductos (usar --dry-run para solo reportar)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Solo reporta la deriva, sin aplicar correcciones."
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=RECONCILE_CHUNK_SIZE,
+            help=f"Tamaño de lote para lectura y bulk_update (default {RECONCILE_CHUNK_SIZE})."
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help="Imprime el reporte completo en JSON."
+        )
+
+    def handle(self, *args, **options):
+        def progress(done, total):
+            self.stdout.write(f"  … {done}/{total} productos revisados")
+
+        report = validate_and_correct_stock(
+            dry_run=options['dry_run'],
+            chunk_size=options['chunk_size'],
+            progress=progress
+        )
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+            return
+
+        for item in report['drift']:
+            self.stdout.write(
+                f"  ⚠️ {item['product_name']} (#{item['product_id']}): "
+                f"{item['current']} → {item['expected']} ({item['difference']})"
+            )
+        action = "detectados" if report['dry_run'] else "corregidos"
+        count = len(report['drift']) if report['dry_run'] else report['corrected']
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {report['checked']} productos revisados, {count} {action}, "
+            f"{len(report['missing_stock_record'])} sin registro de stock."
+        ))
@@ -11,6 +11,7 @@ class StockEvent(BaseModel): # HEREDA DE BASEMODEL
 
     EVENT_TYPES = [
         ('ingreso', 'Ingreso'),
+        ('ingreso_inicial', 'Ingreso Inicial'),
         ('egreso_venta', 'Egreso por Venta'),
         ('egreso_corte', 'Egreso por Corte'),
         ('egreso_ajuste', 'Egreso por Ajuste'),
@@ -53,6 +54,11 @@ class StockEvent(BaseModel): # HEREDA DE BASEMODEL
         verbose_name = "Evento de Stock"
         verbose_name_plural = "Eventos de Stock"
         ordering = ['-created_at'] # Mantenemos el orden por defecto aquí también
+        indexes = [
+            # Historial por stock: filtro por FK + orden (created_at, id) sin sort
+            models.Index(fields=['product_stock', '-created_at', '-id'], name='stockevent_product_hist_idx'),
+            models.Index(fields=['subproduct_stock', '-created_at', '-id'], name='stockevent_subp_hist_idx'),
+        ]
 
     def clean(self):
         """Validaciones a nivel de modelo para el evento."""
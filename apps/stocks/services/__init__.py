@@ -5,5 +5,11 @@ from apps.stocks.services.stocks_services import (
     adjust_product_stock,
     adjust_subproduct_stock,
     dispatch_subproduct_stock_for_cut,
+    dispatch_subproducts_stock_for_cut,
     validate_and_correct_stock,
+    rebuild_current_stock,
+    bulk_adjust_stock,
+    BulkAdjustmentError,
+    InsufficientStockError,
+    InactiveStockError,
 )
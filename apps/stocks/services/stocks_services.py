@@ -2,18 +2,193 @@ from decimal import Decimal, InvalidOperation
 from django.db import transaction
 from django.core.exceptions import ValidationError
 from django.conf import settings
-from django.db.models import Sum
+from django.utils import timezone
+from django.db.models import Sum, F, Case, When, Value, DecimalField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 import logging
 
 # Importa los modelos necesarios
 from apps.products.models.product_model import Product
 from apps.products.models.subproduct_model import Subproduct
 from apps.stocks.models import ProductStock, SubproductStock, StockEvent
+from apps.products.utils.cache_helpers_products import (
+    PRODUCT_LIST_CACHE_PREFIX,
+    PRODUCT_DETAIL_CACHE_PREFIX,
+    invalidate_product_cache,
+    invalidate_products_cache,
+)
+from apps.products.utils.cache_helpers_subproducts import (
+    SUBPRODUCT_LIST_CACHE_PREFIX,
+    SUBPRODUCT_DETAIL_CACHE_PREFIX,
+    invalidate_subproduct_cache,
+)
+from apps.products.utils.redis_utils import delete_keys_by_pattern
 
 logger = logging.getLogger(__name__)
 
 User = settings.AUTH_USER_MODEL
 
+STOCK_FIELD = DecimalField(max_digits=15, decimal_places=2)
+
+
+# ========================== STOCK MATERIALIZADO (current_stock) ==========================
+
+def _sync_product_current_stock(product_id: int, quantity_change: Decimal):
+    """
+    Aplica el delta a Product.current_stock con una expresión F() (sin
+    read-modify-write). Solo aplica a productos con stock propio.
+    El UPDATE no dispara señales: la caché del producto se invalida al commit.
+    """
+    Product.objects.filter(pk=product_id, has_subproducts=False).update(
+        current_stock=F('current_stock') + quantity_change
+    )
+    transaction.on_commit(lambda: invalidate_product_cache(product_id))
+
+
+def _sync_subproduct_current_stock(subproduct: Subproduct, quantity_change: Decimal):
+    """
+    Aplica el delta a Subproduct.current_stock y, si el subproducto está activo,
+    al current_stock del producto padre (que suma el stock de sus subproductos).
+    """
+    Subproduct.objects.filter(pk=subproduct.pk).update(
+        current_stock=F('current_stock') + quantity_change
+    )
+    if subproduct.status:
+        Product.objects.filter(pk=subproduct.parent_id, has_subproducts=True).update(
+            current_stock=F('current_stock') + quantity_change
+        )
+    parent_id, subp_id = subproduct.parent_id, subproduct.pk
+    transaction.on_commit(lambda: invalidate_subproduct_cache(parent_id, subp_id))
+
+
+def _apply_current_stock_deltas(model, deltas: dict, **filters):
+    """Un único UPDATE current_stock = current_stock + delta (CASE por pk)."""
+    if not deltas:
+        return
+    model.objects.filter(pk__in=deltas, **filters).update(
+        current_stock=F('current_stock') + Case(
+            *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+            default=Value(Decimal('0.00')),
+            output_field=STOCK_FIELD
+        )
+    )
+
+
+def _invalidate_rebuilt_products(product_ids=None):
+    """Invalida la caché de los productos recalculados (todos si product_ids es None)."""
+    if product_ids is not None:
+        for product_id in product_ids:
+            invalidate_product_cache(product_id)
+        return
+    # Recalculo global (mantenimiento): un SCAN es aceptable fuera del camino de escritura
+    for prefix in (
+        PRODUCT_LIST_CACHE_PREFIX, PRODUCT_DETAIL_CACHE_PREFIX,
+        SUBPRODUCT_LIST_CACHE_PREFIX, SUBPRODUCT_DETAIL_CACHE_PREFIX,
+    ):
+        delete_keys_by_pattern(prefix)
+
+
+def rebuild_current_stock(product_ids=None) -> dict:
+    """
+    Recalcula Product.current_stock y Subproduct.current_stock a partir de los
+    registros ProductStock/SubproductStock con dos UPDATE set-based.
+    Si se pasan product_ids, limita el recálculo a esos productos y sus subproductos.
+    """
+    products = Product.objects.all()
+    subproducts = Subproduct.objects.all()
+    if product_ids is not None:
+        products = products.filter(pk__in=product_ids)
+        subproducts = subproducts.filter(parent_id__in=product_ids)
+
+    own_stock_sq = SubproductStock.objects.filter(
+        subproduct=OuterRef('pk'), status=True
+    ).values('quantity')[:1]
+    subproducts_updated = subproducts.update(
+        current_stock=Coalesce(
+            Subquery(own_stock_sq, output_field=STOCK_FIELD),
+            Decimal('0.00'),
+            output_field=STOCK_FIELD
+        )
+    )
+
+    product_stock_sq = ProductStock.objects.filter(
+        product=OuterRef('pk'), status=True
+    ).values('quantity')[:1]
+    children_stock_sq = SubproductStock.objects.filter(
+        subproduct__parent_id=OuterRef('pk'),
+        status=True,
+        subproduct__status=True
+    ).values('subproduct__parent').annotate(total=Sum('quantity')).values('total')
+    products_updated = products.update(
+        current_stock=Case(
+            When(has_subproducts=True, then=Coalesce(
+                Subquery(children_stock_sq, output_field=STOCK_FIELD),
+                Decimal('0.00'),
+                output_field=STOCK_FIELD
+            )),
+            default=Coalesce(
+                Subquery(product_stock_sq, output_field=STOCK_FIELD),
+                Decimal('0.00'),
+                output_field=STOCK_FIELD
+            ),
+            output_field=STOCK_FIELD
+        )
+    )
+
+    transaction.on_commit(lambda: _invalidate_rebuilt_products(product_ids))
+
+    logger.info(
+        f"--- Servicio: current_stock recalculado ({products_updated} productos, "
+        f"{subproducts_updated} subproductos) ---"
+    )
+    return {"products": products_updated, "subproducts": subproducts_updated}
+
+# ========================== MUTACIÓN ATÓMICA DE STOCK ==========================
+
+class InsufficientStockError(ValidationError):
+    """El UPDATE condicional no afectó filas: el stock resultante sería negativo."""
+
+
+class InactiveStockError(ValidationError):
+    """El registro de stock no existe o está dado de baja."""
+
+
+def _apply_stock_delta(stock, quantity_change: Decimal, user: User):
+    """
+    Primitiva de mutación de ProductStock/SubproductStock:
+
+        UPDATE ... SET quantity = quantity + x
+        WHERE id = ... AND status AND quantity + x >= 0
+
+    La suma y la condición se resuelven en la base (F() + filtro), así que dos
+    ajustes concurrentes no pierden actualizaciones y el bloqueo de la fila dura
+    solo lo que dura el UPDATE. Si no se afecta ninguna fila se relee el
+    registro para distinguir InactiveStockError (inexistente o dado de baja) de
+    InsufficientStockError (con el stock disponible). El ORM no expone
+    UPDATE ... RETURNING: la cantidad resultante se relee de la fila, que ya
+    está bloqueada por esta transacción.
+    """
+    now = timezone.now()
+    updated = type(stock).objects.filter(
+        pk=stock.pk, status=True, quantity__gte=-quantity_change
+    ).update(
+        quantity=F('quantity') + quantity_change,
+        modified_at=now,
+        modified_by=user,
+    )
+    current = type(stock).objects.filter(pk=stock.pk).values_list('status', 'quantity').first()
+    if current is None or not current[0]:
+        raise InactiveStockError(f"El registro de stock {stock.pk} no existe o está inactivo.")
+    stock.quantity = current[1]
+    if not updated:
+        raise InsufficientStockError(
+            f"Stock insuficiente. Disponible: {stock.quantity}, ajuste: {quantity_change}."
+        )
+    stock.modified_at = now
+    stock.modified_by = user
+    return stock
+
+
 # ========================== FUNCIONES PARA PRODUCT STOCK (Productos sin subproductos) ==========================
 
 def check_subproduct_stock(subproduct: Subproduct, quantity_needed: Decimal, location: str = None):
@@ -88,6 +263,7 @@ def initialize_product_stock(product: Product, user: User,
             created_by=user,
             notes=reason
         )
+        _sync_product_current_stock(product.pk, initial_quantity)
 
     logger.info(
         f"--- Servicio: Stock inicial creado para Producto {product.pk} ---"
@@ -111,13 +287,13 @@ def adjust_product_stock(product_stock: ProductStock, quantity_change: Decimal,
     except (InvalidOperation, TypeError):
         raise ValidationError("La cantidad del ajuste debe ser un número válido.")
 
-    if (product_stock.quantity + quantity_change) < 0:
+    try:
+        _apply_stock_delta(product_stock, quantity_change, user)
+    except InsufficientStockError:
         raise ValidationError(
             f"Ajuste inválido. Stock resultante negativo para '{product_stock.product.name}'. Disponible: {product_stock.quantity}"
         )
-
-    product_stock.quantity += quantity_change
-    product_stock.save(user=user)
+    _sync_product_current_stock(product_stock.product_id, quantity_change)
 
     StockEvent.objects.create(
         product_stock=product_stock,
@@ -157,7 +333,7 @@ def initialize_subproduct_stock(subproduct: Subproduct, user: User,
     existing_stock = SubproductStock.objects.filter(**query_params).first()
     if existing_stock:
         raise ValueError(
-            f"Ya existe stock para '{subproduct.name}'. Use ajuste de stock."
+            f"Ya existe stock para '{subproduct}'. Use ajuste de stock."
         )
 
     stock_instance = SubproductStock(
@@ -175,6 +351,7 @@ def initialize_subproduct_stock(subproduct: Subproduct, user: User,
             created_by=user,
             notes=reason
         )
+        _sync_subproduct_current_stock(subproduct, initial_quantity)
     logger.info(
         f"--- Servicio: Stock inicial creado para Subproducto {subproduct.pk} ---"
     )
@@ -197,13 +374,13 @@ def adjust_subproduct_stock(subproduct_stock: SubproductStock, quantity_change:
     except (InvalidOperation, TypeError):
         raise ValidationError("La cantidad del ajuste debe ser un número válido.")
 
-    if (subproduct_stock.quantity + quantity_change) < 0:
+    try:
+        _apply_stock_delta(subproduct_stock, quantity_change, user)
+    except InsufficientStockError:
         raise ValidationError(
-            f"Ajuste inválido. Stock resultante negativo para '{subproduct_stock.subproduct.name}'. Disponible: {subproduct_stock.quantity}"
+            f"Ajuste inválido. Stock resultante negativo para '{subproduct_stock.subproduct}'. Disponible: {subproduct_stock.quantity}"
         )
-
-    subproduct_stock.quantity += quantity_change
-    subproduct_stock.save(user=user)
+    _sync_subproduct_current_stock(subproduct_stock.subproduct, quantity_change)
 
     StockEvent.objects.create(
         product_stock=None,
@@ -237,23 +414,24 @@ def dispatch_subproduct_stock_for_cut(subproduct: Subproduct, cutting_quantity:
     if not user_performing_cut or not user_performing_cut.is_authenticated:
         raise ValueError("Se requiere un usuario válido para registrar el egreso por corte.")
     
+    # Sin select_for_update: el UPDATE condicional decide y bloquea la fila
     try:
-        stock_to_update = SubproductStock.objects.select_for_update().get(
+        stock_to_update = SubproductStock.objects.get(
             subproduct=subproduct,
             status=True
         )
     except SubproductStock.DoesNotExist:
-        raise ValidationError(f"No se encontró stock activo para '{subproduct.name}'.")
+        raise ValidationError(f"No se encontró stock activo para '{subproduct}'.")
     except SubproductStock.MultipleObjectsReturned:
-        raise ValidationError(f"Múltiples registros de stock encontrados para '{subproduct.name}'. Se requiere lógica adicional.")
-    
-    if cutting_quantity > stock_to_update.quantity:
+        raise ValidationError(f"Múltiples registros de stock encontrados para '{subproduct}'. Se requiere lógica adicional.")
+
+    try:
+        _apply_stock_delta(stock_to_update, -cutting_quantity, user_performing_cut)
+    except InsufficientStockError:
         raise ValidationError(
-            f"Stock insuficiente para corte de '{subproduct.name}'. Disponible: {stock_to_update.quantity}, Requerido: {cutting_quantity}"
+            f"Stock insuficiente para corte de '{subproduct}'. Disponible: {stock_to_update.quantity}, Requerido: {cutting_quantity}"
         )
-    
-    stock_to_update.quantity -= cutting_quantity
-    stock_to_update.save(user=user_performing_cut)
+    _sync_subproduct_current_stock(subproduct, -cutting_quantity)
     
     StockEvent.objects.create(
         product_stock=None,
@@ -269,40 +447,331 @@ def dispatch_subproduct_stock_for_cut(subproduct: Subproduct, cutting_quantity:
     return stock_to_update
 
 
-# ====================== FUNCIÓN DE VALIDACIÓN Y CORRECCIÓN GLOBAL ======================
-
-def validate_and_correct_stock():
+@transaction.atomic
+def dispatch_subproducts_stock_for_cut(items: list, order_pk: int,
+                                       user_performing_cut: User) -> list:
     """
-    Actualiza el stock del producto padre si `has_subproducts=True` con la suma de subproductos activos.
+    Versión en lote de dispatch_subproduct_stock_for_cut para una orden de corte.
+    `items` = [(subproduct, cutting_quantity)]; un mismo subproducto puede
+    repetirse y sus cantidades se acumulan.
+
+    - Bloquea todos los SubproductStock con un único select_for_update
+      (ids de subproducto ordenados, filas en orden de pk): dos órdenes que
+      comparten bobinas toman los bloqueos en el mismo orden y no se bloquean
+      mutuamente.
+    - Valida en memoria; si falta stock en algún ítem no se descuenta nada.
+    - Escribe con bulk_update + bulk_create de StockEvent y actualiza
+      current_stock con un UPDATE por tabla: cantidad de queries constante.
     """
-    for product in Product.objects.filter(has_subproducts=True):
-        total_subproduct_quantity = Decimal('0.00')
-        
+    if not user_performing_cut or not user_performing_cut.is_authenticated:
+        raise ValueError("Se requiere un usuario válido para registrar el egreso por corte.")
+    if not items:
+        return []
 
-        for subproduct in product.subproducts.all():
-            total_subproduct_quantity += Decimal(
-                subproduct.initial_stock_quantity or 0
-            )
-            active_total = SubproductStock.objects.filter(
-                subproduct=subproduct,
-                status=True
-            ).aggregate(total=Sum('quantity'))['total']
-            total_subproduct_quantity += Decimal(active_total or 0)
+    # Misma validación que la versión unitaria: una cantidad <= 0 sumaría stock como egreso_corte
+    normalized = []
+    for subproduct, cutting_quantity in items:
         try:
-            stock_record = product.stock_record
-        except ProductStock.DoesNotExist:
-            logger.info(
-                f"No existe registro de stock para el producto {product.name}"
+            cutting_quantity = Decimal(str(cutting_quantity))
+            if not cutting_quantity.is_finite():
+                raise InvalidOperation
+        except (InvalidOperation, TypeError):
+            raise ValidationError("La cantidad a cortar debe ser un número válido.")
+        if cutting_quantity <= 0:
+            raise ValidationError("La cantidad a cortar debe ser positiva.")
+        normalized.append((subproduct, cutting_quantity))
+    items = normalized
+
+    subproduct_ids = sorted({subproduct.pk for subproduct, _ in items})
+    stocks = {
+        stock.subproduct_id: stock
+        for stock in SubproductStock.objects.select_for_update(of=('self',))
+        .select_related('subproduct').filter(subproduct_id__in=subproduct_ids, status=True).order_by('pk')
+    }
+
+    events, subproduct_deltas, parent_deltas = [], {}, {}
+    for subproduct, cutting_quantity in items:
+        stock = stocks.get(subproduct.pk)
+        if stock is None:
+            raise ValidationError(f"No se encontró stock activo para '{subproduct}'.")
+        if cutting_quantity > stock.quantity:
+            raise ValidationError(
+                f"Stock insuficiente para corte de '{subproduct}'. Disponible: {stock.quantity}, Requerido: {cutting_quantity}"
             )
+        stock.quantity -= cutting_quantity
+        subproduct_deltas[subproduct.pk] = subproduct_deltas.get(subproduct.pk, Decimal('0')) - cutting_quantity
+        if stock.subproduct.status:
+            parent_id = stock.subproduct.parent_id
+            parent_deltas[parent_id] = parent_deltas.get(parent_id, Decimal('0')) - cutting_quantity
+        events.append(StockEvent(
+            product_stock=None,
+            subproduct_stock=stock,
+            quantity_change=-cutting_quantity,
+            event_type='egreso_corte',
+            created_by=user_performing_cut,
+            notes=f"Egreso por Orden de Corte #{order_pk}"
+        ))
+
+    now = timezone.now()
+    for stock in stocks.values():
+        stock.modified_at = now
+        stock.modified_by = user_performing_cut
+    SubproductStock.objects.bulk_update(list(stocks.values()), ['quantity', 'modified_at', 'modified_by'])
+    StockEvent.objects.bulk_create(events)
+
+    _apply_current_stock_deltas(Subproduct, subproduct_deltas)
+    _apply_current_stock_deltas(Product, parent_deltas, has_subproducts=True)
+
+    affected_products = sorted({stock.subproduct.parent_id for stock in stocks.values()})
+    transaction.on_commit(lambda: invalidate_products_cache(affected_products))
+
+    logger.info(
+        f"--- Servicio: Stock descontado por corte para {len(stocks)} subproductos (Orden #{order_pk}) ---"
+    )
+    return list(stocks.values())
+
+
+# ========================== AJUSTES DE STOCK EN LOTE ==========================
+
+MAX_BULK_ADJUSTMENTS = 1000
+
+
+class BulkAdjustmentError(ValidationError):
+    """Ajustes en lote rechazados: `errors` = [{'index', 'detail'}] (no se aplica ninguno)."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__([f"#{e['index']}: {e['detail']}" for e in errors])
+
+
+@transaction.atomic
+def bulk_adjust_stock(adjustments: list, user: User, default_reason: str = None) -> dict:
+    """
+    Aplica muchos ajustes manuales en una sola transacción (conteos físicos).
+    Cada ajuste: {'product_id' | 'subproduct_id', 'quantity_change', 'reason'?}.
+
+    - Bloquea todos los registros de stock afectados con un select_for_update
+      por tabla, en orden de pk (orden de bloqueo estable entre requests).
+    - Valida en memoria los stocks resultantes (los ajustes repetidos sobre el
+      mismo registro se acumulan en orden); si alguno falla no se aplica nada.
+    - Escribe con bulk_update, inserta los StockEvent con bulk_create y
+      actualiza current_stock con un UPDATE por tabla.
+    - Invalida la caché de los productos afectados una sola vez, al commit.
+    """
+    if not adjustments:
+        raise BulkAdjustmentError([{"index": 0, "detail": "No se enviaron ajustes."}])
+    if len(adjustments) > MAX_BULK_ADJUSTMENTS:
+        raise BulkAdjustmentError([{"index": 0, "detail": f"Máximo {MAX_BULK_ADJUSTMENTS} ajustes por lote."}])
+
+    product_ids = sorted({a['product_id'] for a in adjustments if a.get('product_id')})
+    subproduct_ids = sorted({a['subproduct_id'] for a in adjustments if a.get('subproduct_id')})
+
+    product_stocks = {
+        stock.product_id: stock
+        for stock in ProductStock.objects.select_for_update(of=('self',))
+        .select_related('product').filter(product_id__in=product_ids, status=True).order_by('pk')
+    } if product_ids else {}
+    subproduct_stocks = {
+        stock.subproduct_id: stock
+        for stock in SubproductStock.objects.select_for_update(of=('self',))
+        .select_related('subproduct').filter(subproduct_id__in=subproduct_ids, status=True).order_by('pk')
+    } if subproduct_ids else {}
+
+    errors, events, touched = [], [], {}
+    product_deltas, subproduct_deltas, parent_deltas = {}, {}, {}
+    for index, adjustment in enumerate(adjustments):
+        try:
+            change = Decimal(adjustment.get('quantity_change'))
+        except (InvalidOperation, TypeError):
+            errors.append({"index": index, "detail": "La cantidad del ajuste debe ser un número válido."})
             continue
-        
-        if stock_record.quantity != total_subproduct_quantity:
-            logger.info(f"Corrigiendo stock para el producto {product.name}")
-            stock_record.quantity = total_subproduct_quantity
-            stock_record.save()
-
-            print(f"Stock del producto {product.name} actualizado a {stock_record.quantity}")
-            
-            logger.info(
-                f"Stock del producto {product.name} actualizado a {stock_record.quantity}"
-            )
+        if change == 0:
+            errors.append({"index": index, "detail": "La cantidad del ajuste no puede ser cero."})
+            continue
+
+        if adjustment.get('product_id'):
+            stock = product_stocks.get(adjustment['product_id'])
+            if stock is None or not stock.product.status:
+                errors.append({"index": index, "detail": f"Producto {adjustment['product_id']} sin stock activo."})
+                continue
+            if stock.product.has_subproducts:
+                errors.append({"index": index, "detail": "No se puede ajustar stock de un producto con subproductos."})
+                continue
+        else:
+            stock = subproduct_stocks.get(adjustment.get('subproduct_id'))
+            if stock is None or not stock.subproduct.status:
+                errors.append({"index": index, "detail": f"Subproducto {adjustment.get('subproduct_id')} sin stock activo."})
+                continue
+
+        if stock.quantity + change < 0:
+            errors.append({
+                "index": index,
+                "detail": f"Stock resultante negativo. Disponible: {stock.quantity}, ajuste: {change}.",
+            })
+            continue
+        stock.quantity += change
+        if isinstance(stock, ProductStock):
+            product_deltas[stock.product_id] = product_deltas.get(stock.product_id, Decimal('0')) + change
+        else:
+            subproduct = stock.subproduct
+            subproduct_deltas[subproduct.pk] = subproduct_deltas.get(subproduct.pk, Decimal('0')) + change
+            parent_deltas[subproduct.parent_id] = parent_deltas.get(subproduct.parent_id, Decimal('0')) + change
+        touched[(type(stock), stock.pk)] = stock
+        events.append(StockEvent(
+            product_stock=stock if isinstance(stock, ProductStock) else None,
+            subproduct_stock=stock if isinstance(stock, SubproductStock) else None,
+            quantity_change=change,
+            event_type='ingreso_ajuste' if change > 0 else 'egreso_ajuste',
+            created_by=user,
+            notes=adjustment.get('reason') or default_reason,
+        ))
+
+    if errors:
+        raise BulkAdjustmentError(errors)
+
+    now = timezone.now()
+    for stock in touched.values():
+        stock.modified_at = now
+        stock.modified_by = user
+    for model in (ProductStock, SubproductStock):
+        rows = [stock for (stock_model, _), stock in touched.items() if stock_model is model]
+        if rows:
+            model.objects.bulk_update(rows, ['quantity', 'modified_at', 'modified_by'])
+    StockEvent.objects.bulk_create(events)
+
+    # current_stock: mismas reglas que _sync_product/_sync_subproduct_current_stock
+    _apply_current_stock_deltas(Subproduct, subproduct_deltas)
+    _apply_current_stock_deltas(Product, product_deltas, has_subproducts=False)
+    _apply_current_stock_deltas(Product, parent_deltas, has_subproducts=True)
+
+    affected_products = sorted({*product_deltas, *parent_deltas})
+    transaction.on_commit(lambda: invalidate_products_cache(affected_products))
+
+    logger.info(
+        f"--- Servicio: {len(events)} ajustes de stock en lote "
+        f"({len(touched)} registros, {len(affected_products)} productos) ---"
+    )
+    return {
+        "adjusted": len(events),
+        "stocks": [
+            {
+                "product_id": stock.product_id if isinstance(stock, ProductStock) else None,
+                "subproduct_id": stock.subproduct_id if isinstance(stock, SubproductStock) else None,
+                "quantity": stock.quantity,
+            }
+            for stock in touched.values()
+        ],
+    }
+
+
+# ====================== FUNCIÓN DE VALIDACIÓN Y CORRECCIÓN GLOBAL ======================
+
+RECONCILE_CHUNK_SIZE = 500
+
+
+def _expected_parent_stock_queryset():
+    """
+    Una sola query agrupada: por cada producto con subproductos devuelve el
+    stock esperado (suma de 'initial_stock_quantity' de sus subproductos +
+    stock activo de SubproductStock) junto al registro ProductStock actual.
+    """
+    initial_sq = Subproduct.objects.filter(
+        parent_id=OuterRef('pk')
+    ).values('parent_id').annotate(total=Sum('initial_stock_quantity')).values('total')
+    active_sq = SubproductStock.objects.filter(
+        subproduct__parent_id=OuterRef('pk'), status=True
+    ).values('subproduct__parent_id').annotate(total=Sum('quantity')).values('total')
+
+    return (
+        Product.objects
+        .filter(has_subproducts=True)
+        .annotate(
+            expected_initial=Coalesce(
+                Subquery(initial_sq, output_field=STOCK_FIELD), Decimal('0.00'),
+                output_field=STOCK_FIELD
+            ),
+            expected_active=Coalesce(
+                Subquery(active_sq, output_field=STOCK_FIELD), Decimal('0.00'),
+                output_field=STOCK_FIELD
+            ),
+        )
+        .values(
+            'pk', 'name', 'stock_record__pk', 'stock_record__quantity',
+            'expected_initial', 'expected_active'
+        )
+        .order_by('pk')
+    )
+
+
+def validate_and_correct_stock(dry_run: bool = False,
+                               chunk_size: int = RECONCILE_CHUNK_SIZE,
+                               progress=None) -> dict:
+    """
+    Motor de reconciliación: actualiza el stock (ProductStock) de cada producto
+    con `has_subproducts=True` con la suma de sus subproductos.
+
+    - Calcula los totales esperados con una query agrupada (ver
+      _expected_parent_stock_queryset) y los compara en memoria.
+    - Aplica las correcciones con bulk_update en lotes de `chunk_size`.
+    - Con `dry_run=True` solo reporta la deriva, sin escribir.
+    - `progress(procesados, total)` se invoca tras cada lote, si se indica.
+
+    Devuelve un reporte estructurado con la deriva encontrada.
+    """
+    rows = _expected_parent_stock_queryset()
+    total = rows.count()
+    report = {
+        "dry_run": dry_run,
+        "checked": 0,
+        "corrected": 0,
+        "missing_stock_record": [],
+        "drift": [],
+    }
+    pending = []
+    now = timezone.now()
+
+    def flush():
+        if pending and not dry_run:
+            with transaction.atomic():
+                ProductStock.objects.bulk_update(
+                    pending, ['quantity', 'modified_at'], batch_size=chunk_size
+                )
+            report["corrected"] += len(pending)
+        pending.clear()
+
+    for row in rows.iterator(chunk_size=chunk_size):
+        report["checked"] += 1
+        expected = row['expected_initial'] + row['expected_active']
+
+        if row['stock_record__pk'] is None:
+            logger.info(f"No existe registro de stock para el producto {row['name']}")
+            report["missing_stock_record"].append(row['pk'])
+        elif row['stock_record__quantity'] != expected:
+            current = row['stock_record__quantity']
+            report["drift"].append({
+                "product_id": row['pk'],
+                "product_name": row['name'],
+                "current": str(current),
+                "expected": str(expected),
+                "difference": str(expected - current),
+            })
+            pending.append(ProductStock(
+                pk=row['stock_record__pk'], quantity=expected, modified_at=now
+            ))
+            if len(pending) >= chunk_size:
+                flush()
+
+        if progress and report["checked"] % chunk_size == 0:
+            progress(report["checked"], total)
+
+    flush()
+    if progress and report["checked"] % chunk_size:
+        progress(report["checked"], total)
+
+    logger.info(
+        f"🔁 Reconciliación de stock{' (dry-run)' if dry_run else ''}: "
+        f"{report['checked']} productos revisados, {len(report['drift'])} con deriva, "
+        f"{report['corrected']} corregidos, "
+        f"{len(report['missing_stock_record'])} sin registro de stock."
+    )
+    return report
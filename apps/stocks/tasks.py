@@ -0,0 +1,22 @@
+from celery import shared_task
+import logging
+
+from apps.stocks.services import validate_and_correct_stock
+
+logger = logging.getLogger(__name__)
+
+@shared_task
+def reconcile_parent_stock(dry_run: bool = False):
+    """
+    Task programada (Celery beat) que reconcilia el stock de los productos con
+    subproductos. Devuelve un resumen serializable del reporte.
+    """
+    report = validate_and_correct_stock(dry_run=dry_run)
+    logger.info(f"🌙 Reconciliación nocturna finalizada: {len(report['drift'])} productos con deriva")
+    return {
+        "dry_run": report["dry_run"],
+        "checked": report["checked"],
+        "corrected": report["corrected"],
+        "drift_count": len(report["drift"]),
+        "missing_stock_record": len(report["missing_stock_record"]),
+    }
@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.tests.factories import create_user, create_category, create_type, create_product
+from apps.products.api.repositories.subproduct_repository import SubproductRepository
+from apps.stocks.models import StockEvent, ProductStock, SubproductStock
+from apps.stocks.services import initialize_product_stock, initialize_subproduct_stock
+
+URL = '/api/v1/stocks/adjustments/bulk/'
+
+
+class BulkStockAdjustmentTestCase(TestCase):
+    def setUp(self):
+        self.user = create_user(username='bulk_user', email='bulk@example.com')
+        self.user.is_staff = True
+        self.user.save()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        category = create_category(name='CatBulk', user=self.user)
+        type_obj = create_type(category, name='TypeBulk', user=self.user)
+        self.product = create_product(category, type_obj, user=self.user, name='Simple')
+        initialize_product_stock(self.product, self.user, initial_quantity=Decimal('10'))
+        self.parent = create_product(category, type_obj, user=self.user, name='Parent')
+        self.parent.has_subproducts = True
+        self.parent.save(user=self.user)
+        self.subp = SubproductRepository.create(self.user, self.parent, number_coil=1)
+        initialize_subproduct_stock(self.subp, self.user, initial_quantity=Decimal('50'))
+        self.parent.refresh_from_db()
+        self.parent_stock_before = self.parent.current_stock
+
+    def test_applies_all_adjustments_and_syncs_current_stock(self):
+        response = self.client.post(URL, {
+            'reason': 'Conteo físico',
+            'adjustments': [
+                {'product_id': self.product.pk, 'quantity_change': '-3'},
+                {'subproduct_id': self.subp.pk, 'quantity_change': '5.5'},
+                {'product_id': self.product.pk, 'quantity_change': '1', 'reason': 'Hallazgo'},
+            ],
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['adjusted'], 3)
+        self.assertEqual(ProductStock.objects.get(product=self.product).quantity, Decimal('8'))
+        self.assertEqual(SubproductStock.objects.get(subproduct=self.subp).quantity, Decimal('55.5'))
+        self.product.refresh_from_db()
+        self.subp.refresh_from_db()
+        self.parent.refresh_from_db()
+        self.assertEqual(self.product.current_stock, Decimal('8'))
+        self.assertEqual(self.subp.current_stock, Decimal('55.5'))
+        self.assertEqual(self.parent.current_stock, self.parent_stock_before + Decimal('5.5'))
+        notes = list(
+            StockEvent.objects.filter(event_type__endswith='_ajuste').order_by('pk').values_list('notes', flat=True)
+        )
+        self.assertEqual(notes, ['Conteo físico', 'Conteo físico', 'Hallazgo'])
+
+    def test_any_invalid_adjustment_rolls_back_the_batch(self):
+        events_before = StockEvent.objects.count()
+        response = self.client.post(URL, {
+            'reason': 'Conteo físico',
+            'adjustments': [
+                {'subproduct_id': self.subp.pk, 'quantity_change': '-5'},
+                {'product_id': self.product.pk, 'quantity_change': '-11'},
+                {'product_id': self.parent.pk, 'quantity_change': '1'},
+            ],
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertEqual(SubproductStock.objects.get(subproduct=self.subp).quantity, Decimal('50'))
+        self.assertEqual(ProductStock.objects.get(product=self.product).quantity, Decimal('10'))
+        self.assertEqual(StockEvent.objects.count(), events_before)
+
+    def test_requires_admin_and_one_target(self):
+        response = self.client.post(URL, {
+            'reason': 'x', 'adjustments': [{'product_id': self.product.pk, 'subproduct_id': self.subp.pk, 'quantity_change': '1'}],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.user.is_staff = False
+        self.user.save()
+        response = self.client.post(URL, {'reason': 'x', 'adjustments': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,118 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.tests.factories import create_user, create_category, create_type, create_product
+from apps.products.api.repositories.subproduct_repository import SubproductRepository
+from apps.products.models import Product, Subproduct
+from apps.stocks.models import ProductStock, SubproductStock
+from apps.stocks.services import (
+    initialize_product_stock,
+    adjust_product_stock,
+    initialize_subproduct_stock,
+    adjust_subproduct_stock,
+    validate_and_correct_stock,
+    InactiveStockError,
+)
+
+
+class CurrentStockColumnTestCase(TestCase):
+    def setUp(self):
+        self.user = create_user(username='cs_user', email='cs@example.com')
+        category = create_category(name='CatCS', user=self.user)
+        type_obj = create_type(category, name='TypeCS', user=self.user)
+        self.simple = create_product(category, type_obj, user=self.user, name='Simple')
+        self.parent = create_product(category, type_obj, user=self.user, name='Parent')
+        self.parent.has_subproducts = True
+        self.parent.save(user=self.user)
+
+    def test_services_keep_column_in_sync(self):
+        initialize_product_stock(self.simple, self.user, initial_quantity=Decimal('10'))
+        adjust_product_stock(
+            ProductStock.objects.get(product=self.simple), Decimal('-4'), 'venta', self.user
+        )
+        subp = SubproductRepository.create(self.user, self.parent, number_coil=1)
+        initialize_subproduct_stock(subp, self.user, initial_quantity=Decimal('7'))
+        adjust_subproduct_stock(
+            SubproductStock.objects.get(subproduct=subp), Decimal('3'), 'ingreso', self.user
+        )
+
+        self.assertEqual(Product.objects.get(pk=self.simple.pk).current_stock, Decimal('6'))
+        self.assertEqual(Subproduct.objects.get(pk=subp.pk).current_stock, Decimal('10'))
+        self.assertEqual(Product.objects.get(pk=self.parent.pk).current_stock, Decimal('10'))
+
+    def test_stale_instance_save_does_not_overwrite_column(self):
+        stale = Product.objects.get(pk=self.simple.pk)
+        initialize_product_stock(self.simple, self.user, initial_quantity=Decimal('5'))
+        stale.name = 'Renombrado'
+        stale.save(user=self.user)
+        self.assertEqual(Product.objects.get(pk=self.simple.pk).current_stock, Decimal('5'))
+
+    def test_adjustments_on_stale_instances_do_not_lose_updates(self):
+        initialize_product_stock(self.simple, self.user, initial_quantity=Decimal('10'))
+        first = ProductStock.objects.get(product=self.simple)
+        second = ProductStock.objects.get(product=self.simple)
+        adjust_product_stock(first, Decimal('-6'), 'venta', self.user)
+        adjust_product_stock(second, Decimal('-3'), 'venta', self.user)
+        self.assertEqual(second.quantity, Decimal('1'))
+
+        stale = ProductStock.objects.get(product=self.simple)
+        stale.quantity = Decimal('100')
+        with self.assertRaises(ValidationError):
+            adjust_product_stock(stale, Decimal('-2'), 'venta', self.user)
+        self.assertEqual(ProductStock.objects.get(product=self.simple).quantity, Decimal('1'))
+        self.assertEqual(Product.objects.get(pk=self.simple.pk).current_stock, Decimal('1'))
+
+    def test_adjusting_inactive_stock_reports_inactive_not_negative(self):
+        stock = initialize_product_stock(self.simple, self.user, initial_quantity=Decimal('10'))
+        ProductStock.objects.filter(pk=stock.pk).update(status=False)
+        with self.assertRaises(InactiveStockError):
+            adjust_product_stock(stock, Decimal('-2'), 'venta', self.user)
+        self.assertEqual(ProductStock.objects.get(pk=stock.pk).quantity, Decimal('10'))
+
+    def test_rebuild_command_repairs_drift(self):
+        initialize_product_stock(self.simple, self.user, initial_quantity=Decimal('8'))
+        Product.objects.filter(pk=self.simple.pk).update(current_stock=Decimal('0'))
+        call_command('rebuild_current_stock', stdout=StringIO())
+        self.assertEqual(Product.objects.get(pk=self.simple.pk).current_stock, Decimal('8'))
+
+
+class StockReconciliationTestCase(TestCase):
+    def setUp(self):
+        self.user = create_user(username='rec_user', email='rec@example.com')
+        category = create_category(name='CatRec', user=self.user)
+        type_obj = create_type(category, name='TypeRec', user=self.user)
+        self.parents = []
+        for i in range(3):
+            parent = create_product(category, type_obj, user=self.user, name=f'Rec{i}')
+            parent.has_subproducts = True
+            parent.save(user=self.user)
+            ProductStock.objects.create(product=parent, quantity=Decimal('0'), created_by=self.user)
+            for coil in range(2):
+                subp = SubproductRepository.create(self.user, parent, number_coil=coil + 1)
+                initialize_subproduct_stock(subp, self.user, initial_quantity=Decimal('4'))
+            self.parents.append(parent)
+        # El primero ya está conciliado
+        ProductStock.objects.filter(product=self.parents[0]).update(quantity=Decimal('8'))
+
+    def test_dry_run_reports_without_writing(self):
+        progress = []
+        report = validate_and_correct_stock(
+            dry_run=True, chunk_size=2, progress=lambda done, total: progress.append((done, total))
+        )
+        self.assertEqual(progress, [(2, 3), (3, 3)])
+        self.assertEqual(report['checked'], 3)
+        self.assertEqual(len(report['drift']), 2)
+        self.assertEqual(report['corrected'], 0)
+        self.assertEqual(ProductStock.objects.get(product=self.parents[1]).quantity, Decimal('0'))
+
+    def test_corrects_with_constant_queries(self):
+        # count + query agrupada + un bulk_update (savepoint, UPDATE, release)
+        with self.assertNumQueries(5):
+            report = validate_and_correct_stock()
+        self.assertEqual(report['corrected'], 2)
+        for parent in self.parents:
+            self.assertEqual(ProductStock.objects.get(product=parent).quantity, Decimal('8'))
@@ -0,0 +1,70 @@
+import json
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.tests.factories import create_user, create_category, create_type, create_product
+from apps.products.api.repositories.subproduct_repository import SubproductRepository
+from apps.stocks.models import StockEvent, SubproductStock
+from apps.stocks.services import initialize_subproduct_stock, adjust_subproduct_stock
+
+
+class StockEventHistoryTestCase(TestCase):
+    def setUp(self):
+        self.user = create_user(username='hist_user', email='hist@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        category = create_category(name='CatHist', user=self.user)
+        type_obj = create_type(category, name='TypeHist', user=self.user)
+        self.parent = create_product(category, type_obj, user=self.user, name='Parent')
+        self.parent.has_subproducts = True
+        self.parent.save(user=self.user)
+        self.subp = SubproductRepository.create(self.user, self.parent, number_coil=1)
+        initialize_subproduct_stock(self.subp, self.user, initial_quantity=Decimal('50'))
+        stock = SubproductStock.objects.get(subproduct=self.subp)
+        for _ in range(4):
+            adjust_subproduct_stock(stock, Decimal('-2'), 'Merma', self.user)
+        self.url = (
+            f"/api/v1/stocks/products/{self.parent.pk}/subproducts/{self.subp.pk}/stock/events/"
+        )
+        self.total = StockEvent.objects.filter(subproduct_stock=stock).count()
+
+    def test_history_is_paginated(self):
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], self.total)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        def count(page_size):
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(self.url, {'page_size': page_size})
+            return len(ctx.captured_queries)
+        self.assertEqual(count(1), count(5))
+
+    def test_filters_by_event_type_and_date(self):
+        response = self.client.get(self.url, {'event_type': 'egreso_ajuste'})
+        self.assertEqual(response.data['count'], 4)
+        response = self.client.get(self.url, {'created_after': '2999-01-01'})
+        self.assertEqual(response.data['count'], 0)
+        response = self.client.get(self.url, {'event_type': 'ingreso_inicial'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['quantity_change'], '50.00')
+        response = self.client.get(self.url, {'event_type': 'no_existe'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_stream_returns_ndjson(self):
+        response = self.client.get(self.url, {'stream': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), self.total)
+        first = json.loads(lines[0])
+        self.assertEqual(first['event_type'], 'egreso_ajuste')
+        self.assertEqual(first['quantity_change'], '-2.00')
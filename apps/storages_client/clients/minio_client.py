@@ -1,11 +1,85 @@
+"""
+Cliente S3/MinIO compartido por proceso.
+
+Construir un cliente boto3 cuesta decenas de ms (carga de modelos JSON de
+botocore y resolución de endpoints), así que se crea una sola vez, de forma
+perezosa, y se reutiliza: los clientes boto3 son thread-safe y mantienen su
+propio pool de conexiones HTTP.
+
+Fork-safety: el pool de conexiones no debe compartirse entre procesos. Tras un
+fork (workers de gunicorn con preload, prefork de Celery) el hijo descarta el
+cliente heredado y crea uno propio en el primer uso.
+"""
+import os
+import threading
+
 import boto3
+from botocore.config import Config
 from django.conf import settings
 
-def get_minio_client():
-    return boto3.client(
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+
+
+def _build_config() -> Config:
+    return Config(
+        max_pool_connections=getattr(settings, "AWS_S3_MAX_POOL_CONNECTIONS", 32),
+        connect_timeout=getattr(settings, "AWS_S3_CONNECT_TIMEOUT", 5),
+        read_timeout=getattr(settings, "AWS_S3_READ_TIMEOUT", 30),
+        retries={
+            "max_attempts": getattr(settings, "AWS_S3_MAX_ATTEMPTS", 3),
+            "mode": "standard",
+        },
+        signature_version=getattr(settings, "AWS_S3_SIGNATURE_VERSION", "s3v4"),
+        s3={"addressing_style": getattr(settings, "AWS_S3_ADDRESSING_STYLE", "path")},
+    )
+
+
+def create_minio_client():
+    """Crea un cliente nuevo (sin cachear). Usar get_minio_client() en el código."""
+    # Sesión propia: la sesión por defecto de boto3 no es thread-safe
+    session = boto3.session.Session()
+    return session.client(
         "s3",
-        endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_S3_REGION_NAME,
+        endpoint_url=getattr(settings, "AWS_S3_ENDPOINT_URL", None),
+        aws_access_key_id=getattr(settings, "AWS_ACCESS_KEY_ID", None),
+        aws_secret_access_key=getattr(settings, "AWS_SECRET_ACCESS_KEY", None),
+        region_name=getattr(settings, "AWS_S3_REGION_NAME", None),
+        verify=getattr(settings, "AWS_S3_VERIFY", None),
+        config=_build_config(),
     )
+
+
+def get_minio_client():
+    """Devuelve el cliente S3 del proceso actual, creándolo en el primer uso."""
+    global _client, _client_pid
+    pid = os.getpid()
+    client = _client
+    if client is not None and _client_pid == pid:
+        return client
+    with _lock:
+        if _client is None or _client_pid != pid:
+            _client = create_minio_client()
+            _client_pid = pid
+        return _client
+
+
+def reset():
+    """Descarta el cliente cacheado (tests o cambio de settings en caliente)."""
+    global _client, _client_pid
+    with _lock:
+        _client = None
+        _client_pid = None
+
+
+def _reset_after_fork():
+    # El lock pudo quedar tomado por otro hilo del padre al momento del fork
+    global _lock, _client, _client_pid
+    _lock = threading.Lock()
+    _client = None
+    _client_pid = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
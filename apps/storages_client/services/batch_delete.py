@@ -0,0 +1,57 @@
+"""
+Borrado en lote de objetos del bucket y listado paginado por prefijo.
+
+DeleteObjects acepta hasta 1.000 keys por llamada: borrar N archivos cuesta
+ceil(N / 1000) requests en lugar de N. Lo usan las tareas de limpieza en
+segundo plano (archivos de productos dados de baja, imágenes de perfil,
+barrido de huérfanos).
+"""
+import logging
+from typing import Iterable, Iterator, Tuple
+
+from apps.storages_client.clients.minio_client import get_minio_client
+from apps.storages_client.services.presigned_cache import forget_presigned_urls
+
+logger = logging.getLogger(__name__)
+
+DELETE_OBJECTS_MAX_KEYS = 1000
+
+
+def delete_objects_batched(bucket: str, keys: Iterable[str]) -> dict:
+    """
+    Borra `keys` de `bucket` en lotes de hasta 1.000 (DeleteObjects, modo Quiet).
+    Devuelve {"deleted": n, "errors": [{"key", "code", "message"}]}.
+    Las keys inexistentes cuentan como borradas (S3 es idempotente).
+    """
+    keys = [k for k in dict.fromkeys(keys) if k]
+    s3 = get_minio_client()
+    deleted, errors = 0, []
+
+    for start in range(0, len(keys), DELETE_OBJECTS_MAX_KEYS):
+        chunk = keys[start:start + DELETE_OBJECTS_MAX_KEYS]
+        response = s3.delete_objects(
+            Bucket=bucket,
+            Delete={"Objects": [{"Key": k} for k in chunk], "Quiet": True},
+        )
+        # En modo Quiet solo vuelven los errores
+        failed = {
+            err["Key"]: {"key": err["Key"], "code": err.get("Code"), "message": err.get("Message")}
+            for err in response.get("Errors", [])
+        }
+        errors.extend(failed.values())
+        removed = [k for k in chunk if k not in failed]
+        deleted += len(removed)
+        forget_presigned_urls(bucket, removed)
+
+    if errors:
+        logger.error(f"❌ {len(errors)} objetos no se pudieron borrar de {bucket}: {errors[:5]}")
+    logger.info(f"🗑️ {deleted} objetos borrados de {bucket}")
+    return {"deleted": deleted, "errors": errors}
+
+
+def iter_objects(bucket: str, prefix: str = "") -> Iterator[Tuple[str, object]]:
+    """Recorre (key, last_modified) bajo `prefix` con el paginador de ListObjectsV2."""
+    paginator = get_minio_client().get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            yield obj["Key"], obj["LastModified"]
@@ -0,0 +1,43 @@
+"""
+Etapa de subida concurrente para endpoints multi-archivo.
+
+Las transferencias a S3/MinIO son I/O puro: se ejecutan en un pool de hilos
+acotado (el cliente boto3 compartido es thread-safe) y se recogen los
+resultados y errores por archivo, en el orden de entrada. La persistencia de
+las filas queda a cargo del llamador (un solo bulk_create).
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UPLOAD_MAX_WORKERS = 8
+
+
+def upload_files_concurrently(files, upload_func: Callable, max_workers: int = None) -> Tuple[List[dict], List[dict]]:
+    """
+    Ejecuta `upload_func(file)` para cada archivo en un pool de hilos.
+    Devuelve (subidos, errores):
+    - subidos: resultados de upload_func (dicts con key/url/name/mimeType).
+    - errores: [{nombre_archivo: mensaje}], mismo formato que las vistas.
+    """
+    files = list(files)
+    if not files:
+        return [], []
+
+    limit = max_workers or getattr(settings, "STORAGE_UPLOAD_MAX_WORKERS", DEFAULT_UPLOAD_MAX_WORKERS)
+    workers = max(1, min(limit, len(files)))
+
+    uploaded, errors = [], []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-upload") as pool:
+        futures = [(f, pool.submit(upload_func, f)) for f in files]
+        for f, future in futures:
+            try:
+                uploaded.append(future.result())
+            except Exception as e:
+                logger.exception(f"❌ Error subiendo archivo {f.name}: {e}")
+                errors.append({f.name: str(e)})
+    return uploaded, errors
@@ -0,0 +1,24 @@
+"""
+Hash de contenido (SHA-256) de archivos subidos.
+
+Se calcula leyendo por bloques, sin cargar el archivo completo en memoria, y
+deja el puntero al inicio para que la subida posterior lea desde cero.
+"""
+import hashlib
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def compute_sha256(fileobj, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Devuelve el SHA-256 hexadecimal de `fileobj` (UploadedFile o file-like)."""
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    if hasattr(fileobj, "chunks"):
+        # UploadedFile de Django: en memoria o archivo temporal en disco
+        for chunk in fileobj.chunks(chunk_size):
+            digest.update(chunk)
+    else:
+        for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+            digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
@@ -0,0 +1,293 @@
+"""
+Proxy de descarga de archivos del bucket con soporte de Range y caché en disco.
+
+Alternativa a redirigir a la URL presignada para clientes que no llegan al
+endpoint público de MinIO. Los bytes pasan por el worker en bloques
+(StreamingHttpResponse), nunca el archivo completo en memoria.
+
+- Metadatos (ETag, tamaño, tipo) del HEAD: cacheados en la caché de Django
+  por STORAGE_PROXY_METADATA_TTL segundos.
+- Contenido: LRU en disco acotado por bytes (STORAGE_PROXY_CACHE_MAX_BYTES),
+  con clave (key, ETag). Un objeto que cambia en el bucket cambia de ETag y
+  no reutiliza la copia vieja. Solo se cachean objetos de hasta
+  STORAGE_PROXY_CACHE_MAX_OBJECT_BYTES; los más grandes se sirven directo
+  desde S3 pasando el Range a get_object.
+- Un miss nunca demora el primer byte: un pedido completo se envía mientras
+  se escribe en la caché; un pedido con Range va directo a S3 con ese Range
+  y no llena la caché (la llena el próximo pedido completo).
+- Un hit abre el archivo antes de devolver la respuesta: un evict()
+  concurrente borra la entrada pero el descriptor abierto sigue leyendo.
+"""
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+
+from apps.storages_client.clients.minio_client import get_minio_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_CACHE_MAX_OBJECT_BYTES = 50 * 1024 * 1024
+DEFAULT_METADATA_TTL = 300
+METADATA_CACHE_PREFIX = "file_proxy_meta"
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """El Range pedido no se solapa con el archivo (HTTP 416)."""
+
+
+def parse_range(header: str, size: int):
+    """
+    Interpreta un header Range de un solo rango. Devuelve (inicio, fin) inclusivos,
+    o None si no hay Range o no se soporta (varios rangos): se sirve completo.
+    Lanza RangeNotSatisfiable si el rango queda fuera del archivo.
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-N: los últimos N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable(header)
+    return start, end
+
+
+class DiskLRUCache:
+    """
+    Caché de archivos en disco con desalojo LRU por tamaño total.
+    El sistema de archivos es el índice (compartido entre procesos): el nombre
+    es el hash de (key, ETag) y el mtime marca el último uso.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str, etag: str) -> str:
+        digest = hashlib.sha256(f"{key}\0{etag}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def get(self, key: str, etag: str):
+        """Ruta del archivo cacheado (y lo marca como usado) o None."""
+        path = self._path(key, etag)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def open(self, key: str, etag: str):
+        """Archivo cacheado abierto en modo binario (y marcado como usado) o None."""
+        path = self.get(key, etag)
+        if path is None:
+            return None
+        try:
+            return open(path, "rb")
+        except FileNotFoundError:
+            # Desalojado entre el utime y el open
+            return None
+
+    def put_through(self, key: str, etag: str, chunks):
+        """
+        Re-emite `chunks` mientras los escribe en un temporal, y lo publica con
+        un rename atómico al terminar. Si el consumidor corta antes (cliente
+        desconectado, error de S3), el temporal se descarta.
+        """
+        path = self._path(key, etag)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+                    yield chunk
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Borra los archivos menos usados hasta quedar bajo max_bytes."""
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except FileNotFoundError:
+                    pass
+
+
+_disk_cache = None
+_disk_cache_lock = threading.Lock()
+
+
+def get_disk_cache() -> DiskLRUCache:
+    global _disk_cache
+    with _disk_cache_lock:
+        directory = getattr(settings, "STORAGE_PROXY_CACHE_DIR", None) or os.path.join(
+            tempfile.gettempdir(), "inventory_file_cache"
+        )
+        max_bytes = getattr(settings, "STORAGE_PROXY_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES)
+        if _disk_cache is None or _disk_cache.directory != directory or _disk_cache.max_bytes != max_bytes:
+            _disk_cache = DiskLRUCache(directory, max_bytes)
+        return _disk_cache
+
+
+def _chunk_size() -> int:
+    return getattr(settings, "STORAGE_PROXY_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def get_object_metadata(bucket: str, key: str) -> dict:
+    """HEAD del objeto (cacheado): {'etag', 'size', 'content_type'}."""
+    cache_key = f"{METADATA_CACHE_PREFIX}:{bucket}:{hashlib.md5(key.encode('utf-8')).hexdigest()}"
+    meta = cache.get(cache_key)
+    if meta is None:
+        head = get_minio_client().head_object(Bucket=bucket, Key=key)
+        meta = {
+            "etag": head["ETag"].strip('"'),
+            "size": head["ContentLength"],
+            "content_type": head.get("ContentType") or "application/octet-stream",
+        }
+        cache.set(cache_key, meta, getattr(settings, "STORAGE_PROXY_METADATA_TTL", DEFAULT_METADATA_TTL))
+    return meta
+
+
+class _FileRange:
+    """
+    Rango de un archivo ya abierto. StreamingHttpResponse llama a close() al
+    cerrar la respuesta, aunque el contenido no se haya llegado a iterar.
+    """
+
+    def __init__(self, fh, start: int, length: int, chunk_size: int):
+        self.fh = fh
+        self.start = start
+        self.length = length
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        self.fh.seek(self.start)
+        remaining = self.length
+        while remaining > 0:
+            chunk = self.fh.read(min(self.chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+    def close(self):
+        self.fh.close()
+
+
+def _iter_s3(bucket: str, key: str, byte_range, chunk_size: int):
+    kwargs = {"Bucket": bucket, "Key": key}
+    if byte_range is not None:
+        kwargs["Range"] = f"bytes={byte_range[0]}-{byte_range[1]}"
+    body = get_minio_client().get_object(**kwargs)["Body"]
+    try:
+        yield from body.iter_chunks(chunk_size)
+    finally:
+        body.close()
+
+
+def _open_stream(bucket: str, key: str, meta: dict, byte_range, start: int, length: int):
+    """
+    Contenido a enviar: desde la caché en disco si está (archivo ya abierto),
+    si no desde S3. Un miss completo se cachea mientras se envía; un miss con
+    Range pide solo ese rango a S3.
+    """
+    chunk_size = _chunk_size()
+    max_object = getattr(settings, "STORAGE_PROXY_CACHE_MAX_OBJECT_BYTES", DEFAULT_CACHE_MAX_OBJECT_BYTES)
+    if meta["size"] > max_object:
+        return _iter_s3(bucket, key, byte_range, chunk_size)
+
+    disk = get_disk_cache()
+    fh = disk.open(key, meta["etag"])
+    if fh is not None:
+        return _FileRange(fh, start, length, chunk_size)
+    if byte_range is not None:
+        return _iter_s3(bucket, key, byte_range, chunk_size)
+    logger.debug("📥 Proxy: cacheando %s (%s bytes)", key, meta["size"])
+    return disk.put_through(key, meta["etag"], _iter_s3(bucket, key, None, chunk_size))
+
+
+def proxy_requested(request) -> bool:
+    """?proxy=true|false manda; si no viene, decide STORAGE_DOWNLOAD_PROXY."""
+    raw = request.query_params.get("proxy") if hasattr(request, "query_params") else request.GET.get("proxy")
+    if raw is None:
+        return getattr(settings, "STORAGE_DOWNLOAD_PROXY", False)
+    return raw.lower() in ("1", "true", "yes")
+
+
+def proxy_file_response(request, bucket: str, key: str, filename: str = None):
+    """
+    Respuesta streaming del objeto `key`: 200 completo, 206 con Range,
+    304 si coincide If-None-Match, 416 si el Range es inválido.
+    """
+    meta = get_object_metadata(bucket, key)
+    etag = f'"{meta["etag"]}"'
+    if request.headers.get("If-None-Match") == etag:
+        response = HttpResponse(status=304)
+        response["ETag"] = etag
+        return response
+
+    size = meta["size"]
+    try:
+        byte_range = parse_range(request.headers.get("Range"), size)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    # If-Range con otro ETag: el cliente tiene una versión vieja, va completo
+    if_range = request.headers.get("If-Range")
+    if byte_range is not None and if_range and if_range != etag:
+        byte_range = None
+
+    start, end = byte_range if byte_range is not None else (0, size - 1)
+    length = end - start + 1 if size else 0
+    stream = _open_stream(bucket, key, meta, byte_range, start, length)
+
+    response = StreamingHttpResponse(
+        stream,
+        status=206 if byte_range is not None else 200,
+        content_type=meta["content_type"],
+    )
+    response["Content-Length"] = str(length)
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    if byte_range is not None:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    if filename:
+        response["Content-Disposition"] = f'inline; filename="{filename}"'
+    return response
@@ -0,0 +1,157 @@
+"""
+Caché de URLs presignadas.
+
+Dos niveles:
+- LRU local por proceso (sin red), delante de
+- la caché de Django (Redis), compartida entre workers.
+
+La clave es (bucket, key, expiry_seconds). Cada entrada vive una fracción
+segura de `expiry_seconds` (PRESIGNED_URL_CACHE_FRACTION, 0.5 por defecto), de
+modo que una URL servida desde caché conserva al menos la otra parte de su
+vigencia. Firmar es local (SigV4), pero en listados con muchas imágenes el
+costo se suma por archivo y por request; tras el primer request es ~0.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.storages_client.services.s3_file_access import generate_presigned_url
+
+logger = logging.getLogger(__name__)
+
+PRESIGNED_CACHE_PREFIX = "presigned_url"
+DEFAULT_EXPIRY_SECONDS = 300
+DEFAULT_SAFE_FRACTION = 0.5
+DEFAULT_LOCAL_MAX_ENTRIES = 2048
+
+
+class _LocalLRU:
+    """LRU thread-safe con vencimiento absoluto por entrada."""
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            url, deadline = entry
+            if deadline <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return url
+
+    def set(self, key, url, deadline, max_entries):
+        with self._lock:
+            self._data[key] = (url, deadline)
+            self._data.move_to_end(key)
+            while len(self._data) > max_entries:
+                self._data.popitem(last=False)
+
+    def discard(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local = _LocalLRU()
+
+
+def clear_local_cache() -> None:
+    """Vacía el LRU del proceso (tests)."""
+    _local.clear()
+
+
+def _cache_ttl(expiry_seconds: int) -> int:
+    fraction = getattr(settings, "PRESIGNED_URL_CACHE_FRACTION", DEFAULT_SAFE_FRACTION)
+    return int(expiry_seconds * fraction)
+
+
+def presigned_cache_key(bucket: str, object_name: str, expiry_seconds: int) -> str:
+    # Hash de la key del objeto: acota el largo y evita caracteres conflictivos
+    digest = hashlib.md5(object_name.encode("utf-8")).hexdigest()
+    return f"{PRESIGNED_CACHE_PREFIX}:{bucket}:{expiry_seconds}:{digest}"
+
+
+def get_presigned_urls(bucket: str, object_names: Iterable[str],
+                       expiry_seconds: int = DEFAULT_EXPIRY_SECONDS) -> Dict[str, str]:
+    """
+    Resuelve en lote las URLs presignadas de `object_names`:
+    LRU local → un get_many a la caché compartida → firma de los faltantes
+    (guardados con un set_many). Devuelve {object_name: url}.
+    """
+    names = [n for n in dict.fromkeys(object_names) if n]
+    if not names:
+        return {}
+
+    ttl = _cache_ttl(expiry_seconds)
+    if ttl <= 0:
+        # Vigencia demasiado corta para cachear con margen
+        return {n: generate_presigned_url(bucket, n, expiry_seconds) for n in names}
+
+    max_entries = getattr(settings, "PRESIGNED_URL_LOCAL_MAX_ENTRIES", DEFAULT_LOCAL_MAX_ENTRIES)
+    keys = {n: presigned_cache_key(bucket, n, expiry_seconds) for n in names}
+    urls = {}
+
+    for name in names:
+        url = _local.get(keys[name])
+        if url is not None:
+            urls[name] = url
+
+    pending = [n for n in names if n not in urls]
+    if pending:
+        shared = cache.get_many([keys[n] for n in pending])
+        for name in pending:
+            entry = shared.get(keys[name])
+            if entry is not None:
+                url, deadline = entry
+                urls[name] = url
+                _local.set(keys[name], url, deadline, max_entries)
+
+    missing = [n for n in names if n not in urls]
+    if missing:
+        deadline = time.time() + ttl
+        fresh = {}
+        for name in missing:
+            url = generate_presigned_url(bucket, name, expiry_seconds)
+            urls[name] = url
+            fresh[keys[name]] = (url, deadline)
+            _local.set(keys[name], url, deadline, max_entries)
+        cache.set_many(fresh, ttl)
+        logger.debug("🔐 %s URLs presignadas nuevas (bucket=%s)", len(missing), bucket)
+
+    return urls
+
+
+def get_presigned_url(bucket: str, object_name: str,
+                      expiry_seconds: int = DEFAULT_EXPIRY_SECONDS) -> str:
+    """Versión cacheada de generate_presigned_url para un solo objeto."""
+    if not bucket or not object_name:
+        raise ValueError("Se requieren bucket y object_name para generar la URL presignada.")
+    return get_presigned_urls(bucket, [object_name], expiry_seconds)[object_name]
+
+
+def forget_presigned_urls(bucket: str, object_names: Iterable[str],
+                          expiry_seconds: int = DEFAULT_EXPIRY_SECONDS) -> None:
+    """
+    Descarta URLs cacheadas (p. ej. al borrar el objeto del bucket).
+    Los LRU de otros procesos las conservan hasta su vencimiento.
+    """
+    keys = [presigned_cache_key(bucket, n, expiry_seconds) for n in object_names if n]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    _local.discard(keys)
@@ -3,7 +3,11 @@ import logging
 from uuid import uuid4
 from django.conf import settings
 from apps.storages_client.clients.minio_client import get_minio_client
-from apps.storages_client.services.s3_file_access import generate_presigned_url
+from apps.storages_client.services.presigned_cache import (
+    forget_presigned_urls,
+    get_presigned_url,
+    get_presigned_urls,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +15,8 @@ __all__ = [
     "upload_profile_image",
     "replace_profile_image",
     "delete_profile_image",
-    "get_profile_image_url"
+    "get_profile_image_url",
+    "get_profile_image_urls",
 ]
 
 
@@ -51,7 +56,7 @@ def upload_profile_image(file, user_id: int) -> dict:
         logger.error(f"❌ Error al subir imagen de perfil: {e}")
         raise Exception("Error al subir la imagen de perfil.")
 
-    url = generate_presigned_url(bucket=settings.AWS_PROFILE_BUCKET_NAME, object_name=filename)
+    url = get_presigned_url(bucket=settings.AWS_PROFILE_BUCKET_NAME, object_name=filename)
     return {"url": url, "key": filename}
 
 
@@ -77,7 +82,7 @@ def replace_profile_image(file, file_id: str, user_id: int) -> dict:
         logger.error(f"❌ Error al reemplazar imagen de perfil: {e}")
         raise Exception("Error al reemplazar la imagen de perfil.")
 
-    url = generate_presigned_url(bucket=settings.AWS_PROFILE_BUCKET_NAME, object_name=file_id)
+    url = get_presigned_url(bucket=settings.AWS_PROFILE_BUCKET_NAME, object_name=file_id)
     return {"url": url, "key": file_id}
 
 
@@ -95,17 +100,28 @@ def delete_profile_image(file_id: str, user_id: int) -> dict:
         logger.error(f"❌ Error al eliminar imagen de perfil: {e}")
         raise Exception("Error al eliminar la imagen de perfil.")
 
+    forget_presigned_urls(settings.AWS_PROFILE_BUCKET_NAME, [file_id])
+
     return {"message": "Deleted", "key": file_id}
 
 
 def get_profile_image_url(file_id: str, expiry_seconds: int = 300) -> str:
     """
-    Genera una URL presignada temporal para visualizar la imagen de perfil.
+    URL presignada temporal (cacheada) para visualizar la imagen de perfil.
     """
-    logger.debug(f"🔐 Generando URL firmada para {file_id}")
-
-    return generate_presigned_url(
+    return get_presigned_url(
         bucket=settings.AWS_PROFILE_BUCKET_NAME,
         object_name=file_id,
         expiry_seconds=expiry_seconds
     )
+
+
+def get_profile_image_urls(file_ids, expiry_seconds: int = 300) -> dict:
+    """
+    URLs presignadas (cacheadas) de varias imágenes de perfil: {file_id: url}.
+    """
+    return get_presigned_urls(
+        bucket=settings.AWS_PROFILE_BUCKET_NAME,
+        object_names=file_ids,
+        expiry_seconds=expiry_seconds
+    )
@@ -5,6 +5,25 @@ from urllib.parse import urlparse, urlunparse
 
 logger = logging.getLogger(__name__)
 
+def to_public_url(url: str) -> str:
+    """
+    Reemplaza esquema y host de una URL firmada por los de MINIO_PUBLIC_URL.
+    """
+    public = settings.MINIO_PUBLIC_URL
+    if not public:
+        raise Exception("MINIO_PUBLIC_URL no configurado correctamente.")
+
+    # si public no trae esquema, asumimos http ('host:puerto' se parsearía
+    # con 'host' como esquema)
+    if "://" not in public:
+        public = f"http://{public}"
+    parsed = urlparse(url)
+    pub_parsed = urlparse(public)
+    scheme = pub_parsed.scheme
+    netloc = pub_parsed.netloc
+    return urlunparse(parsed._replace(scheme=scheme, netloc=netloc))
+
+
 def generate_presigned_url(bucket: str, object_name: str, expiry_seconds: int = 300) -> str:
     """
     Genera una URL presignada temporal para acceder a un objeto privado en MinIO/S3.
@@ -23,22 +42,8 @@ def generate_presigned_url(bucket: str, object_name: str, expiry_seconds: int =
             ExpiresIn=expiry_seconds
         )
 
-        # 2) Parseamos la URL y sustituimos host+puerto público y esquema
-        parsed = urlparse(url)
-        public = settings.MINIO_PUBLIC_URL
-        if not public:
-            raise Exception("MINIO_PUBLIC_URL no configurado correctamente.")
-
-        pub_parsed = urlparse(public)
-        # si public no trae esquema, asumimos http
-        scheme = pub_parsed.scheme or 'http'
-        netloc = pub_parsed.netloc or pub_parsed.path
-
-        # 3) Reemplazamos scheme y netloc
-        secured = parsed._replace(scheme=scheme, netloc=netloc)
-
-        # 4) Reconstruimos la URL final
-        return urlunparse(secured)
+        # 2) Sustituimos host+puerto público y esquema
+        return to_public_url(url)
 
     except Exception as e:
         logger.error(f"❌ Error al generar URL presignada para '{object_name}': {e}")
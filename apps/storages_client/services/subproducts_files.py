@@ -4,7 +4,11 @@ from mimetypes import guess_type
 import logging
 from django.conf import settings
 from apps.storages_client.clients.minio_client import get_minio_client
-from apps.storages_client.services.s3_file_access import generate_presigned_url
+from apps.storages_client.services.presigned_cache import (
+    forget_presigned_urls,
+    get_presigned_url,
+    get_presigned_urls,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +23,10 @@ def _validate_file_extension(filename: str):
         raise ValueError(f"Extensión de archivo no permitida: {ext}. Permitidas: {allowed}")
 
 
-def upload_subproduct_file(file, product_id: int, subproduct_id: int) -> dict:
+def upload_subproduct_file(file, product_id: int, subproduct_id: int, content_hash: str = None) -> dict:
     """
     Sube un archivo al bucket de productos, organizándolo dentro del producto y subproducto.
+    Si se conoce `content_hash` (SHA-256) se guarda como metadata del objeto.
     """
     _validate_file_extension(file.name)
 
@@ -32,21 +37,25 @@ def upload_subproduct_file(file, product_id: int, subproduct_id: int) -> dict:
     s3 = get_minio_client()
     file.seek(0)
 
+    extra_args = {"ContentType": file.content_type}
+    if content_hash:
+        extra_args["Metadata"] = {"sha256": content_hash}
     s3.upload_fileobj(
         Fileobj=file,
         Bucket=settings.AWS_PRODUCT_BUCKET_NAME,
         Key=key,
-        ExtraArgs={"ContentType": file.content_type},
+        ExtraArgs=extra_args,
     )
 
     mime_type, _ = guess_type(file.name)
-    url = generate_presigned_url(bucket=settings.AWS_PRODUCT_BUCKET_NAME, object_name=key)
+    url = get_presigned_url(bucket=settings.AWS_PRODUCT_BUCKET_NAME, object_name=key)
 
     return {
         "key": key,
         "url": url,
         "name": file.name,
-        "mimeType": mime_type or "application/octet-stream"
+        "mimeType": mime_type or "application/octet-stream",
+        "contentHash": content_hash,
     }
 
 
@@ -58,6 +67,7 @@ def delete_subproduct_file(key: str) -> bool:
 
     try:
         s3.delete_object(Bucket=settings.AWS_PRODUCT_BUCKET_NAME, Key=key)
+        forget_presigned_urls(settings.AWS_PRODUCT_BUCKET_NAME, [key])
         return True
     except Exception as e:
         logger.error(
@@ -71,7 +81,7 @@ def get_subproduct_file_url(key: str, expiry_seconds: int = 300) -> str | None:
     Genera una URL presignada temporal para acceder al archivo de subproducto.
     """
     try:
-        return generate_presigned_url(
+        return get_presigned_url(
             bucket=settings.AWS_PRODUCT_BUCKET_NAME,
             object_name=key,
             expiry_seconds=expiry_seconds
@@ -81,3 +91,19 @@ def get_subproduct_file_url(key: str, expiry_seconds: int = 300) -> str | None:
             f"❌ Error al generar URL presignada para subproducto ({key}): {e}"
         )
         return None
+
+
+def get_subproduct_file_urls(keys, expiry_seconds: int = 300) -> dict:
+    """
+    URLs presignadas (cacheadas) de varios archivos de subproducto: {key: url}.
+    Ante un error de firma devuelve {}: el llamador las trata como None.
+    """
+    try:
+        return get_presigned_urls(
+            bucket=settings.AWS_PRODUCT_BUCKET_NAME,
+            object_names=keys,
+            expiry_seconds=expiry_seconds
+        )
+    except Exception as e:
+        logger.error(f"❌ Error al generar URLs firmadas de archivos de subproducto: {e}")
+        return {}
@@ -0,0 +1,98 @@
+"""
+Miniaturas WebP de imágenes de producto/subproducto.
+
+Para una key original `products/1/abc.png` las variantes se guardan en
+`products/1/thumbs/abc_{lado}.webp` (lado máximo en px, manteniendo proporción).
+La generación corre en Celery (apps.products.tasks): aquí solo está la
+transformación y el acceso al bucket.
+"""
+import logging
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+from apps.storages_client.clients.minio_client import get_minio_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THUMBNAIL_SIZES = (128, 512)
+THUMBNAIL_DIR = "thumbs"
+THUMBNAIL_CONTENT_TYPE = "image/webp"
+THUMBNAIL_QUALITY = 80
+# Formatos que Pillow decodifica y que tiene sentido reducir
+THUMBNAIL_SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tif", ".tiff")
+
+
+def thumbnail_sizes() -> tuple:
+    return tuple(getattr(settings, "THUMBNAIL_SIZES", DEFAULT_THUMBNAIL_SIZES))
+
+
+def thumbnail_key(key: str, size: int) -> str:
+    """Key derivada de la variante `size` para la key original."""
+    directory, filename = posixpath.split(key)
+    stem, _ = posixpath.splitext(filename)
+    return posixpath.join(directory, THUMBNAIL_DIR, f"{stem}_{size}.webp")
+
+
+def is_thumbnailable(key: str, mime_type: str = None) -> bool:
+    """True si el archivo es una imagen rasterizable (no video/PDF/SVG)."""
+    if mime_type and not mime_type.startswith("image/"):
+        return False
+    return posixpath.splitext(key.lower())[1] in THUMBNAIL_SOURCE_EXTENSIONS
+
+
+def render_thumbnail(image: Image.Image, size: int) -> bytes:
+    """Reduce `image` a un lado máximo de `size` px y la codifica en WebP."""
+    variant = image.copy()
+    variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+    if variant.mode not in ("RGB", "RGBA"):
+        variant = variant.convert("RGBA" if "A" in variant.getbands() else "RGB")
+    buffer = BytesIO()
+    variant.save(buffer, format="WEBP", quality=THUMBNAIL_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def generate_thumbnails(key: str, bucket: str = None, sizes=None) -> dict:
+    """
+    Descarga el original, genera las variantes WebP y las sube.
+    Devuelve {"<lado>": key_variante}. Lanza la excepción de S3/Pillow si falla.
+    """
+    bucket = bucket or settings.AWS_PRODUCT_BUCKET_NAME
+    sizes = sizes or thumbnail_sizes()
+    s3 = get_minio_client()
+
+    body = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+    with Image.open(BytesIO(body)) as original:
+        # Respeta la orientación EXIF de fotos tomadas con el celular
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    variants = {}
+    for size in sizes:
+        variant_key = thumbnail_key(key, size)
+        s3.put_object(
+            Bucket=bucket,
+            Key=variant_key,
+            Body=render_thumbnail(image, size),
+            ContentType=THUMBNAIL_CONTENT_TYPE,
+            CacheControl="public, max-age=31536000, immutable",
+        )
+        variants[str(size)] = variant_key
+    logger.info(f"🖼️ Miniaturas generadas para {key}: {sorted(variants)}")
+    return variants
+
+
+def delete_thumbnails(variants: dict, bucket: str = None) -> None:
+    """Borra del bucket las variantes de una imagen (best-effort)."""
+    if not variants:
+        return
+    bucket = bucket or settings.AWS_PRODUCT_BUCKET_NAME
+    try:
+        get_minio_client().delete_objects(
+            Bucket=bucket,
+            Delete={"Objects": [{"Key": k} for k in variants.values()], "Quiet": True},
+        )
+    except Exception as e:
+        logger.error(f"❌ Error al eliminar miniaturas {list(variants.values())}: {e}")
@@ -0,0 +1,148 @@
+"""
+Subidas directas al bucket (presigned POST).
+
+Flujo en dos pasos, sin que los bytes pasen por los workers de Django:
+1. create_upload_session(): valida nombre/tipo/tamaño declarados, genera la key
+   bajo `products/{id}/...` y devuelve un POST presignado cuya política exige
+   ese Content-Type y un content-length-range acotado. La sesión se guarda en
+   caché con un token opaco.
+2. finalize_upload_session(): con el token, hace HEAD del objeto, verifica
+   tamaño y tipo reales y registra la fila con el callback del llamador. Si el
+   registro falla, la sesión se restaura y el cliente puede reintentar.
+"""
+import logging
+import os
+import uuid
+from typing import Callable
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.storages_client.clients.minio_client import get_minio_client
+from apps.storages_client.exceptions import StorageUploadError
+from apps.storages_client.services.presigned_cache import get_presigned_url
+from apps.storages_client.services.products_files import _validate_file_extension
+from apps.storages_client.services.s3_file_access import to_public_url
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_SESSION_PREFIX = "upload_session"
+DEFAULT_SESSION_EXPIRY = 900
+DEFAULT_MAX_UPLOAD_BYTES = 500 * 1024 * 1024
+
+
+def _session_key(token: str) -> str:
+    return f"{UPLOAD_SESSION_PREFIX}:{token}"
+
+
+def _max_upload_bytes() -> int:
+    return getattr(settings, "STORAGE_DIRECT_UPLOAD_MAX_BYTES", DEFAULT_MAX_UPLOAD_BYTES)
+
+
+def build_product_key(product_id, filename: str, subproduct_id=None) -> str:
+    """Key única para un archivo de producto o subproducto (misma forma que las subidas por API)."""
+    _, ext = os.path.splitext(filename)
+    prefix = f"products/{product_id}"
+    if subproduct_id is not None:
+        prefix += f"/subproducts/{subproduct_id}"
+    return f"{prefix}/{uuid.uuid4().hex}{ext}"
+
+
+def create_upload_session(scope: dict, filename: str, content_type: str, size: int,
+                          expiry_seconds: int = DEFAULT_SESSION_EXPIRY) -> dict:
+    """
+    Crea una sesión de subida directa.
+    - scope: {'product_id': ..., 'subproduct_id': ... | None}; finalize lo exige igual.
+    - size: tamaño declarado en bytes; la política de S3 lo impone como máximo.
+    Lanza ValueError ante datos inválidos.
+    """
+    if not filename or not content_type:
+        raise ValueError("Se requieren 'filename' y 'content_type'.")
+    _validate_file_extension(filename)
+    max_bytes = _max_upload_bytes()
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise ValueError("'size' debe ser un entero en bytes.")
+    if size <= 0 or size > max_bytes:
+        raise ValueError(f"Tamaño inválido: {size} bytes (máximo {max_bytes}).")
+
+    key = build_product_key(scope["product_id"], filename, scope.get("subproduct_id"))
+    bucket = settings.AWS_PRODUCT_BUCKET_NAME
+    post = get_minio_client().generate_presigned_post(
+        Bucket=bucket,
+        Key=key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, size],
+        ],
+        ExpiresIn=expiry_seconds,
+    )
+
+    token = uuid.uuid4().hex
+    session = {
+        "scope": scope,
+        "key": key,
+        "name": filename,
+        "content_type": content_type,
+        "size": size,
+    }
+    # Margen para finalizar después de que vence la firma del POST
+    session["ttl"] = expiry_seconds * 2
+    cache.set(_session_key(token), session, session["ttl"])
+    logger.info(f"🎫 Sesión de subida {token} creada para {key}")
+
+    return {
+        "token": token,
+        "key": key,
+        "upload": {"method": "POST", "url": to_public_url(post["url"]), "fields": post["fields"]},
+        "expires_in": expiry_seconds,
+        "max_size": size,
+    }
+
+
+def finalize_upload_session(token: str, scope: dict, register: Callable[[dict], object]) -> dict:
+    """
+    Verifica con HEAD que el objeto de la sesión exista y cumpla lo declarado y
+    lo registra con `register(res)`, donde res es {'key','url','name','mimeType'}
+    como upload_product_file. Devuelve res.
+    - LookupError: sesión inexistente, vencida o de otro producto/subproducto.
+    - StorageUploadError: el objeto no está en el bucket o no coincide.
+    - Si `register` falla, la sesión se restaura (se puede reintentar con el
+      mismo token) y la excepción se propaga.
+    """
+    session = cache.get(_session_key(token)) if token else None
+    if session is None or session["scope"] != scope:
+        raise LookupError("Sesión de subida inexistente o vencida.")
+
+    bucket = settings.AWS_PRODUCT_BUCKET_NAME
+    try:
+        head = get_minio_client().head_object(Bucket=bucket, Key=session["key"])
+    except ClientError as e:
+        raise StorageUploadError(f"El archivo aún no fue subido al bucket ({e}).")
+
+    length = head.get("ContentLength", 0)
+    if length > session["size"] or head.get("ContentType") != session["content_type"]:
+        # La política del POST ya lo impide; se verifica igual y se descarta el objeto
+        get_minio_client().delete_object(Bucket=bucket, Key=session["key"])
+        cache.delete(_session_key(token))
+        raise StorageUploadError("El archivo subido no coincide con la sesión declarada.")
+
+    # Uso único: solo quien borra la sesión la registra (evita filas duplicadas)
+    if not cache.delete(_session_key(token)):
+        raise LookupError("Sesión de subida inexistente o vencida.")
+    try:
+        res = {
+            "key": session["key"],
+            "url": get_presigned_url(bucket=bucket, object_name=session["key"]),
+            "name": session["name"],
+            "mimeType": session["content_type"],
+        }
+        register(res)
+    except Exception:
+        # Sin fila registrada: el token vuelve a ser válido para reintentar
+        cache.set(_session_key(token), session, session.get("ttl", DEFAULT_SESSION_EXPIRY * 2))
+        raise
+    return res
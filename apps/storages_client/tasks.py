@@ -0,0 +1,19 @@
+from celery import shared_task
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+import logging
+
+from apps.storages_client.services.batch_delete import delete_objects_batched
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(autoretry_for=(BotoCoreError, ClientError), retry_backoff=True, max_retries=5)
+def delete_storage_objects(keys: list, bucket_setting: str = "AWS_PRODUCT_BUCKET_NAME"):
+    """
+    Borra en lote objetos del bucket indicado por su setting
+    (AWS_PRODUCT_BUCKET_NAME, AWS_PROFILE_BUCKET_NAME).
+    """
+    bucket = getattr(settings, bucket_setting)
+    result = delete_objects_batched(bucket, keys)
+    return {"deleted": result["deleted"], "errors": len(result["errors"])}
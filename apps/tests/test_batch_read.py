@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from apps.products.api.repositories.product_repository import ProductRepository
+from apps.products.utils.cache_helpers_products import product_detail_cache_key, invalidate_product_cache
+from apps.products.api.repositories.subproduct_repository import SubproductRepository
+from apps.tests.factories import create_category, create_type, create_product
+
+
+class BatchReadTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        self.client.force_authenticate(user=self.admin)
+        category = create_category(user=self.admin)
+        type_obj = create_type(category, user=self.admin)
+        self.products = [
+            create_product(category, type_obj, user=self.admin, name=f"P{i}") for i in range(3)
+        ]
+
+    def _batch(self, ids):
+        return self.client.get("/api/v1/inventory/products/batch/", {"ids": ids})
+
+    def test_products_batch_reports_misses(self):
+        inactive = self.products[2]
+        inactive.delete(user=self.admin)
+        ids = f"{self.products[0].pk},{self.products[1].pk},{inactive.pk},999999"
+
+        response = self._batch(ids)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data["results"]), [str(self.products[0].pk), str(self.products[1].pk)])
+        self.assertEqual(response.data["results"][str(self.products[0].pk)]["name"], "P0")
+        self.assertEqual(response.data["not_found"], [inactive.pk, 999999])
+        self.assertEqual(self._batch("1,x").status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(DEBUG=False)
+    def test_reuses_and_warms_detail_cache(self):
+        warm, cold = self.products[0], self.products[1]
+        cache.set(product_detail_cache_key(warm.pk), {"id": warm.pk, "name": "Desde caché", "status": True})
+        ids = f"{warm.pk},{cold.pk}"
+
+        response = self._batch(ids)
+        self.assertEqual(response.data["results"][str(warm.pk)]["name"], "Desde caché")
+        self.assertEqual(cache.get(product_detail_cache_key(cold.pk))["name"], "P1")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._batch(ids)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertFalse([q for q in ctx.captured_queries if 'FROM "products_product"' in q["sql"]])
+
+    @override_settings(DEBUG=False)
+    def test_rows_loaded_during_an_invalidation_are_not_cached_as_current(self):
+        product = self.products[0]
+        real_queryset = ProductRepository.get_all_active_products_detailed
+
+        def invalidated_while_reading():
+            # Una escritura confirma e invalida mientras el lote lee la base
+            invalidate_product_cache(product.pk)
+            return real_queryset()
+
+        with mock.patch.object(ProductRepository, "get_all_active_products_detailed",
+                               side_effect=invalidated_while_reading):
+            self._batch(str(product.pk))
+
+        self.assertIsNone(cache.get(product_detail_cache_key(product.pk)))
+
+    def test_subproducts_batch_is_scoped_to_parent(self):
+        parent, other = self.products[0], self.products[1]
+        for product in (parent, other):
+            product.has_subproducts = True
+            product.save(user=self.admin)
+        own = SubproductRepository.create(self.admin, parent, number_coil=1)
+        removed = SubproductRepository.create(self.admin, parent, number_coil=2)
+        removed.delete(user=self.admin)
+        foreign = SubproductRepository.create(self.admin, other, number_coil=3)
+
+        response = self.client.get(
+            f"/api/v1/inventory/products/{parent.pk}/subproducts/batch/",
+            {"ids": f"{own.pk},{removed.pk},{foreign.pk}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data["results"]), [str(own.pk)])
+        self.assertEqual(response.data["results"][str(own.pk)]["parent"], parent.pk)
+        self.assertEqual(response.data["not_found"], [removed.pk, foreign.pk])
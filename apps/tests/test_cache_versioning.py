@@ -0,0 +1,256 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.core.conditional import conditional_get
+from apps.users.models import User
+from apps.products.utils.cache_helpers_core import (
+    bump_namespace_version,
+    get_namespace_version,
+    namespace_version_key,
+    versioned_key,
+    build_list_cache_key,
+    namespace_etag,
+    record_cache_access,
+    get_cache_stats,
+    reset_cache_stats,
+)
+from apps.products.utils.cache_helpers_products import product_detail_cache_key
+from apps.products.utils.cache_helpers_subproducts import (
+    subproduct_detail_cache_key,
+    subproduct_list_namespace,
+)
+from apps.products.api.repositories.subproduct_repository import SubproductRepository
+from apps.products.utils.cache_decorators import cached_view, CachePolicy, LIST_CACHE_POLICY
+from apps.products.utils.cache_helpers_categories import CACHE_KEY_CATEGORY_LIST
+from apps.tests.factories import create_category, create_type, create_product
+
+
+class NamespaceVersionTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_changes_versioned_keys(self):
+        before = versioned_key("ns_test", "abc")
+        bump_namespace_version("ns_test")
+        self.assertNotEqual(before, versioned_key("ns_test", "abc"))
+        self.assertEqual(get_namespace_version("ns_test"), int(before.split(":v")[1].split(":")[0]) + 1)
+
+    def test_lost_counter_never_reuses_a_version(self):
+        old = get_namespace_version("ns_test")
+        bump_namespace_version("ns_test")
+        cache.delete(namespace_version_key("ns_test"))
+        self.assertGreater(get_namespace_version("ns_test"), old + 1)
+
+
+class CategoryListCacheInvalidationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_write_invalidates_cached_list(self):
+        create_category(name="Primera", user=self.admin)
+        self.assertEqual(self.client.get("/api/v1/inventory/categories/").data["count"], 1)
+
+        # Escritura directa en BD sin pasar por la vista: la señal bumpea la versión
+        version = get_namespace_version(CACHE_KEY_CATEGORY_LIST)
+        create_category(name="Segunda", user=self.admin)
+        self.assertEqual(get_namespace_version(CACHE_KEY_CATEGORY_LIST), version + 1)
+        self.assertEqual(self.client.get("/api/v1/inventory/categories/").data["count"], 2)
+
+    def test_list_after_write_is_fresh_even_with_stale_copies(self):
+        create_category(name="Primera", user=self.admin)
+        self.assertEqual(self.client.get("/api/v1/inventory/categories/").data["count"], 1)
+
+        response = self.client.post(
+            "/api/v1/inventory/categories/create/", {"name": "Segunda", "description": "d"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.get("/api/v1/inventory/categories/").data["count"], 2)
+
+    @override_settings(VIEW_CACHE_POLICIES={CACHE_KEY_CATEGORY_LIST: {"wait_timeout": 0}})
+    def test_catalog_list_serves_stale_while_recomputing_unless_no_cache(self):
+        url = "/api/v1/inventory/categories/"
+        create_category(name="Primera", user=self.admin)
+        first = self.client.get(url)
+        create_category(name="Segunda", user=self.admin)
+
+        # Otro worker tiene el lock de recálculo de la versión nueva
+        with mock.patch("apps.products.utils.cache_decorators._acquire_lock", return_value=None):
+            stale = self.client.get(url)
+            fresh = self.client.get(url, HTTP_CACHE_CONTROL="no-cache")
+
+        self.assertEqual(stale.data["count"], 1)
+        self.assertEqual(stale["ETag"], first["ETag"])
+        self.assertEqual(fresh.data["count"], 2)
+
+    def test_cached_list_etag_revalidates_after_write(self):
+        create_category(name="Primera", user=self.admin)
+        first = self.client.get("/api/v1/inventory/categories/")
+        cached = self.client.get("/api/v1/inventory/categories/")
+        self.assertEqual(cached["ETag"], first["ETag"])
+        self.assertEqual(
+            self.client.get("/api/v1/inventory/categories/", HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304
+        )
+
+        create_category(name="Segunda", user=self.admin)
+        response = self.client.get("/api/v1/inventory/categories/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+
+class ProductDetailInvalidationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="cache_user", email="cache@example.com", password="pass",
+            name="Cache", last_name="User",
+        )
+        category = create_category(user=self.user)
+        type_obj = create_type(category, user=self.user)
+        self.product = create_product(category, type_obj, user=self.user, name="A")
+        self.other = create_product(category, type_obj, user=self.user, name="B")
+        self.subp = SubproductRepository.create(self.user, self.product, number_coil=1)
+        cache.set_many({
+            product_detail_cache_key(self.product.pk): {"id": self.product.pk},
+            product_detail_cache_key(self.other.pk): {"id": self.other.pk},
+            subproduct_detail_cache_key(self.product.pk, self.subp.pk): {"id": self.subp.pk},
+        })
+
+    def test_product_write_only_evicts_its_own_entries(self):
+        other_list_version = get_namespace_version(subproduct_list_namespace(self.other.pk))
+        self.product.name = "A2"
+        self.product.save(user=self.user)
+
+        self.assertIsNone(cache.get(product_detail_cache_key(self.product.pk)))
+        self.assertIsNone(cache.get(subproduct_detail_cache_key(self.product.pk, self.subp.pk)))
+        self.assertIsNotNone(cache.get(product_detail_cache_key(self.other.pk)))
+        self.assertEqual(
+            get_namespace_version(subproduct_list_namespace(self.other.pk)), other_list_version
+        )
+
+    def test_late_write_of_an_in_flight_get_is_unreachable(self):
+        # GET que leyó la base antes de la escritura: calculó la clave con la versión vieja
+        in_flight_key = product_detail_cache_key(self.product.pk)
+        self.product.name = "A2"
+        self.product.save(user=self.user)
+        # ...y guarda su cuerpo viejo después de la invalidación
+        cache.set(in_flight_key, {"id": self.product.pk, "name": "A"})
+
+        self.assertNotEqual(product_detail_cache_key(self.product.pk), in_flight_key)
+        self.assertIsNone(cache.get(product_detail_cache_key(self.product.pk)))
+
+    def test_hit_miss_counters(self):
+        reset_cache_stats(["product_detail"])
+        record_cache_access("product_detail", hit=False)
+        record_cache_access("product_detail", hit=True)
+        record_cache_access("product_detail", hit=True)
+        stats = get_cache_stats(["product_detail"])["product_detail"]
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+
+
+class CachedViewStampedeTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.factory = APIRequestFactory()
+        self.view = self._make_view(LIST_CACHE_POLICY)
+        self.stale_view = self._make_view(CachePolicy(serve_stale=True))
+
+    def _make_view(self, policy):
+        @api_view(["GET"])
+        @permission_classes([AllowAny])
+        @conditional_get(etag_func=lambda request: namespace_etag(request, "ns_stampede"))
+        @cached_view("ns_stampede", policy=policy, wait_timeout=0.1)
+        def view(request):
+            self.calls += 1
+            return Response({"calls": self.calls})
+
+        return view
+
+    def _get(self, view=None):
+        return (view or self.view)(self.factory.get("/stampede/")).data
+
+    def _hold_lock(self):
+        key = build_list_cache_key("ns_stampede", self.factory.get("/stampede/"))
+        cache.add(f"{key}:lock", "other-worker", 10)
+
+    def test_serves_stale_while_another_worker_recomputes(self):
+        self.assertEqual(self._get(self.stale_view), {"calls": 1})
+        bump_namespace_version("ns_stampede")
+        self._hold_lock()
+        self.assertEqual(self._get(self.stale_view), {"calls": 1})
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_copy_keeps_the_etag_it_was_computed_with(self):
+        first = self.stale_view(self.factory.get("/stampede/"))
+        bump_namespace_version("ns_stampede")
+        self._hold_lock()
+        stale = self.stale_view(self.factory.get("/stampede/"))
+        self.assertEqual(stale.data, {"calls": 1})
+        self.assertEqual(stale["ETag"], first["ETag"])
+
+        cache.delete(f"{build_list_cache_key('ns_stampede', self.factory.get('/stampede/'))}:lock")
+        fresh = self.stale_view(self.factory.get("/stampede/", HTTP_IF_NONE_MATCH=stale["ETag"]))
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.data, {"calls": 2})
+        self.assertNotEqual(fresh["ETag"], stale["ETag"])
+
+    def test_first_request_after_bump_is_never_stale(self):
+        self._get(self.stale_view)
+        bump_namespace_version("ns_stampede")
+        self.assertEqual(self._get(self.stale_view), {"calls": 2})
+
+    def test_list_policy_does_not_serve_stale(self):
+        self._get()
+        bump_namespace_version("ns_stampede")
+        self._hold_lock()
+        self.assertEqual(self._get(), {"calls": 2})
+
+    def test_lock_holder_recomputes_once(self):
+        self._get()
+        bump_namespace_version("ns_stampede")
+        self.assertEqual(self._get(), {"calls": 2})
+        self.assertEqual(self._get(), {"calls": 2})
+        self.assertEqual(self.calls, 2)
+
+    def test_waiter_without_stale_recomputes_after_timeout(self):
+        self._hold_lock()
+        self.assertEqual(self._get(), {"calls": 1})
+
+
+class CanonicalListKeyTestCase(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.staff = User(username="s", is_staff=True)
+        self.operator = User(username="o", is_staff=False)
+
+    def _key(self, query, user):
+        request = self.factory.get(f"/products/{query}")
+        request.user = user
+        return build_list_cache_key("product_list", request)
+
+    def test_equivalent_queries_share_a_key(self):
+        base = self._key("?page=1&page_size=10&code=4", self.staff)
+        self.assertEqual(base, self._key("?code=4&page_size=10&page=1", self.staff))
+        self.assertEqual(base, self._key("?code=4", self.staff))
+        self.assertEqual(base, self._key("?code=4&type=", self.staff))
+        self.assertEqual(
+            self._key("?page_size=500", self.staff), self._key("?page_size=100", self.staff)
+        )
+
+    def test_role_bucket_and_filters_vary_the_key(self):
+        self.assertNotEqual(self._key("?code=4", self.staff), self._key("?code=4", self.operator))
+        self.assertNotEqual(self._key("?code=4", self.staff), self._key("?code=5", self.staff))
+        self.assertNotEqual(self._key("?page=2", self.staff), self._key("?page=1", self.staff))
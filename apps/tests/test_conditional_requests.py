@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from apps.stocks.models import ProductStock
+from apps.stocks.services import initialize_product_stock, adjust_product_stock
+from apps.tests.factories import create_category, create_type, create_product
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.category = create_category(user=self.admin)
+        self.type = create_type(self.category, user=self.admin)
+        self.product = create_product(self.category, self.type, user=self.admin, name="P")
+
+    def _revalidate(self, url):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        etag = first["ETag"]
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        return etag
+
+    def test_product_list_and_detail_return_304_until_a_write(self):
+        list_url = "/api/v1/inventory/products/"
+        detail_url = f"/api/v1/inventory/products/{self.product.pk}/"
+        list_etag = self._revalidate(list_url)
+        detail_etag = self._revalidate(detail_url)
+
+        # Un ajuste de stock (UPDATE sin señales) también cambia los validadores
+        with self.captureOnCommitCallbacks(execute=True):
+            initialize_product_stock(self.product, self.admin, initial_quantity=Decimal("3"))
+        self.assertEqual(
+            self.client.get(list_url, HTTP_IF_NONE_MATCH=list_etag).status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertEqual(
+            self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_list_etag_varies_with_query_params(self):
+        url = "/api/v1/inventory/products/"
+        etag = self.client.get(url)["ETag"]
+        self.assertNotEqual(etag, self.client.get(url, {"page_size": 5})["ETag"])
+
+    def test_stock_event_history_uses_fingerprint(self):
+        initialize_product_stock(self.product, self.admin, initial_quantity=Decimal("3"))
+        url = f"/api/v1/stocks/products/{self.product.pk}/stock/events/"
+        etag = self._revalidate(url)
+        adjust_product_stock(
+            ProductStock.objects.get(product=self.product), Decimal("1"), "ingreso", self.admin
+        )
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK
+        )
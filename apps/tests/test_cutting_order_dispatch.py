@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.users.models import User
+from apps.cuts.models.cutting_order_model import CuttingOrder, CuttingOrderItem
+from apps.cuts.services.cuts_services import create_full_cutting_order
+from apps.products.api.repositories.subproduct_repository import SubproductRepository
+from apps.products.models import Product, Subproduct
+from apps.stocks.models import StockEvent, SubproductStock
+from apps.stocks.services import dispatch_subproducts_stock_for_cut, initialize_subproduct_stock
+from apps.tests.factories import create_category, create_type, create_product
+
+
+class CuttingOrderDispatchTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        category = create_category(user=self.admin)
+        type_obj = create_type(category, user=self.admin)
+        self.product = create_product(category, type_obj, user=self.admin, name="Cable")
+        self.product.has_subproducts = True
+        self.product.save(user=self.admin)
+        self.coils = []
+        for number in range(1, 7):
+            coil = SubproductRepository.create(self.admin, self.product, number_coil=number)
+            initialize_subproduct_stock(coil, self.admin, initial_quantity=Decimal('100'))
+            self.coils.append(coil)
+        self.order_number = 0
+
+    def _create(self, items):
+        self.order_number += 1
+        return create_full_cutting_order(
+            product_id=self.product.pk,
+            items=items,
+            customer="Cliente",
+            user_creator=self.admin,
+            order_number=self.order_number,
+        )
+
+    def test_dispatches_all_items_and_syncs_stock(self):
+        first, second = self.coils[0], self.coils[1]
+        stock_before = Product.objects.get(pk=self.product.pk).current_stock
+
+        order = self._create([
+            {'subproduct_id': second.pk, 'cutting_quantity': 10},
+            {'subproduct_id': first.pk, 'cutting_quantity': 25.5},
+            {'subproduct_id': second.pk, 'cutting_quantity': 5},
+        ])
+
+        self.assertEqual(CuttingOrderItem.objects.filter(order=order).count(), 3)
+        self.assertEqual(SubproductStock.objects.get(subproduct=first).quantity, Decimal('74.5'))
+        self.assertEqual(SubproductStock.objects.get(subproduct=second).quantity, Decimal('85'))
+        self.assertEqual(Subproduct.objects.get(pk=second.pk).current_stock, Decimal('85'))
+        self.assertEqual(
+            Product.objects.get(pk=self.product.pk).current_stock, stock_before - Decimal('40.5')
+        )
+        events = StockEvent.objects.filter(event_type='egreso_corte')
+        self.assertEqual(events.count(), 3)
+        self.assertTrue(all(e.notes == f"Egreso por Orden de Corte #{order.pk}" for e in events))
+
+    def test_insufficient_stock_rolls_back_the_order(self):
+        with self.assertRaises(ValidationError):
+            self._create([
+                {'subproduct_id': self.coils[0].pk, 'cutting_quantity': 60},
+                {'subproduct_id': self.coils[0].pk, 'cutting_quantity': 60},
+            ])
+        self.assertFalse(CuttingOrder.objects.exists())
+        self.assertEqual(SubproductStock.objects.get(subproduct=self.coils[0]).quantity, Decimal('100'))
+        self.assertFalse(StockEvent.objects.filter(event_type='egreso_corte').exists())
+
+    def test_rejects_non_positive_quantities(self):
+        coil = self.coils[0]
+        for quantity in (0, Decimal('-5'), 'abc', 'NaN'):
+            with self.subTest(quantity=quantity), self.assertRaises(ValidationError):
+                dispatch_subproducts_stock_for_cut(
+                    [(self.coils[1], Decimal('1')), (coil, quantity)], order_pk=1, user_performing_cut=self.admin
+                )
+        self.assertEqual(SubproductStock.objects.get(subproduct=coil).quantity, Decimal('100'))
+        self.assertEqual(SubproductStock.objects.get(subproduct=self.coils[1]).quantity, Decimal('100'))
+        self.assertFalse(StockEvent.objects.filter(event_type='egreso_corte').exists())
+
+    def test_query_count_does_not_grow_with_items(self):
+        def count(coils):
+            with CaptureQueriesContext(connection) as ctx:
+                self._create([{'subproduct_id': c.pk, 'cutting_quantity': 1} for c in coils])
+            return len(ctx.captured_queries)
+        self.assertEqual(count(self.coils[:2]), count(self.coils[2:]))
@@ -0,0 +1,92 @@
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from apps.products.models import ProductImage
+from apps.products.services.file_dedup_service import upload_deduplicated
+from apps.storages_client.services.content_hash import compute_sha256
+from apps.tests.factories import create_category, create_type, create_product
+
+VIEW = "apps.products.api.views.product_files_view"
+
+
+class ContentDeduplicationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        self.client.force_authenticate(user=self.admin)
+        category = create_category(user=self.admin)
+        type_obj = create_type(category, user=self.admin)
+        self.product = create_product(category, type_obj, user=self.admin)
+        self.other = create_product(category, type_obj, user=self.admin, name="Otro")
+        self.uploads = 0
+
+    def fake_upload(self, file, product_id, content_hash=None):
+        self.uploads += 1
+        return {"key": f"products/{product_id}/{self.uploads}.pdf", "url": "http://minio/x",
+                "name": file.name, "mimeType": "application/pdf"}
+
+    def _upload(self, product, *files):
+        with mock.patch(f"{VIEW}.upload_product_file", side_effect=self.fake_upload), \
+                mock.patch(f"{VIEW}.get_product_file_url", return_value="http://minio/x"):
+            return self.client.post(
+                f"/api/v1/inventory/products/{product.pk}/files/upload/",
+                {"file": list(files)}, format="multipart",
+            )
+
+    def _pdf(self, name, content=b"ficha tecnica"):
+        return SimpleUploadedFile(name, content, content_type="application/pdf")
+
+    def test_same_content_is_uploaded_once(self):
+        first = self._upload(self.product, self._pdf("a.pdf"), self._pdf("copia.pdf"))
+        second = self._upload(self.other, self._pdf("b.pdf"))
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.uploads, 1)
+        keys = set(ProductImage.objects.values_list("key", flat=True))
+        self.assertEqual(len(keys), 1)
+        self.assertEqual(
+            set(ProductImage.objects.values_list("content_hash", flat=True)),
+            {compute_sha256(self._pdf("x.pdf"))},
+        )
+
+    def test_object_is_deleted_with_last_reference(self):
+        self._upload(self.product, self._pdf("a.pdf"))
+        self._upload(self.other, self._pdf("b.pdf"))
+        key = ProductImage.objects.first().key
+
+        with mock.patch(f"{VIEW}.delete_product_file", return_value=True) as delete_file:
+            response = self.client.delete(
+                f"/api/v1/inventory/products/{self.product.pk}/files/{key}/delete/"
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            delete_file.assert_not_called()
+
+            self.client.delete(f"/api/v1/inventory/products/{self.other.pk}/files/{key}/delete/")
+            delete_file.assert_called_once_with(key)
+        self.assertFalse(ProductImage.objects.exists())
+
+    def test_reused_key_released_concurrently_is_not_registered(self):
+        self._upload(self.product, self._pdf("a.pdf"))
+        real_upload = upload_deduplicated
+
+        def upload_then_concurrent_delete(*args, **kwargs):
+            result = real_upload(*args, **kwargs)
+            # Otro request borra la última fila de la key antes del INSERT
+            ProductImage.objects.filter(product=self.product).delete()
+            return result
+
+        with mock.patch(f"{VIEW}.upload_deduplicated", side_effect=upload_then_concurrent_delete):
+            response = self._upload(self.other, self._pdf("b.pdf"))
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertIn("b.pdf", response.data["errors"][0])
+        self.assertFalse(ProductImage.objects.exists())
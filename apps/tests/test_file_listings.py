@@ -0,0 +1,90 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from apps.products.models import ProductImage
+from apps.products.api.repositories.subproduct_repository import SubproductRepository
+from apps.products.utils.cache_helpers_products import invalidate_product_cache
+from apps.tests.factories import create_category, create_type, create_product
+
+SIGN = "apps.products.services.file_listing_service.get_product_file_urls"
+
+
+def fake_sign(keys):
+    return {k: f"http://minio/{k}?sig" for k in keys}
+
+
+class FileListingBatchTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        self.client.force_authenticate(user=self.admin)
+        category = create_category(user=self.admin)
+        type_obj = create_type(category, user=self.admin)
+        self.products = [
+            create_product(category, type_obj, user=self.admin, name=f"P{i}") for i in range(3)
+        ]
+        for product in self.products:
+            ProductImage.objects.create(product=product, key=f"products/{product.pk}/a.jpg",
+                                        url="http://x", name="a.jpg", mime_type="image/jpeg")
+
+    def _batch(self, ids):
+        with mock.patch(SIGN, side_effect=fake_sign) as sign:
+            response = self.client.get("/api/v1/inventory/products/files/", {"ids": ids})
+        return response, sign
+
+    def test_groups_files_and_signs_in_one_batch(self):
+        ids = ",".join(str(p.pk) for p in self.products) + ",999999"
+        response, sign = self._batch(ids)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(response.data["not_found"], [999999])
+        first = response.data["results"][str(self.products[0].pk)][0]
+        self.assertTrue(first["url"].endswith("a.jpg?sig"))
+        sign.assert_called_once()
+
+    def test_cached_listing_skips_file_queries_until_invalidated(self):
+        ids = ",".join(str(p.pk) for p in self.products)
+        self._batch(ids)
+        with CaptureQueriesContext(connection) as ctx:
+            self._batch(ids)
+        self.assertFalse([q for q in ctx.captured_queries if "products_productimage" in q["sql"]])
+
+        target = self.products[0]
+        ProductImage.objects.create(product=target, key=f"products/{target.pk}/b.jpg", url="http://x")
+        invalidate_product_cache(target.pk)
+        response, _ = self._batch(ids)
+        self.assertEqual(len(response.data["results"][str(target.pk)]), 2)
+
+    def test_invalid_ids_return_400(self):
+        response, _ = self._batch("1,abc")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_subproduct_batch_is_scoped_to_parent(self):
+        parent, other = self.products[0], self.products[1]
+        parent.has_subproducts = True
+        parent.save(user=self.admin)
+        own = SubproductRepository.create(self.admin, parent, number_coil=1)
+        other.has_subproducts = True
+        other.save(user=self.admin)
+        foreign = SubproductRepository.create(self.admin, other, number_coil=2)
+
+        with mock.patch(SIGN, side_effect=fake_sign):
+            response = self.client.get(
+                f"/api/v1/inventory/products/{parent.pk}/subproducts/files/",
+                {"ids": f"{own.pk},{foreign.pk}"},
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], {str(own.pk): []})
+        self.assertEqual(response.data["not_found"], [foreign.pk])
@@ -0,0 +1,151 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from apps.products.models import ProductImage
+from apps.storages_client.services.file_proxy import RangeNotSatisfiable, parse_range
+from apps.tests.factories import create_category, create_type, create_product
+
+CLIENT = "apps.storages_client.services.file_proxy.get_minio_client"
+CONTENT = bytes(range(256)) * 40
+
+
+class FakeBody:
+    def __init__(self, data):
+        self.data = data
+
+    def iter_chunks(self, chunk_size):
+        for i in range(0, len(self.data), chunk_size):
+            yield self.data[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+def fake_get_object(**kwargs):
+    """get_object que respeta el header Range como S3."""
+    if "Range" in kwargs:
+        first, last = kwargs["Range"].removeprefix("bytes=").split("-")
+        return {"Body": FakeBody(CONTENT[int(first):int(last) + 1])}
+    return {"Body": FakeBody(CONTENT)}
+
+
+class FileProxyTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        overrides = override_settings(
+            AWS_PRODUCT_BUCKET_NAME="products",
+            STORAGE_PROXY_CACHE_DIR=self.cache_dir.name,
+            STORAGE_PROXY_CHUNK_SIZE=1000,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        self.client.force_authenticate(user=self.admin)
+        category = create_category(user=self.admin)
+        type_obj = create_type(category, user=self.admin)
+        self.product = create_product(category, type_obj, user=self.admin)
+        self.key = f"products/{self.product.pk}/manual.pdf"
+        ProductImage.objects.create(product=self.product, key=self.key, url="http://x",
+                                    name="manual.pdf", mime_type="application/pdf")
+
+        self.s3 = mock.Mock()
+        self.s3.head_object.return_value = {
+            "ETag": '"abc123"', "ContentLength": len(CONTENT), "ContentType": "application/pdf",
+        }
+        self.s3.get_object.side_effect = fake_get_object
+
+    def _download(self, **headers):
+        response = self._request(**headers)
+        with mock.patch(CLIENT, return_value=self.s3):
+            body = b"".join(response.streaming_content) if response.streaming else b""
+        return response, body
+
+    def _request(self, **headers):
+        url = f"/api/v1/inventory/products/{self.product.pk}/files/{self.key}/download/"
+        with mock.patch(CLIENT, return_value=self.s3):
+            return self.client.get(url, {"proxy": "true"}, **headers)
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_range("bytes=900-", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=990-5000", 1000), (990, 999))
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 1000))
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_range("bytes=1000-", 1000)
+
+    def test_range_request_returns_partial_content(self):
+        response, body = self._download(HTTP_RANGE="bytes=100-2099")
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(body, CONTENT[100:2100])
+        self.assertEqual(response["Content-Range"], f"bytes 100-2099/{len(CONTENT)}")
+        self.assertEqual(response["Content-Length"], "2000")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_range_miss_fetches_only_the_range_and_does_not_fill_cache(self):
+        response, body = self._download(HTTP_RANGE="bytes=0-9")
+
+        self.assertEqual(body, CONTENT[:10])
+        self.assertEqual(self.s3.get_object.call_args.kwargs["Range"], "bytes=0-9")
+        self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+        self._download()
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 1)
+
+    def test_cached_file_survives_eviction_after_response_is_built(self):
+        self._download()
+        response = self._request(HTTP_RANGE="bytes=-10")
+        # evict() concurrente entre el return de la vista y el streaming
+        for name in os.listdir(self.cache_dir.name):
+            os.remove(os.path.join(self.cache_dir.name, name))
+
+        self.assertEqual(b"".join(response.streaming_content), CONTENT[-10:])
+        response.close()
+        self.assertEqual(self.s3.get_object.call_count, 1)
+
+    def test_hot_file_is_served_from_disk_cache(self):
+        first, body = self._download()
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(body, CONTENT)
+
+        second, body = self._download(HTTP_RANGE="bytes=-10")
+        self.assertEqual(body, CONTENT[-10:])
+        self.assertEqual(self.s3.get_object.call_count, 1)
+        self.assertEqual(self.s3.head_object.call_count, 1)
+
+    def test_unsatisfiable_range_and_not_modified(self):
+        response, _ = self._download(HTTP_RANGE=f"bytes={len(CONTENT)}-")
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+
+        response, _ = self._download(HTTP_IF_NONE_MATCH='"abc123"')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.s3.get_object.assert_not_called()
+
+    @override_settings(STORAGE_PROXY_CACHE_MAX_OBJECT_BYTES=100)
+    def test_large_objects_stream_ranges_straight_from_s3(self):
+        response, body = self._download(HTTP_RANGE="bytes=10-19")
+
+        self.assertEqual(body, CONTENT[10:20])
+        self.assertEqual(self.s3.get_object.call_args.kwargs["Range"], "bytes=10-19")
+
+    def test_redirect_remains_default(self):
+        url = f"/api/v1/inventory/products/{self.product.pk}/files/{self.key}/download/"
+        with mock.patch("apps.products.api.views.product_files_view.get_product_file_url",
+                        return_value="http://minio/signed"):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
@@ -0,0 +1,74 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from apps.products.models import ProductImage
+from apps.tests.factories import create_category, create_type, create_product
+
+UPLOAD = "apps.products.api.views.product_files_view.upload_product_file"
+
+
+class ConcurrentProductUploadTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        self.client.force_authenticate(user=self.admin)
+        category = create_category(user=self.admin)
+        self.product = create_product(category, create_type(category, user=self.admin), user=self.admin)
+        self.url = f"/api/v1/inventory/products/{self.product.pk}/files/upload/"
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def fake_upload(self, file, product_id, content_hash=None):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        if file.name.endswith(".txt"):
+            raise ValueError("Extensión de archivo no permitida: .txt")
+        return {"key": f"products/{product_id}/{file.name}", "url": "http://minio/x",
+                "name": file.name, "mimeType": "image/png"}
+
+    def _files(self, *names):
+        # Contenido distinto por archivo: iguales se deduplicarían
+        return [SimpleUploadedFile(n, f"data-{n}".encode(), content_type="image/png") for n in names]
+
+    def test_uploads_run_concurrently_and_insert_once(self):
+        files = self._files(*(f"{i}.png" for i in range(6)))
+        with mock.patch(UPLOAD, side_effect=self.fake_upload), \
+                CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, {"file": files}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["uploaded"], [f"products/{self.product.pk}/{i}.png" for i in range(6)])
+        self.assertGreater(self.peak, 1)
+        inserts = [q for q in ctx.captured_queries
+                   if q["sql"].startswith('INSERT INTO "products_productimage"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(ProductImage.objects.filter(product=self.product).count(), 6)
+
+    def test_partial_failure_keeps_207(self):
+        files = self._files("ok.png", "bad.txt")
+        with mock.patch(UPLOAD, side_effect=self.fake_upload):
+            response = self.client.post(self.url, {"file": files}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(len(response.data["uploaded"]), 1)
+        self.assertIn("bad.txt", response.data["errors"][0])
+
+    def test_only_extension_errors_return_400(self):
+        with mock.patch(UPLOAD, side_effect=self.fake_upload):
+            response = self.client.post(self.url, {"file": self._files("bad.txt")}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,82 @@
+from django.utils import timezone
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from apps.users.models import User
+from apps.products.models import Product
+from apps.tests.factories import create_category, create_type, create_product
+
+
+class KeysetPaginationTestCase(TestCase):
+    """
+    ?pagination=cursor recorre el listado por (created_at, id), sin saltos ni
+    duplicados aunque varias filas compartan created_at.
+    """
+
+    URL = "/api/v1/inventory/products/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@example.com",
+            password="pass",
+            name="Admin",
+            last_name="User",
+        )
+        self.client.force_authenticate(user=self.admin)
+        category = create_category(user=self.admin)
+        type_obj = create_type(category, user=self.admin)
+        for i in range(7):
+            create_product(category, type_obj, user=self.admin, name=f"Prod{i}")
+        # Empates en created_at: el desempate por id debe mantener el orden total
+        Product.objects.filter(name__in=["Prod2", "Prod3", "Prod4"]).update(created_at=timezone.now())
+
+    def _expected_ids(self):
+        return list(Product.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def _walk(self, url, params):
+        pages = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response)
+            if not response.data["next"]:
+                return pages
+            response = self.client.get(response.data["next"])
+
+    def test_forward_walk_covers_every_row_once(self):
+        pages = self._walk(self.URL, {"pagination": "cursor", "page_size": 3})
+        ids = [item["id"] for page in pages for item in page.data["results"]]
+        self.assertEqual(ids, self._expected_ids())
+        self.assertEqual(len(pages), 3)
+        self.assertNotIn("count", pages[0].data)
+        self.assertIsNone(pages[0].data["previous"])
+
+    def test_previous_link_returns_prior_page(self):
+        pages = self._walk(self.URL, {"pagination": "cursor", "page_size": 3})
+        back = self.client.get(pages[2].data["previous"])
+        self.assertEqual(
+            [item["id"] for item in back.data["results"]],
+            [item["id"] for item in pages[1].data["results"]],
+        )
+        first = self.client.get(back.data["previous"])
+        self.assertEqual(
+            [item["id"] for item in first.data["results"]],
+            [item["id"] for item in pages[0].data["results"]],
+        )
+        self.assertIsNone(first.data["previous"])
+
+    def test_count_is_opt_in(self):
+        response = self.client.get(self.URL, {"pagination": "cursor", "with_count": "true"})
+        self.assertEqual(response.data["count"], 7)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(self.URL, {"pagination": "cursor", "cursor": "no-es-un-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_pagination_is_default(self):
+        response = self.client.get(self.URL, {"page_size": 3})
+        self.assertEqual(response.data["count"], 7)
+        self.assertEqual(len(response.data["results"]), 3)
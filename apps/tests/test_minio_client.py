@@ -0,0 +1,42 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.storages_client.clients import minio_client
+
+
+@override_settings(
+    AWS_S3_ENDPOINT_URL="http://minio.test:9000",
+    AWS_ACCESS_KEY_ID="test",
+    AWS_SECRET_ACCESS_KEY="test",
+    AWS_S3_REGION_NAME="us-east-1",
+)
+class MinioClientSingletonTestCase(SimpleTestCase):
+    def setUp(self):
+        minio_client.reset()
+        self.addCleanup(minio_client.reset)
+
+    def test_client_is_reused_until_reset(self):
+        first = minio_client.get_minio_client()
+        self.assertIs(minio_client.get_minio_client(), first)
+        self.assertEqual(first.meta.config.max_pool_connections, 32)
+        minio_client.reset()
+        self.assertIsNot(minio_client.get_minio_client(), first)
+
+    def test_concurrent_first_use_builds_one_client(self):
+        with mock.patch.object(
+            minio_client, "create_minio_client", side_effect=lambda: object()
+        ) as factory:
+            threads = [threading.Thread(target=minio_client.get_minio_client) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(factory.call_count, 1)
+
+    def test_forked_child_builds_its_own_client(self):
+        parent_client = minio_client.get_minio_client()
+        with mock.patch.object(minio_client.os, "getpid", return_value=-1):
+            child_client = minio_client.get_minio_client()
+        self.assertIsNot(child_client, parent_client)
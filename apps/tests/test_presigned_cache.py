@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from apps.storages_client.services import presigned_cache
+
+SIGNER = "apps.storages_client.services.presigned_cache.generate_presigned_url"
+
+
+def fake_sign(bucket, object_name, expiry_seconds=300):
+    return f"http://minio/{bucket}/{object_name}?exp={expiry_seconds}"
+
+
+@override_settings(PRESIGNED_URL_CACHE_FRACTION=0.5)
+class PresignedUrlCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        presigned_cache.clear_local_cache()
+
+    def test_batch_signs_each_key_once(self):
+        with mock.patch(SIGNER, side_effect=fake_sign) as signer:
+            first = presigned_cache.get_presigned_urls("bkt", ["a.png", "b.png", "a.png"])
+            again = presigned_cache.get_presigned_urls("bkt", ["a.png", "b.png"])
+        self.assertEqual(signer.call_count, 2)
+        self.assertEqual(first, again)
+        self.assertEqual(first["a.png"], "http://minio/bkt/a.png?exp=300")
+
+    def test_shared_cache_serves_other_processes(self):
+        with mock.patch(SIGNER, side_effect=fake_sign) as signer:
+            presigned_cache.get_presigned_url("bkt", "a.png")
+            # Otro proceso: LRU vacío, Redis con la entrada
+            presigned_cache.clear_local_cache()
+            presigned_cache.get_presigned_url("bkt", "a.png")
+        self.assertEqual(signer.call_count, 1)
+
+    def test_entries_expire_at_safe_fraction_of_expiry(self):
+        clock = mock.patch.object(presigned_cache.time, "time", return_value=1000.0)
+        with mock.patch(SIGNER, side_effect=fake_sign) as signer, clock as now, \
+                mock.patch.object(presigned_cache.cache, "set_many", wraps=cache.set_many) as set_many:
+            presigned_cache.get_presigned_url("bkt", "a.png", expiry_seconds=600)
+            self.assertEqual(set_many.call_args.args[1], 300)
+            now.return_value = 1299.0
+            presigned_cache.get_presigned_url("bkt", "a.png", expiry_seconds=600)
+            self.assertEqual(signer.call_count, 1)
+            # Pasada la fracción segura, el LRU la descarta (Redis ya la habría expirado)
+            now.return_value = 1300.0
+            cache.clear()
+            presigned_cache.get_presigned_url("bkt", "a.png", expiry_seconds=600)
+            self.assertEqual(signer.call_count, 2)
+
+    def test_forget_drops_both_levels(self):
+        with mock.patch(SIGNER, side_effect=fake_sign) as signer:
+            presigned_cache.get_presigned_url("bkt", "a.png")
+            presigned_cache.forget_presigned_urls("bkt", ["a.png"])
+            presigned_cache.get_presigned_url("bkt", "a.png")
+        self.assertEqual(signer.call_count, 2)
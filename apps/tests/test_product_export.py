@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from apps.products.services.product_export_service import EXPORT_HEADERS
+from apps.tests.factories import create_category, create_type, create_product
+
+URL = "/api/v1/inventory/products/export/"
+
+
+class ProductExportTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.category = create_category(user=self.admin, name="Cables")
+        self.other = create_category(user=self.admin, name="Tableros")
+        type_obj = create_type(self.category, user=self.admin)
+        for i in range(3):
+            create_product(self.category, type_obj, user=self.admin, name=f"Cable {i}")
+        create_product(self.other, user=self.admin, name="Tablero")
+        inactive = create_product(self.category, user=self.admin, name="Baja")
+        inactive.delete(user=self.admin)
+
+    def _get(self, **params):
+        response = self.client.get(URL, params)
+        body = b"".join(response.streaming_content) if response.streaming else b""
+        return response, body.decode("utf-8")
+
+    def test_csv_streams_active_products(self):
+        response, body = self._get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("attachment;", response["Content-Disposition"])
+        rows = list(csv.reader(io.StringIO(body.lstrip("\ufeff"))))
+        self.assertEqual(tuple(rows[0]), EXPORT_HEADERS)
+        names = [row[2] for row in rows[1:]]
+        self.assertEqual(names, ["Cable 0", "Cable 1", "Cable 2", "Tablero"])
+        self.assertEqual(rows[1][7], "Cables")
+
+    def test_ndjson_applies_list_filters(self):
+        response, body = self._get(export_format="ndjson", category="table")
+
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([line["name"] for line in lines], ["Tablero"])
+        self.assertEqual(lines[0]["current_stock"], "0.00")
+
+    def test_query_count_is_constant(self):
+        with CaptureQueriesContext(connection) as small:
+            self._get()
+        for i in range(20):
+            create_product(self.category, user=self.admin, name=f"Extra {i}")
+        with CaptureQueriesContext(connection) as large:
+            self._get()
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_async_export_is_enqueued_and_invalid_format_rejected(self):
+        with mock.patch("apps.products.tasks.export_to_bucket",
+                        return_value={"key": "exports/products/x.csv", "rows": 4}) as export:
+            response = self.client.get(URL, {"async": "true", "category": "cab"})
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIn("task_id", response.data)
+        export.assert_called_once_with("csv", {"category": "cab"})
+
+        response = self.client.get(URL, {"export_format": "pdf"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_status_signs_url_per_request_and_only_for_registered_exports(self):
+        with mock.patch("apps.products.tasks.export_to_bucket",
+                        return_value={"key": "exports/products/x.csv", "rows": 4}):
+            task_id = self.client.get(URL, {"async": "true"}).data["task_id"]
+
+        done = mock.Mock(status="SUCCESS", result={"key": "exports/products/x.csv", "rows": 4})
+        done.successful.return_value = True
+        view = "apps.products.api.views.product_export_view"
+        with mock.patch(f"{view}.AsyncResult", return_value=done), \
+                mock.patch(f"{view}.export_download_url", side_effect=lambda key: f"signed:{key}") as sign:
+            response = self.client.get(f"{URL}{task_id}/")
+            # Otra tarea de Celery (p. ej. miniaturas): no se expone su resultado
+            other = self.client.get(f"{URL}otra-tarea/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["url"], "signed:exports/products/x.csv")
+        self.assertEqual(response.data["rows"], 4)
+        sign.assert_called_once_with("exports/products/x.csv")
+        self.assertEqual(other.status_code, status.HTTP_404_NOT_FOUND)
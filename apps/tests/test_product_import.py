@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from apps.products.models import Product
+from apps.stocks.models import ProductStock, StockEvent
+from apps.tests.factories import create_category, create_type, create_product
+
+
+class ProductImportTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.category = create_category(user=self.admin, name="Cables")
+        self.type = create_type(self.category, user=self.admin, name="Unipolar")
+        existing = create_product(self.category, self.type, user=self.admin, name="Existente")
+        existing.code = "EX-1"
+        existing.save(user=self.admin)
+
+    def _import(self, content, name="catalogo.csv", **params):
+        upload = SimpleUploadedFile(name, content.encode("utf-8"), content_type="text/csv")
+        url = "/api/v1/inventory/products/import/"
+        if params:
+            url += "?" + "&".join(f"{k}={v}" for k, v in params.items())
+        return self.client.post(url, {"file": upload}, format="multipart")
+
+    def test_imports_valid_rows_and_reports_errors(self):
+        content = (
+            "name,code,category,type,initial_stock_quantity\n"
+            f"Cable 1,C-1,Cables,Unipolar,10\n"
+            f"Cable 2,C-2,{self.category.pk},,0\n"
+            "Cable 3,EX-1,Cables,,5\n"
+            "Cable 4,C-4,Inexistente,,5\n"
+            "Cable 5,C-1,Cables,,5\n"
+            "existente,C-6,Cables,,5\n"
+            "Cable 7,C-7,Cables,,-3\n"
+            "Cable 8,C-8,Cables,,12345678901234\n"
+            "Cable 9,C-9,Cables,,1.234\n"
+            "Cable 10,C-10,Cables,,NaN\n"
+        )
+        response = self._import(content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total_rows"], 10)
+        self.assertEqual(response.data["created"], 2)
+        failed = {e["row"]: set(e["errors"]) for e in response.data["errors"]}
+        self.assertEqual(failed, {
+            4: {"code"}, 5: {"category"}, 6: {"code"}, 7: {"name"}, 8: {"initial_stock_quantity"},
+            9: {"initial_stock_quantity"}, 10: {"initial_stock_quantity"}, 11: {"initial_stock_quantity"},
+        })
+
+        cable = Product.objects.get(code="C-1")
+        self.assertEqual(cable.type, self.type)
+        self.assertEqual(cable.current_stock, Decimal("10.00"))
+        self.assertEqual(cable.created_by, self.admin)
+        self.assertEqual(ProductStock.objects.get(product=cable).quantity, Decimal("10.00"))
+        self.assertEqual(StockEvent.objects.filter(product_stock__product=cable).count(), 1)
+        self.assertEqual(ProductStock.objects.get(product__code="C-2").quantity, Decimal("0.00"))
+        self.assertFalse(StockEvent.objects.filter(product_stock__product__code="C-2").exists())
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def run(offset, count):
+            rows = "".join(f"P{i},K{i},Cables,,1\n" for i in range(offset, offset + count))
+            with CaptureQueriesContext(connection) as ctx:
+                response = self._import("name,code,category,type,initial_stock_quantity\n" + rows)
+            self.assertEqual(response.data["created"], count)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(run(0, 5), run(100, 50))
+
+    def test_dry_run_and_invalid_files(self):
+        response = self._import("name,code,category\nNuevo,N-1,Cables\n", dry_run="true")
+        self.assertEqual(response.data["created"], 1)
+        self.assertFalse(Product.objects.filter(code="N-1").exists())
+
+        response = self._import("name,code\nNuevo,N-1\n")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self._import("x", name="catalogo.txt")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
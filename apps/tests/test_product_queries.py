@@ -0,0 +1,69 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from apps.users.models import User
+from apps.products.api.repositories.subproduct_repository import SubproductRepository
+from apps.products.models import ProductImage
+from apps.stocks.services import initialize_subproduct_stock
+from apps.tests.factories import create_category, create_type, create_product
+
+
+class ProductListQueryCountTestCase(TestCase):
+    """
+    El listado de productos debe ejecutar un número constante de queries,
+    sin importar cuántos productos, subproductos o imágenes haya en la página.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin",
+            email="admin@example.com",
+            password="pass",
+            name="Admin",
+            last_name="User",
+        )
+        self.client.force_authenticate(user=self.admin)
+        category = create_category(user=self.admin)
+        type_obj = create_type(category, user=self.admin)
+
+        for i in range(8):
+            product = create_product(
+                category, type_obj, user=self.admin, name=f"Prod{i}"
+            )
+            product.has_subproducts = True
+            product.save(user=self.admin)
+            for coil in range(2):
+                subp = SubproductRepository.create(self.admin, product, number_coil=coil + 1)
+                initialize_subproduct_stock(subp, self.admin, initial_quantity=5)
+            ProductImage.objects.create(product=product, key=f"products/{product.id}/a.png")
+
+    def _count_queries(self, page_size):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                "/api/v1/inventory/products/", {"page_size": page_size}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), page_size)
+        return len(ctx.captured_queries), response
+
+    def test_query_count_is_constant_across_page_sizes(self):
+        small, _ = self._count_queries(2)
+        large, response = self._count_queries(8)
+        self.assertEqual(small, large)
+
+        first = response.data["results"][0]
+        self.assertEqual(len(first["subproducts"]), 2)
+        self.assertEqual(len(first["product_images"]), 1)
+        self.assertEqual(first["current_stock"], "10.00")
+        self.assertEqual(first["subproducts"][0]["current_stock"], "5.00")
+
+    def test_detail_uses_prefetch_plan(self):
+        product_id = self._count_queries(2)[1].data["results"][0]["id"]
+        response = self.client.get(f"/api/v1/inventory/products/{product_id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["current_stock"], "10.00")
+        self.assertEqual(len(response.data["subproducts"]), 2)
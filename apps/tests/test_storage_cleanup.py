@@ -0,0 +1,98 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.users.models import User
+from apps.products.models import Product, ProductImage
+from apps.products.api.repositories.product_repository import ProductRepository
+from apps.products.services.storage_cleanup_service import (
+    purge_expired_deleted_files,
+    sweep_orphan_objects,
+)
+from apps.storages_client.services.batch_delete import delete_objects_batched
+from apps.tests.factories import create_category, create_type, create_product
+
+CLIENT = "apps.storages_client.services.batch_delete.get_minio_client"
+
+
+@override_settings(AWS_PRODUCT_BUCKET_NAME="products", STORAGE_ORPHAN_GRACE_HOURS=24,
+                   STORAGE_DELETED_FILES_RETENTION_DAYS=30)
+class StorageCleanupTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        category = create_category(user=self.admin)
+        type_obj = create_type(category, user=self.admin)
+        self.product = create_product(category, type_obj, user=self.admin)
+        self.other = create_product(category, type_obj, user=self.admin, name="Otro")
+        self.s3 = mock.Mock()
+        self.s3.delete_objects.return_value = {}
+
+    def _deleted_keys(self):
+        return [
+            obj["Key"]
+            for call in self.s3.delete_objects.call_args_list
+            for obj in call.kwargs["Delete"]["Objects"]
+        ]
+
+    def test_batches_are_capped_at_1000_keys(self):
+        self.s3.delete_objects.side_effect = [
+            {}, {}, {"Errors": [{"Key": "k2001", "Code": "AccessDenied", "Message": "no"}]},
+        ]
+        with mock.patch(CLIENT, return_value=self.s3):
+            result = delete_objects_batched("products", [f"k{i}" for i in range(2500)])
+
+        sizes = [len(c.kwargs["Delete"]["Objects"]) for c in self.s3.delete_objects.call_args_list]
+        self.assertEqual(sizes, [1000, 1000, 500])
+        self.assertEqual(result["deleted"], 2499)
+        self.assertEqual(result["errors"][0]["key"], "k2001")
+
+    def test_soft_delete_keeps_files_until_retention_expires(self):
+        ProductImage.objects.create(product=self.product, key="products/1/own.jpg",
+                                    thumbnails={"128": "products/1/thumbs/own_128.webp"})
+        ProductImage.objects.create(product=self.product, key="products/2/shared.pdf")
+        ProductImage.objects.create(product=self.other, key="products/2/shared.pdf")
+
+        with mock.patch(CLIENT, return_value=self.s3), self.captureOnCommitCallbacks(execute=True):
+            ProductRepository.soft_delete(self.product, user=self.admin)
+            purge_expired_deleted_files()
+        self.assertEqual(ProductImage.objects.filter(product=self.product).count(), 2)
+        self.s3.delete_objects.assert_not_called()
+
+        Product.objects.filter(pk=self.product.pk).update(deleted_at=timezone.now() - timedelta(days=31))
+        with mock.patch(CLIENT, return_value=self.s3):
+            summary = purge_expired_deleted_files()
+
+        self.assertEqual(summary["rows"], 2)
+        self.assertFalse(ProductImage.objects.filter(product=self.product).exists())
+        # La key deduplicada que comparte otro producto se conserva en el bucket
+        self.assertEqual(
+            sorted(self._deleted_keys()),
+            ["products/1/own.jpg", "products/1/thumbs/own_128.webp"],
+        )
+        self.assertEqual(self.s3.delete_objects.call_count, 1)
+
+    def test_sweeper_reports_and_purges_only_old_orphans(self):
+        ProductImage.objects.create(product=self.product, key="products/1/a.jpg",
+                                    thumbnails={"128": "products/1/thumbs/a_128.webp"})
+        old = timezone.now() - timedelta(days=3)
+        self.s3.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [
+                {"Key": "products/1/a.jpg", "LastModified": old},
+                {"Key": "products/1/thumbs/a_128.webp", "LastModified": old},
+                {"Key": "products/1/orphan.jpg", "LastModified": old},
+            ]},
+            {"Contents": [{"Key": "products/1/uploading.jpg", "LastModified": timezone.now()}]},
+        ]
+        with mock.patch(CLIENT, return_value=self.s3):
+            report = sweep_orphan_objects(purge=False)
+            self.assertEqual(report["sample"], ["products/1/orphan.jpg"])
+            self.s3.delete_objects.assert_not_called()
+
+            purged = sweep_orphan_objects(purge=True)
+        self.assertEqual(purged["deleted"], 1)
+        self.assertEqual(self._deleted_keys(), ["products/1/orphan.jpg"])
@@ -0,0 +1,153 @@
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from PIL import Image
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from apps.products.models import ProductImage
+from apps.products.api.repositories.product_file_repository import ProductFileRepository
+from apps.products.api.repositories.product_repository import ProductRepository
+from apps.products.api.serializers.product_serializer import ProductSerializer
+from apps.products.utils.cache_decorators import cached_view
+from apps.products.utils.thumbnail_urls import signed_thumbnails
+from apps.storages_client.services.thumbnails import thumbnail_key, generate_thumbnails
+from apps.tests.factories import create_category, create_type, create_product
+
+CLIENT = "apps.storages_client.services.thumbnails.get_minio_client"
+SIGNER = "apps.products.utils.thumbnail_urls.get_product_file_urls"
+
+
+def _png_bytes(width=1200, height=800):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _fake_s3(original: bytes):
+    s3 = mock.Mock()
+    s3.get_object.return_value = {"Body": BytesIO(original)}
+    return s3
+
+
+@override_settings(AWS_PRODUCT_BUCKET_NAME="products", THUMBNAIL_SIZES=(128, 512))
+class ThumbnailPipelineTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        category = create_category(user=self.admin)
+        self.product = create_product(category, create_type(category, user=self.admin), user=self.admin)
+
+    def test_thumbnail_key_is_derived_from_original(self):
+        self.assertEqual(
+            thumbnail_key("products/1/abc.png", 128), "products/1/thumbs/abc_128.webp"
+        )
+
+    def test_generates_webp_variants_within_bounds(self):
+        s3 = _fake_s3(_png_bytes())
+        with mock.patch(CLIENT, return_value=s3):
+            variants = generate_thumbnails("products/1/abc.png")
+
+        self.assertEqual(set(variants), {"128", "512"})
+        for call in s3.put_object.call_args_list:
+            kwargs = call.kwargs
+            self.assertEqual(kwargs["ContentType"], "image/webp")
+            with Image.open(BytesIO(kwargs["Body"])) as thumb:
+                self.assertEqual(thumb.format, "WEBP")
+                size = int(kwargs["Key"].rsplit("_", 1)[1].split(".")[0])
+                self.assertLessEqual(max(thumb.size), size)
+
+    def test_create_schedules_task_and_stores_variant_keys(self):
+        s3 = _fake_s3(_png_bytes())
+        with mock.patch.dict("os.environ", {"ALLOWED_UPLOAD_EXTENSIONS": ".png"}), \
+                mock.patch(CLIENT, return_value=s3), \
+                self.captureOnCommitCallbacks(execute=True):
+            image = ProductFileRepository.create(
+                self.product.pk, key=f"products/{self.product.pk}/abc.png",
+                url="http://minio/abc.png", name="abc.png", mime_type="image/png",
+            )
+
+        image.refresh_from_db()
+        self.assertEqual(image.thumbnails["128"], f"products/{self.product.pk}/thumbs/abc_128.webp")
+
+    def test_non_images_are_skipped(self):
+        with mock.patch.dict("os.environ", {"ALLOWED_UPLOAD_EXTENSIONS": ".pdf"}), \
+                mock.patch(CLIENT) as client, \
+                self.captureOnCommitCallbacks(execute=True):
+            ProductFileRepository.create(
+                self.product.pk, key="products/1/manual.pdf",
+                url="http://minio/manual.pdf", name="manual.pdf", mime_type="application/pdf",
+            )
+        client.assert_not_called()
+
+    def test_backfill_only_processes_images_without_thumbnails(self):
+        pending = ProductImage.objects.create(product=self.product, key="products/1/a.jpg", mime_type="image/jpeg")
+        ProductImage.objects.create(
+            product=self.product, key="products/1/b.jpg", mime_type="image/jpeg",
+            thumbnails={"128": "products/1/thumbs/b_128.webp"},
+        )
+        with mock.patch("apps.products.tasks.generate_thumbnails", return_value={"128": "x"}) as gen:
+            call_command("backfill_thumbnails", "--sync", "--only", "products", stdout=StringIO())
+
+        gen.assert_called_once_with("products/1/a.jpg")
+        pending.refresh_from_db()
+        self.assertEqual(pending.thumbnails, {"128": "x"})
+
+
+    def _images(self, count=3):
+        category = self.product.category
+        products = [self.product] + [create_product(category, user=self.admin, name=f"P{i}") for i in range(count - 1)]
+        for product in products:
+            for name in ("a", "b"):
+                ProductImage.objects.create(
+                    product=product, key=f"products/{product.pk}/{name}.jpg", mime_type="image/jpeg",
+                    thumbnails={"128": f"products/{product.pk}/thumbs/{name}_128.webp"},
+                )
+        return products
+
+    def test_serializer_keeps_variant_keys_for_the_cache(self):
+        self._images(count=1)
+        data = ProductSerializer(ProductRepository.get_all_active_products_detailed(), many=True).data
+        thumbs = data[0]["product_images"][0]["thumbnails"]
+        self.assertEqual(thumbs, {"128": f"products/{self.product.pk}/thumbs/a_128.webp"})
+
+    def test_product_page_signs_all_thumbnails_in_one_batch(self):
+        self._images()
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+
+        with mock.patch(SIGNER, side_effect=lambda keys: {key: f"signed:{key}" for key in keys}) as signer:
+            response = client.get("/api/v1/inventory/products/")
+
+        signer.assert_called_once()
+        self.assertEqual(len(signer.call_args[0][0]), 6)
+        thumbs = response.data["results"][0]["product_images"][0]["thumbnails"]
+        self.assertTrue(thumbs["128"].startswith("signed:products/"))
+
+    def test_cached_body_is_signed_again_on_every_response(self):
+        self._images(count=1)
+        cache.clear()
+
+        @signed_thumbnails
+        @cached_view("thumbnails_test_ns")
+        def view(request):
+            return Response(ProductSerializer(ProductRepository.get_all_active_products_detailed(), many=True).data)
+
+        request = RequestFactory().get("/")
+        request.user = self.admin
+        with mock.patch(SIGNER, side_effect=lambda keys: {key: "url-1" for key in keys}):
+            first = view(request)
+        with mock.patch(SIGNER, side_effect=lambda keys: {key: "url-2" for key in keys}), \
+                mock.patch("apps.products.utils.thumbnail_urls.time.time", return_value=10 ** 9):
+            second = view(request)
+
+        self.assertEqual(first.data[0]["product_images"][0]["thumbnails"]["128"], "url-1")
+        self.assertEqual(second.data[0]["product_images"][0]["thumbnails"]["128"], "url-2")
+        # Otra ventana de firma: el cliente no puede revalidar URLs viejas con un 304
+        self.assertNotEqual(first["ETag"], second["ETag"])
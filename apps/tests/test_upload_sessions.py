@@ -0,0 +1,92 @@
+from unittest import mock
+
+from botocore.exceptions import ClientError
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from apps.products.models import ProductImage
+from apps.tests.factories import create_category, create_type, create_product
+
+CLIENT = "apps.storages_client.services.upload_sessions.get_minio_client"
+PRESIGN = "apps.storages_client.services.upload_sessions.get_presigned_url"
+
+
+@override_settings(AWS_PRODUCT_BUCKET_NAME="products", STORAGE_DIRECT_UPLOAD_MAX_BYTES=1000)
+class DirectUploadSessionTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass",
+            name="Admin", last_name="User",
+        )
+        self.client.force_authenticate(user=self.admin)
+        category = create_category(user=self.admin)
+        self.product = create_product(category, create_type(category, user=self.admin), user=self.admin)
+        self.base = f"/api/v1/inventory/products/{self.product.pk}/files/upload-session/"
+        self.s3 = mock.Mock()
+        self.s3.generate_presigned_post.return_value = {
+            "url": "http://minio:9000/products", "fields": {"key": "k", "policy": "p"},
+        }
+        patcher = mock.patch(CLIENT, return_value=self.s3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        presign = mock.patch(PRESIGN, return_value="http://localhost:9000/signed")
+        presign.start()
+        self.addCleanup(presign.stop)
+
+    def _session(self, **overrides):
+        payload = {"filename": "bobina.mp4", "content_type": "video/mp4", "size": 800}
+        payload.update(overrides)
+        return self.client.post(self.base, payload, format="json")
+
+    def test_session_returns_post_policy_under_product_prefix(self):
+        response = self._session()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(response.data["key"].startswith(f"products/{self.product.pk}/"))
+        self.assertEqual(response.data["upload"]["url"], "http://localhost:9000/products")
+        conditions = self.s3.generate_presigned_post.call_args.kwargs["Conditions"]
+        self.assertIn(["content-length-range", 1, 800], conditions)
+        self.assertIn({"Content-Type": "video/mp4"}, conditions)
+
+    def test_session_rejects_oversized_or_invalid_files(self):
+        self.assertEqual(self._session(size=5000).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._session(filename="x.exe").status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_finalize_registers_file_once(self):
+        token = self._session().data["token"]
+        self.s3.head_object.return_value = {"ContentLength": 800, "ContentType": "video/mp4"}
+        response = self.client.post(self.base + "finalize/", {"token": token}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        image = ProductImage.objects.get(product=self.product)
+        self.assertEqual(image.mime_type, "video/mp4")
+        self.assertEqual(image.name, "bobina.mp4")
+        again = self.client.post(self.base + "finalize/", {"token": token}, format="json")
+        self.assertEqual(again.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_finalize_requires_uploaded_object(self):
+        token = self._session().data["token"]
+        self.s3.head_object.side_effect = ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        response = self.client.post(self.base + "finalize/", {"token": token}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ProductImage.objects.exists())
+
+    def test_failed_registration_keeps_the_token_for_a_retry(self):
+        token = self._session().data["token"]
+        self.s3.head_object.return_value = {"ContentLength": 800, "ContentType": "video/mp4"}
+        with mock.patch(
+            "apps.products.api.views.product_files_view.ProductFileRepository.bulk_create",
+            side_effect=DatabaseError("conexión perdida"),
+        ):
+            response = self.client.post(self.base + "finalize/", {"token": token}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertIn("detail", response.data)
+        self.s3.delete_object.assert_not_called()
+
+        retry = self.client.post(self.base + "finalize/", {"token": token}, format="json")
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ProductImage.objects.filter(product=self.product).count(), 1)
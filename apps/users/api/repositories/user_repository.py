@@ -4,9 +4,10 @@ from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.core.mail import send_mail
 from django.urls import reverse
+from django.db import transaction
 from rest_framework.exceptions import ValidationError
 from apps.users.models.user_model import User
-from apps.storages_client.services.profile_image import delete_profile_image
+from apps.storages_client.tasks import delete_storage_objects
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
@@ -56,13 +57,14 @@ class UserRepository:
 
     @staticmethod
     def soft_delete(user_instance: User) -> User:
-        """Soft delete + elimina imagen de perfil si existe."""
-        if user_instance.image:
-            try:
-                delete_profile_image(user_instance.image, user_instance.id)
-                logger.info(f"🗑️ Imagen de perfil eliminada para usuario {user_instance.id}")
-            except Exception as e:
-                logger.warning(f"⚠️ No se pudo eliminar imagen de perfil: {e}")
+        """Soft delete + elimina imagen de perfil si existe (en segundo plano)."""
+        image_key = user_instance.image
+        if image_key:
+            # El borrado en S3 no bloquea el request: se encola al confirmar
+            transaction.on_commit(
+                lambda: delete_storage_objects.delay([image_key], bucket_setting="AWS_PROFILE_BUCKET_NAME")
+            )
+            logger.info(f"🗑️ Borrado de imagen de perfil encolado para usuario {user_instance.id}")
 
         user_instance.is_active = False
         user_instance.image = None
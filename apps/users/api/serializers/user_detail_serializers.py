@@ -2,7 +2,7 @@ from rest_framework import serializers
 from django.conf import settings
 from django.core.files.storage import default_storage
 from django.contrib.auth import get_user_model
-from apps.storages_client.utils import generate_presigned_url
+from apps.storages_client.utils import get_presigned_url
 
 User = get_user_model()
 
@@ -26,11 +26,11 @@ class UserDetailSerializer(serializers.ModelSerializer):
         return None
 
     def get_image_signed_url(self, obj):
-        """Retorna una URL presignada para la imagen de perfil."""
+        """Retorna una URL presignada (cacheada) para la imagen de perfil."""
         if not obj.image or not isinstance(obj.image, str):
             return None
 
-        return generate_presigned_url(
+        return get_presigned_url(
             bucket=settings.AWS_PROFILE_BUCKET_NAME,
             object_name=obj.image
         )
@@ -14,9 +14,10 @@ from apps.users.api.serializers.user_update_serializers import UserUpdateSeriali
 from apps.users.api.serializers.user_detail_serializers import UserDetailSerializer
 from apps.storages_client.services.profile_image import (
     delete_profile_image,
+    get_profile_image_urls,
     replace_profile_image,
 )
-from apps.core.pagination import Pagination
+from apps.core.pagination import get_paginator
 from ...filters import UserFilter
 from apps.users.docs.user_doc import (
     get_user_profile_doc, list_users_doc, create_user_doc,
@@ -45,8 +46,12 @@ def user_list_view(request):
     if not filterset.is_valid():
         return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    paginator = Pagination()
+    paginator = get_paginator(request)
     page = paginator.paginate_queryset(filterset.qs, request)
+    # Precarga en lote de las URLs firmadas: el serializer las lee del LRU local
+    image_keys = [u.image for u in page if u.image and isinstance(u.image, str)]
+    if image_keys:
+        get_profile_image_urls(image_keys)
     serializer = UserDetailSerializer(
         page,
         many=True,
@@ -121,14 +126,7 @@ def user_detail_view(request, pk=None):
         if not is_admin:
             return Response({'detail': 'No tienes permiso para eliminar este usuario.'}, status=status.HTTP_403_FORBIDDEN)
 
-        if user_instance.image:
-            try:
-                delete_profile_image(user_instance.image, user_instance.id)
-                user_instance.image = None
-                user_instance.save(update_fields=["image"])
-            except Exception as e:
-                logger.warning(f"⚠️ Error al eliminar imagen de perfil: {e}")
-
+        # La imagen de perfil se borra del bucket en segundo plano
         UserRepository.soft_delete(user_instance)
         return Response(
             {'message': 'Usuario eliminado (soft) correctamente y su imagen también.'},
@@ -1,6 +1,7 @@
 # settings/base.py
 from pathlib import Path
 from datetime import timedelta
+from celery.schedules import crontab
 import os
 
 # ── RUTAS DEL PROYECTO ────────────────────────────────────────
@@ -120,6 +121,42 @@ SPECTACULAR_SETTINGS = {
 # ── CONFIGURACIÓN DE CACHE ────────────────────────────────────
 # TTL por defecto para cache_page y cacheops
 CACHE_TTL = None
+# Overrides de CachePolicy por endpoint: {'product_list': {'wait_timeout': 1}}
+VIEW_CACHE_POLICIES = {}
+
+# ── CLIENTE S3 / MINIO (pool por proceso) ─────────────────────
+# Un único cliente boto3 por proceso; estos valores ajustan su botocore Config
+AWS_S3_MAX_POOL_CONNECTIONS = int(os.getenv('AWS_S3_MAX_POOL_CONNECTIONS', '32'))
+AWS_S3_CONNECT_TIMEOUT = float(os.getenv('AWS_S3_CONNECT_TIMEOUT', '5'))
+AWS_S3_READ_TIMEOUT = float(os.getenv('AWS_S3_READ_TIMEOUT', '30'))
+AWS_S3_MAX_ATTEMPTS = int(os.getenv('AWS_S3_MAX_ATTEMPTS', '3'))
+# Hilos por request para subidas multi-archivo (acotado por el pool del cliente)
+STORAGE_UPLOAD_MAX_WORKERS = int(os.getenv('STORAGE_UPLOAD_MAX_WORKERS', '8'))
+# Tamaño máximo por archivo en subidas directas al bucket (presigned POST)
+STORAGE_DIRECT_UPLOAD_MAX_BYTES = int(os.getenv('STORAGE_DIRECT_UPLOAD_MAX_BYTES', str(500 * 1024 * 1024)))
+# Caché de URLs presignadas: fracción de la vigencia durante la que se reutilizan
+# y tamaño del LRU local por proceso
+PRESIGNED_URL_CACHE_FRACTION = float(os.getenv('PRESIGNED_URL_CACHE_FRACTION', '0.5'))
+PRESIGNED_URL_LOCAL_MAX_ENTRIES = int(os.getenv('PRESIGNED_URL_LOCAL_MAX_ENTRIES', '2048'))
+# TTL de los listados de archivos cacheados por producto/subproducto (se invalidan al escribir)
+FILE_LISTING_CACHE_TTL = int(os.getenv('FILE_LISTING_CACHE_TTL', '3600'))
+# Lados máximos (px) de las miniaturas WebP generadas para cada imagen
+THUMBNAIL_SIZES = tuple(int(s) for s in os.getenv('THUMBNAIL_SIZES', '128,512').split(','))
+# Barrido de objetos huérfanos en products/: antigüedad mínima para
+# considerarlos (subidas directas en curso) y si se borran o solo se reportan
+STORAGE_ORPHAN_GRACE_HOURS = int(os.getenv('STORAGE_ORPHAN_GRACE_HOURS', '24'))
+STORAGE_ORPHAN_SWEEP_PURGE = os.getenv('STORAGE_ORPHAN_SWEEP_PURGE', 'False') == 'True'
+# Días que se conservan los archivos de productos/subproductos dados de baja
+# (la baja es reversible) antes de borrarlos del bucket
+STORAGE_DELETED_FILES_RETENTION_DAYS = int(os.getenv('STORAGE_DELETED_FILES_RETENTION_DAYS', '30'))
+# Descargas vía proxy streaming (con Range) en lugar de redirigir a la URL
+# presignada; también activable por request con ?proxy=true
+STORAGE_DOWNLOAD_PROXY = os.getenv('STORAGE_DOWNLOAD_PROXY', 'False') == 'True'
+# Caché LRU en disco del proxy: directorio, tope total y tamaño máximo por objeto
+STORAGE_PROXY_CACHE_DIR = os.getenv('STORAGE_PROXY_CACHE_DIR', '')
+STORAGE_PROXY_CACHE_MAX_BYTES = int(os.getenv('STORAGE_PROXY_CACHE_MAX_BYTES', str(1024 * 1024 * 1024)))
+STORAGE_PROXY_CACHE_MAX_OBJECT_BYTES = int(os.getenv('STORAGE_PROXY_CACHE_MAX_OBJECT_BYTES', str(50 * 1024 * 1024)))
+STORAGE_PROXY_CHUNK_SIZE = int(os.getenv('STORAGE_PROXY_CHUNK_SIZE', str(64 * 1024)))
 
 # ── LECTURA DE DEBUG DESDE ENV (por defecto False) ─────────────────────────
 DEBUG = os.getenv("DJANGO_DEBUG", "False") == "True"
@@ -159,6 +196,23 @@ CHANNEL_LAYERS = {
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_TIMEZONE = "America/Argentina/Buenos_Aires"
+CELERY_BEAT_SCHEDULE = {
+    # Reconciliación nocturna del stock de productos con subproductos
+    "reconcile-parent-stock-nightly": {
+        "task": "apps.stocks.tasks.reconcile_parent_stock",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    # Borrado diario de archivos de bajas con retención vencida
+    "purge-deleted-files-daily": {
+        "task": "apps.products.tasks.purge_deleted_files",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    # Barrido semanal de objetos del bucket sin fila en la base
+    "sweep-orphan-storage-objects-weekly": {
+        "task": "apps.products.tasks.sweep_orphan_storage_objects",
+        "schedule": crontab(hour=4, minute=0, day_of_week=0),
+    },
+}
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 APPEND_SLASH = False
@@ -0,0 +1,79 @@
+# scripts/bench_cache_invalidation.py
+
+"""
+Benchmark: latencia de invalidación de caché a medida que crece el keyspace.
+
+Compara el borrado por patrón (delete_keys_by_pattern → SCAN) contra el bump de
+versión por namespace (bump_namespace_version → un INCR).
+
+Uso:
+    DJANGO_SETTINGS_MODULE=inventory_management.settings.local \\
+        python scripts/bench_cache_invalidation.py --sizes 1000 10000 100000
+
+Con los settings de test (LocMemCache) también corre, sin necesidad de Redis.
+"""
+import argparse
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "inventory_management.settings.test")
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+
+def _setup():
+    django.setup()
+    # LocMemCache descarta entradas a partir de MAX_ENTRIES (300 por defecto)
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend.endswith("LocMemCache"):
+        settings.CACHES["default"].setdefault("OPTIONS", {})["MAX_ENTRIES"] = 10_000_000
+
+
+def _fill(cache, size: int):
+    batch = {}
+    for i in range(size):
+        batch[f"bench_filler:{i}"] = i
+        if len(batch) == 1000:
+            cache.set_many(batch, None)
+            batch.clear()
+    if batch:
+        cache.set_many(batch, None)
+
+
+def _timeit(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    _setup()
+    from django.core.cache import cache
+    from apps.products.utils.cache_helpers_core import bump_namespace_version
+    from apps.products.utils.redis_utils import delete_keys_by_pattern
+    from apps.products.utils.cache_helpers_products import PRODUCT_LIST_CACHE_PREFIX
+
+    print(f"Backend: {settings.CACHES['default']['BACKEND']}")
+    print(f"{'claves':>10} | {'delete_pattern (ms)':>20} | {'bump_version (ms)':>18}")
+    print("-" * 56)
+    for size in args.sizes:
+        cache.clear()
+        _fill(cache, size)
+        pattern_ms = _timeit(lambda: delete_keys_by_pattern(PRODUCT_LIST_CACHE_PREFIX), args.repeat)
+        bump_ms = _timeit(lambda: bump_namespace_version(PRODUCT_LIST_CACHE_PREFIX), args.repeat)
+        print(f"{size:>10} | {pattern_ms:>20.3f} | {bump_ms:>18.3f}")
+    cache.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# scripts/bench_minio_client.py
+
+"""
+Microbenchmark: costo de presignar N URLs creando un cliente boto3 por llamada
+(comportamiento anterior) contra el cliente compartido por proceso y contra la
+caché de URLs presignadas ya caliente.
+
+Uso:
+    python scripts/bench_minio_client.py --count 1000
+
+No requiere MinIO en ejecución: presignar es una operación local (firma SigV4).
+"""
+import argparse
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "inventory_management.settings.test")
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+
+def _setup():
+    django.setup()
+    # Credenciales/endpoint ficticios si el entorno no los define
+    for name, value in (
+        ("AWS_S3_ENDPOINT_URL", "http://localhost:9000"),
+        ("AWS_ACCESS_KEY_ID", "bench"),
+        ("AWS_SECRET_ACCESS_KEY", "bench-secret"),
+        ("AWS_S3_REGION_NAME", "us-east-1"),
+    ):
+        if not getattr(settings, name, None):
+            setattr(settings, name, value)
+
+
+def _per_call_client():
+    # Réplica del get_minio_client() anterior: un cliente nuevo por invocación
+    import boto3
+    return boto3.client(
+        "s3",
+        endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_S3_REGION_NAME,
+    )
+
+
+def _presign(client_factory, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        client_factory().generate_presigned_url(
+            ClientMethod="get_object",
+            Params={"Bucket": "bench", "Key": f"products/1/{i}.png"},
+            ExpiresIn=300,
+        )
+    return time.perf_counter() - start
+
+
+def _cached(count: int) -> float:
+    from apps.storages_client.services.presigned_cache import get_presigned_urls
+
+    names = [f"products/1/{i}.png" for i in range(count)]
+    get_presigned_urls("bench", names)  # calentamiento
+    start = time.perf_counter()
+    get_presigned_urls("bench", names)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=1000)
+    args = parser.parse_args()
+
+    _setup()
+    from apps.storages_client.clients import minio_client
+
+    minio_client.reset()
+    before = _presign(_per_call_client, args.count)
+    after = _presign(minio_client.get_minio_client, args.count)
+    cached = _cached(args.count)
+
+    print(f"{'modo':>22} | {'total (s)':>10} | {'por URL (ms)':>12}")
+    print("-" * 52)
+    for label, total in (
+        ("cliente por llamada", before),
+        ("cliente compartido", after),
+        ("caché de URLs (tibia)", cached),
+    ):
+        print(f"{label:>22} | {total:>10.3f} | {total / args.count * 1000:>12.3f}")
+    print(f"speedup: x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
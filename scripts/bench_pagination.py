@@ -0,0 +1,114 @@
+# scripts/bench_pagination.py
+
+"""
+Benchmark: latencia por página de la paginación por número (OFFSET + COUNT)
+contra la paginación por cursor (keyset sobre created_at, id).
+
+Uso:
+    python scripts/bench_pagination.py --rows 100000 --pages 1 100 10000
+
+Por defecto usa los settings de test (SQLite en memoria) y crea el esquema con
+syncdb. Con otros settings (p. ej. Postgres local) siembra en esa base: usar
+una base descartable.
+"""
+import argparse
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "inventory_management.settings.test")
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+BENCH_PREFIX = "bench_pagination"
+
+
+def _setup():
+    django.setup()
+    # Sin DEBUG: no se acumulan queries en memoria ni se loguea cada SQL
+    settings.DEBUG = False
+    from django.core.management import call_command
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+
+def _seed(rows: int):
+    from apps.products.models import Category, Product, Type
+
+    category = Category.objects.create(name=f"{BENCH_PREFIX}_cat")
+    type_obj = Type.objects.create(name=f"{BENCH_PREFIX}_type", category=category)
+    batch = []
+    for i in range(rows):
+        batch.append(Product(name=f"{BENCH_PREFIX}_{i}", category=category, type=type_obj))
+        if len(batch) == 5000:
+            Product.objects.bulk_create(batch)
+            batch.clear()
+    if batch:
+        Product.objects.bulk_create(batch)
+
+
+def _request(params: dict):
+    from django.test import RequestFactory
+    from rest_framework.request import Request
+
+    return Request(RequestFactory().get("/api/v1/inventory/products/", params))
+
+
+def _timeit(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    _setup()
+    from apps.core.pagination import KeysetPagination, Pagination
+    from apps.products.models import Product
+
+    print(f"DB: {settings.DATABASES['default']['ENGINE']} — sembrando {args.rows} productos…")
+    _seed(args.rows)
+    # Mismo filtro que product_list: el índice (created_at, id) resuelve el orden
+    qs = Product.objects.filter(status=True)
+    ordered = qs.order_by("-created_at", "-id")
+    keyset = KeysetPagination()
+
+    print(f"{'página':>8} | {'offset (ms)':>12} | {'cursor (ms)':>12} | {'cursor+count (ms)':>18}")
+    print("-" * 60)
+    for page in args.pages:
+        offset = (page - 1) * args.page_size
+        if offset >= args.rows:
+            print(f"{page:>8} | fuera de rango para {args.rows} filas")
+            continue
+
+        offset_request = _request({"page": page, "page_size": args.page_size})
+        offset_ms = _timeit(
+            lambda: list(Pagination().paginate_queryset(qs, offset_request)), args.repeat
+        )
+
+        # El cursor de la página N es la última fila de la página N-1
+        params = {"pagination": "cursor", "page_size": args.page_size}
+        if offset:
+            params["cursor"] = keyset.encode_cursor(ordered[offset - 1])
+        cursor_request = _request(params)
+        counted_request = _request({**params, "with_count": "true"})
+        cursor_ms = _timeit(
+            lambda: KeysetPagination().paginate_queryset(qs, cursor_request), args.repeat
+        )
+        counted_ms = _timeit(
+            lambda: KeysetPagination().paginate_queryset(qs, counted_request), args.repeat
+        )
+        print(f"{page:>8} | {offset_ms:>12.3f} | {cursor_ms:>12.3f} | {counted_ms:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()